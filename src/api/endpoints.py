@@ -1,10 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends, Request, BackgroundTasks
 from src.api.schemas import DownloadRequest, DownloadResponse, TaskStatusResponse, DownloadHistoryResponse, FormatsResponse
-from src.workers.tasks import download_media_task, detect_platform
+from src.workers.tasks import download_media_task
+from src.engine.registry import detect_platform
 from src.workers.celery_app import celery_app
 from src.database.base import get_db
-from src.database.models import DownloadHistory, TaskStatus, PlatformType
+from src.database.models import DownloadHistory, TaskStatus, PLATFORM_TYPES, TASK_STATUSES
 from sqlalchemy.orm import Session
+from sqlalchemy import func, select, tuple_
 from celery.result import AsyncResult
 from pydantic import HttpUrl
 from datetime import datetime, timedelta
@@ -15,16 +17,65 @@ from typing import List, Optional
 import asyncio
 import tempfile
 import os
+import time
+import uuid
 from fastapi.responses import FileResponse
+from src.api.responses import ORJSONResponse, PydanticResponse
 from src.utils.logging.logger import log_api_call, log_download_event, log_error
 from src.utils.logging.monitor import monitor
 from src.config.monitoring_config import monitoring_settings
 from src.utils.version_checker import version_checker
+from src.utils.security import security_validator
+from src.utils.url_validator import URLValidator
+from src.utils.cache import cache_manager, CacheDecorator
 from src.utils.user_features import QualityOption, FormatOption, quality_selector, format_converter, playlist_handler, user_preferences
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
 
+# Placeholders are only formatted when a sink accepts the record; bound fields stay structured
+api_logger = logger.bind(component="api")
+
+# How long /formats results are served from cache before yt-dlp is hit again
+FORMATS_CACHE_TTL = 600
+# How long finished /update job records stay queryable (seconds)
+UPDATE_JOB_TTL = 3600
+
+UNSUPPORTED_PLATFORM_DETAIL = "Unsupported platform. Supported: TikTok, YouTube, Instagram, Reddit, SoundCloud, Dailymotion, Twitch, Vimeo, Facebook, Bilibili, LinkedIn, Pinterest"
+
+
+def resolve_url(request: Request, url_str: str) -> tuple[str, str]:
+    """
+    Run the security check and platform detection for a URL once.
+    Returns (url_str, platform) or raises HTTPException(400).
+    """
+    client_ip = request.client.host if request.client else None
+    
+    is_valid, error = security_validator.validate_url(url_str)
+    if not is_valid:
+        log_error(f"Invalid URL provided: {url_str}", context={
+            "client_ip": client_ip,
+            "error": error
+        })
+        raise HTTPException(status_code=400, detail=f"Invalid URL: {error}")
+    
+    platform = detect_platform(url_str)
+    if platform not in PLATFORM_TYPES:
+        log_error(f"Unsupported platform detected: {url_str}", context={
+            "client_ip": client_ip,
+            "platform": platform,
+            "user_agent": request.headers.get("user-agent")
+        })
+        raise HTTPException(status_code=400, detail=UNSUPPORTED_PLATFORM_DETAIL)
+    
+    return url_str, platform
+
+
+async def validated_url(request: Request, url: HttpUrl) -> tuple[str, str]:
+    """Dependency for endpoints taking `url` as a query parameter."""
+    return resolve_url(request, str(url))
+
+
 @router.post("/download", response_model=DownloadResponse, summary="Submit a URL via POST request")
 @limiter.limit("10/minute")
 async def create_download_task_post(
@@ -70,7 +121,7 @@ async def create_download_task_post(
     }
     ```
     """
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     client_ip = request.client.host if request.client else None
     user_agent = request.headers.get("user-agent")
     
@@ -80,41 +131,27 @@ async def create_download_task_post(
         log_error("Missing URL in download request", context={"client_ip": client_ip})
         raise HTTPException(status_code=400, detail="URL is required")
     
-    url = str(download_request.url)
-    platform = detect_platform(url)
-    
-    if platform == "unknown":
-        log_error(f"Unsupported platform detected: {url}", context={
-            "client_ip": client_ip,
-            "platform": platform,
-            "user_agent": user_agent
-        })
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported platform. Supported: TikTok, YouTube, Instagram, Reddit, SoundCloud, Dailymotion, Twitch, Vimeo, Facebook, Bilibili, LinkedIn, Pinterest"
-        )
-    
-    # Create download history record
-    history = DownloadHistory(
-        task_id="",  # Will be updated after task creation
-        url=url,
-        platform=PlatformType[platform.upper()],
-        status=TaskStatus.PENDING,
-        ip_address=client_ip,
-        user_agent=user_agent
-    )
+    url, platform = resolve_url(request, str(download_request.url))
     
     try:
         # Queue the task with quality parameter
         task = download_media_task.delay(url, download_request.quality)
         
-        # Update history with task ID
-        history.task_id = task.id
+        # Create download history record only once the task exists
+        history = DownloadHistory(
+            task_id=task.id,
+            url=url,
+            platform=PLATFORM_TYPES[platform],
+            status=TaskStatus.PENDING,
+            ip_address=client_ip,
+            user_agent=user_agent
+        )
         db.add(history)
         db.commit()
         
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
-        logger.info(f"[API] Created download task {task.id} for {platform}: {url} (quality: {download_request.quality}) took {duration:.2f}ms")
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
+        api_logger.info("[API] Created download task {task_id} for {platform}: {url} (quality: {quality}) took {duration:.2f}ms",
+                        task_id=task.id, platform=platform, url=url, quality=download_request.quality, duration=duration)
         log_download_event(url, client_ip, "QUEUED", duration=duration)
         
         return {
@@ -125,8 +162,8 @@ async def create_download_task_post(
         
     except Exception as e:
         db.rollback()
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
-        logger.error(f"[API] Failed to create download task: {e}")
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
+        api_logger.error("[API] Failed to create download task: {error}", error=e)
         log_error(f"Failed to create download task: {e}", exception=e, 
                   context={"url": url, "client_ip": client_ip, "duration_ms": duration})
         raise HTTPException(status_code=500, detail=f"Failed to queue download: {str(e)}")
@@ -135,8 +172,8 @@ async def create_download_task_post(
 @limiter.limit("10/minute")
 async def create_download_task_get(
     request: Request,
-    url: HttpUrl,
     quality: Optional[str] = "720p",
+    validated: tuple[str, str] = Depends(validated_url),
     db: Session = Depends(get_db)
 ):
     """
@@ -148,44 +185,30 @@ async def create_download_task_get(
     - Video: "144p", "240p", "360p", "480p", "720p", "1080p" (default: "720p")
     - Audio: "audio" - Download audio-only format (M4A, YouTube only)
     """
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     client_ip = request.client.host if request.client else None
     user_agent = request.headers.get("user-agent")
     
     log_api_call("/api/v1/download", "GET", client_ip, 200)
     
-    url_str = str(url)
-    platform = detect_platform(url_str)
-    
-    if platform == "unknown":
-        log_error(f"Unsupported platform detected: {url_str}", context={
-            "client_ip": client_ip,
-            "platform": platform,
-            "user_agent": user_agent
-        })
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported platform. Supported: TikTok, YouTube, Instagram, Reddit, SoundCloud, Dailymotion, Twitch, Vimeo, Facebook, Bilibili, LinkedIn, Pinterest"
-        )
-    
-    # Create download history record
-    history = DownloadHistory(
-        task_id="",
-        url=url_str,
-        platform=PlatformType[platform.upper()],
-        status=TaskStatus.PENDING,
-        ip_address=client_ip,
-        user_agent=user_agent
-    )
+    url_str, platform = validated
     
     try:
         task = download_media_task.delay(url_str, quality)
-        history.task_id = task.id
+        history = DownloadHistory(
+            task_id=task.id,
+            url=url_str,
+            platform=PLATFORM_TYPES[platform],
+            status=TaskStatus.PENDING,
+            ip_address=client_ip,
+            user_agent=user_agent
+        )
         db.add(history)
         db.commit()
         
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
-        logger.info(f"[API] Created download task {task.id} for {platform}: {url_str} (quality: {quality}) took {duration:.2f}ms")
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
+        api_logger.info("[API] Created download task {task_id} for {platform}: {url} (quality: {quality}) took {duration:.2f}ms",
+                        task_id=task.id, platform=platform, url=url_str, quality=quality, duration=duration)
         log_download_event(url_str, client_ip, "QUEUED", duration=duration)
         
         return {
@@ -196,8 +219,8 @@ async def create_download_task_get(
         
     except Exception as e:
         db.rollback()
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
-        logger.error(f"[API] Failed to create download task: {e}")
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
+        api_logger.error("[API] Failed to create download task: {error}", error=e)
         log_error(f"Failed to create download task: {e}", exception=e, 
                   context={"url": url_str, "client_ip": client_ip, "duration_ms": duration})
         raise HTTPException(status_code=500, detail=f"Failed to queue download: {str(e)}")
@@ -208,7 +231,7 @@ async def get_task_status(task_id: str, db: Session = Depends(get_db)):
     Retrieves the status and result of a download task.
     Also updates the database with the latest status.
     """
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     
     task_result = AsyncResult(task_id, app=celery_app)
     
@@ -227,15 +250,7 @@ async def get_task_status(task_id: str, db: Session = Depends(get_db)):
         history = db.query(DownloadHistory).filter(DownloadHistory.task_id == task_id).first()
         if history:
             # Map Celery status to our TaskStatus enum
-            status_map = {
-                'PENDING': TaskStatus.PENDING,
-                'PROGRESS': TaskStatus.PROGRESS,
-                'SUCCESS': TaskStatus.SUCCESS,
-                'FAILURE': TaskStatus.FAILURE,
-                'RETRY': TaskStatus.RETRY
-            }
-            
-            history.status = status_map.get(status, TaskStatus.PENDING)
+            history.status = TASK_STATUSES.get(status, TaskStatus.PENDING)
             history.updated_at = datetime.utcnow()
             
             if status == 'SUCCESS' and isinstance(result, dict):
@@ -260,55 +275,88 @@ async def get_task_status(task_id: str, db: Session = Depends(get_db)):
         log_error(f"Could not decode task result: {e}", exception=e, 
                   context={"task_id": task_id})
     
-    duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
-    logger.info(f"[API] Status check for task {task_id}: {status} took {duration:.2f}ms")
+    duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
+    api_logger.info("[API] Status check for task {task_id}: {status} took {duration:.2f}ms",
+                    task_id=task_id, status=status, duration=duration)
     log_api_call(f"/api/v1/status/{task_id}", "GET", task_id, 200, duration)
     
-    response = {
-        "task_id": task_id,
-        "status": status,
-        "result": result
-    }
-    
-    return response
+    return PydanticResponse(TaskStatusResponse.model_construct(
+        task_id=task_id,
+        status=status,
+        result=result
+    ))
+
+def format_history_cursor(row: DownloadHistory) -> str:
+    """Encode a /history row's position as "<created_at ISO>,<id>"."""
+    return f"{row.created_at.isoformat()},{row.id}"
+
+
+def parse_history_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode an X-Next-Cursor value, raising a 400 if it is malformed."""
+    created_at, _, row_id = cursor.rpartition(",")
+    try:
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+
 
 @router.get("/history", response_model=List[DownloadHistoryResponse])
 async def get_download_history(
     skip: int = 0,
     limit: int = 50,
     platform: str = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     Get download history with optional filtering.
     
     Parameters:
-    - skip: Number of records to skip (pagination)
+    - skip: Number of records to skip (offset pagination, ignored when cursor is set)
     - limit: Maximum number of records to return (max 100)
     - platform: Filter by platform (tiktok, youtube, instagram, twitter)
+    - cursor: Only return records after this position in newest-first order (keyset
+      pagination). The value for the next page is returned in the `X-Next-Cursor`
+      header, which is only sent when a full page came back.
     """
     if limit > 100:
         limit = 100
     
-    query = db.query(DownloadHistory).order_by(DownloadHistory.created_at.desc())
+    query = db.query(DownloadHistory).order_by(DownloadHistory.created_at.desc(), DownloadHistory.id.desc())
     
     if platform:
-        try:
-            platform_enum = PlatformType[platform.upper()]
-            query = query.filter(DownloadHistory.platform == platform_enum)
-        except KeyError:
+        platform_value = PLATFORM_TYPES.get(platform.lower())
+        if platform_value is None:
             raise HTTPException(status_code=400, detail=f"Invalid platform: {platform}")
+        query = query.filter(DownloadHistory.platform == platform_value)
+    
+    if cursor is not None:
+        # Keyset pagination walks ix_dh_platform_created instead of scanning `skip` rows;
+        # the id tie-breaker keeps rows sharing a timestamp from being skipped
+        cursor_created_at, cursor_id = parse_history_cursor(cursor)
+        query = query.filter(
+            tuple_(DownloadHistory.created_at, DownloadHistory.id) < tuple_(cursor_created_at, cursor_id)
+        )
+    elif skip:
+        query = query.offset(skip)
     
-    history = query.offset(skip).limit(limit).all()
+    history = query.limit(limit).all()
     
-    return history
+    headers = {}
+    if len(history) == limit and history[-1].created_at is not None:
+        headers["X-Next-Cursor"] = format_history_cursor(history[-1])
+    
+    return PydanticResponse(
+        [DownloadHistoryResponse.model_validate(row) for row in history],
+        headers=headers
+    )
 
 @router.get("/download-sync", summary="Download media synchronously in one step")
 @limiter.limit("5/minute")
 async def download_sync(
     request: Request,
-    url: HttpUrl,
     quality: Optional[str] = "720p",
+    validated: tuple[str, str] = Depends(validated_url),
     db: Session = Depends(get_db)
 ):
     """
@@ -321,43 +369,19 @@ async def download_sync(
     **Note:** This endpoint may take longer to respond as it waits for the download to complete.
     For large files or slow connections, the async endpoint might be preferred.
     """
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     client_ip = request.client.host if request.client else None
     user_agent = request.headers.get("user-agent")
     
     log_api_call("/api/v1/download-sync", "GET", client_ip, 200)
     
-    from src.utils.security import security_validator
-    
-    url_str = str(url)
-    
-    # Validate URL security
-    is_valid, error = security_validator.validate_url(url_str)
-    if not is_valid:
-        log_error(f"Invalid URL provided: {url_str}", context={
-            "client_ip": client_ip,
-            "error": error
-        })
-        raise HTTPException(status_code=400, detail=f"Invalid URL: {error}")
-    
-    platform = detect_platform(url_str)
-    
-    if platform == "unknown":
-        log_error(f"Unsupported platform detected: {url_str}", context={
-            "client_ip": client_ip,
-            "platform": platform,
-            "user_agent": user_agent
-        })
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported platform. Supported: TikTok, YouTube, Instagram, Reddit, SoundCloud, Dailymotion, Twitch, Vimeo, Facebook, Bilibili, LinkedIn, Pinterest"
-        )
+    url_str, platform = validated
     
     # Create download history record
     history = DownloadHistory(
         task_id="sync_" + url_str.replace(":", "").replace("/", "_")[:16],  # Use sanitized URL as pseudo-task ID
         url=url_str,
-        platform=PlatformType[platform.upper()],
+        platform=PLATFORM_TYPES[platform],
         status=TaskStatus.PENDING,
         ip_address=client_ip,
         user_agent=user_agent
@@ -365,42 +389,43 @@ async def download_sync(
     
     try:
         # Get appropriate downloader
+        http_client = getattr(request.app.state, "http_client", None)
         if platform == "youtube":
             from src.engine.platforms.youtube import YouTubeDownloader
-            downloader = YouTubeDownloader()
+            downloader = YouTubeDownloader(http_client=http_client)
         elif platform == "tiktok":
             from src.engine.platforms.tiktok import TikTokDownloader
-            downloader = TikTokDownloader()
+            downloader = TikTokDownloader(http_client=http_client)
         elif platform == "instagram":
             from src.engine.platforms.instagram import InstagramDownloader
-            downloader = InstagramDownloader()
+            downloader = InstagramDownloader(http_client=http_client)
         elif platform == "soundcloud":
             from src.engine.platforms.soundcloud import SoundCloudDownloader
-            downloader = SoundCloudDownloader()
+            downloader = SoundCloudDownloader(http_client=http_client)
         elif platform == "dailymotion":
             from src.engine.platforms.dailymotion import DailymotionDownloader
-            downloader = DailymotionDownloader()
+            downloader = DailymotionDownloader(http_client=http_client)
         elif platform == "twitch":
             from src.engine.platforms.twitch import TwitchDownloader
-            downloader = TwitchDownloader()
+            downloader = TwitchDownloader(http_client=http_client)
         elif platform == "reddit":
             from src.engine.platforms.reddit import RedditDownloader
-            downloader = RedditDownloader()
+            downloader = RedditDownloader(http_client=http_client)
         elif platform == "vimeo":
             from src.engine.platforms.vimeo import VimeoDownloader
-            downloader = VimeoDownloader()
+            downloader = VimeoDownloader(http_client=http_client)
         elif platform == "facebook":
             from src.engine.platforms.facebook import FacebookDownloader
-            downloader = FacebookDownloader()
+            downloader = FacebookDownloader(http_client=http_client)
         elif platform == "bilibili":
             from src.engine.platforms.bilibili import BilibiliDownloader
-            downloader = BilibiliDownloader()
+            downloader = BilibiliDownloader(http_client=http_client)
         elif platform == "linkedin":
             from src.engine.platforms.linkedin import LinkedInDownloader
-            downloader = LinkedInDownloader()
+            downloader = LinkedInDownloader(http_client=http_client)
         elif platform == "pinterest":
             from src.engine.platforms.pinterest import PinterestDownloader
-            downloader = PinterestDownloader()
+            downloader = PinterestDownloader(http_client=http_client)
         else:
             log_error(f"Sync download not implemented for platform: {platform}", context={
                 "client_ip": client_ip,
@@ -413,12 +438,15 @@ async def download_sync(
             )
         
         # Perform download synchronously
-        logger.info(f"[API] Starting synchronous download for {platform}: {url_str} (quality: {quality})")
+        api_logger.info("[API] Starting synchronous download for {platform}: {url} (quality: {quality})",
+                        platform=platform, url=url_str, quality=quality)
         
-        # Update history status
+        # Update history status. The commit runs in a worker thread so the event loop
+        # isn't blocked, and finishes before the download starts: the session isn't
+        # thread-safe, so nothing else may use it while the commit runs.
         history.status = TaskStatus.PROGRESS
         db.add(history)
-        db.commit()
+        await asyncio.to_thread(db.commit)
         
         # Download the media
         result = await downloader.download(url_str, quality=quality)
@@ -462,8 +490,8 @@ async def download_sync(
                 latest_file = max(possible_files, key=os.path.getmtime)
                 filename = os.path.basename(latest_file)
                 
-                logger.info(f"[API] Returning file: {latest_file}")
-                duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
+                api_logger.info("[API] Returning file: {path}", path=latest_file)
+                duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
                 log_download_event(url_str, client_ip, "SUCCESS", 
                                   file_size=os.path.getsize(latest_file) if os.path.exists(latest_file) else None,
                                   duration=duration)
@@ -482,8 +510,8 @@ async def download_sync(
                         local_file_path = os.path.join(media_path, filename)
                         
                         if os.path.exists(local_file_path):
-                            logger.info(f"[API] Returning file: {local_file_path}")
-                            duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
+                            api_logger.info("[API] Returning file: {path}", path=local_file_path)
+                            duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
                             log_download_event(url_str, client_ip, "SUCCESS", 
                                               file_size=os.path.getsize(local_file_path) if os.path.exists(local_file_path) else None,
                                               duration=duration)
@@ -494,8 +522,8 @@ async def download_sync(
                             )
         
         # If no file could be found/returned, return metadata
-        logger.warning(f"[API] Could not find downloaded file, returning metadata instead")
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
+        api_logger.warning("[API] Could not find downloaded file, returning metadata instead")
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
         log_download_event(url_str, client_ip, "PARTIAL_SUCCESS", duration=duration)
         return {
             "status": "completed",
@@ -513,8 +541,8 @@ async def download_sync(
         db.add(history)
         db.commit()
         
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
-        logger.error(f"[API] Sync download failed: {e}")
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
+        api_logger.error("[API] Sync download failed: {error}", error=e)
         log_error(f"Sync download failed: {e}", exception=e, 
                   context={"url": url_str, "client_ip": client_ip, "duration_ms": duration})
         log_download_event(url_str, client_ip, "FAILED", duration=duration)
@@ -522,6 +550,7 @@ async def download_sync(
 
 
 @router.get("/health", summary="Health check endpoint")
+@CacheDecorator.cached_endpoint(ttl=5)
 async def health_check():
     """
     Simple health check endpoint for monitoring.
@@ -539,7 +568,7 @@ async def health_check():
         
         if monitoring_settings.MONITORING_ENABLED:
             try:
-                system_stats = monitor.get_system_stats()
+                system_stats = await asyncio.to_thread(monitor.get_system_stats)
                 response["system_stats"] = {
                     "cpu_percent": system_stats.get("cpu_percent"),
                     "memory_percent": system_stats.get("memory_percent"),
@@ -547,50 +576,49 @@ async def health_check():
                     "uptime_seconds": system_stats.get("uptime_seconds")
                 }
             except Exception as e:
-                logger.warning(f"Failed to get system stats for health check: {e}")
+                api_logger.warning("Failed to get system stats for health check: {error}", error=e)
                 response["system_stats"] = "unavailable"
         
-        return response
+        return ORJSONResponse(response)
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return {"status": "unhealthy", "error": str(e)}
+        api_logger.error("Health check failed: {error}", error=e)
+        return ORJSONResponse({"status": "unhealthy", "error": str(e)})
+
+def _count_downloads(db: Session) -> tuple[int, int, int]:
+    """Total, successful and last-24h download counts in a single round-trip."""
+    last_24h = datetime.utcnow() - timedelta(hours=24)
+    stmt = select(
+        func.count(),
+        func.count().filter(DownloadHistory.status == TaskStatus.SUCCESS),
+        func.count().filter(DownloadHistory.created_at >= last_24h)
+    ).select_from(DownloadHistory)
+    return tuple(db.execute(stmt).one())
+
+async def _no_stats() -> dict:
+    return {}
 
 @router.get("/metrics", summary="System metrics")
+@CacheDecorator.cached_endpoint(ttl=10)
 async def get_metrics(db: Session = Depends(get_db)):
     """
     Get system metrics and statistics.
+    Cached for 10 seconds; if collecting fresh metrics fails, the last
+    successful response is served instead (X-Cache: STALE).
     """
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     try:
-        # Get download statistics
-        total_downloads = db.query(DownloadHistory).count()
-        successful_downloads = db.query(DownloadHistory).filter(
-            DownloadHistory.status == TaskStatus.SUCCESS
-        ).count()
-        
-        # Get recent activity
-        last_24h = datetime.utcnow() - timedelta(hours=24)
-        recent_downloads = db.query(DownloadHistory).filter(
-            DownloadHistory.created_at >= last_24h
-        ).count()
-        
-        # Get cache stats if available
-        cache_stats = {}
-        try:
-            from src.utils.cache import cache_manager
-            cache_stats = cache_manager.get_stats()
-        except ImportError:
-            cache_stats = {"enabled": False}
-        
-        # Get system stats if monitoring is enabled
-        system_stats = {}
-        if monitoring_settings.MONITORING_ENABLED:
-            system_stats = monitor.get_system_stats()
+        # The DB query, Redis INFO and psutil sampling all block; run them
+        # concurrently in worker threads so the event loop stays free
+        (total_downloads, successful_downloads, recent_downloads), cache_stats, system_stats = await asyncio.gather(
+            asyncio.to_thread(_count_downloads, db),
+            asyncio.to_thread(cache_manager.get_stats),
+            asyncio.to_thread(monitor.get_system_stats) if monitoring_settings.MONITORING_ENABLED else _no_stats()
+        )
         
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
         log_api_call("/api/v1/metrics", "GET", "system", 200, duration)
         
-        return {
+        return ORJSONResponse({
             "downloads": {
                 "total": total_downloads,
                 "successful": successful_downloads,
@@ -601,10 +629,10 @@ async def get_metrics(db: Session = Depends(get_db)):
             "system": system_stats,
             "timestamp": datetime.utcnow().isoformat(),
             "response_time_ms": duration
-        }
+        })
     except Exception as e:
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
-        logger.error(f"Metrics endpoint error: {e}")
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
+        api_logger.error("Metrics endpoint error: {error}", error=e)
         log_error(f"Metrics endpoint error: {e}", exception=e, context={"duration_ms": duration})
         raise HTTPException(status_code=500, detail="Unable to fetch metrics")
 
@@ -613,85 +641,127 @@ async def get_version_info():
     """
     Get current version and check for updates.
     """
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     
     try:
         system_info = version_checker.get_system_info()
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
         log_api_call("/api/v1/version", "GET", "system", 200, duration)
         
-        return {
+        return ORJSONResponse({
             "version_info": system_info,
             "timestamp": datetime.utcnow().isoformat(),
             "response_time_ms": duration
-        }
+        })
     except Exception as e:
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
-        logger.error(f"Version endpoint error: {e}")
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
+        api_logger.error("Version endpoint error: {error}", error=e)
         log_error(f"Version endpoint error: {e}", exception=e, context={"duration_ms": duration})
         raise HTTPException(status_code=500, detail="Unable to fetch version info")
 
-@router.post("/update", summary="Update the system")
-async def update_system(request: Request):
+def _run_update_job(job_id: str, latest_version: Optional[str]):
+    """Run version_checker.update_system() and record the outcome for /update/status."""
+    job = {
+        "job_id": job_id,
+        "status": "running",
+        "latest_version": latest_version,
+        "previous_version": version_checker.current_version,
+        "started_at": datetime.utcnow().isoformat()
+    }
+    cache_manager.set(job_id, job, ttl=UPDATE_JOB_TTL, prefix="update")
+    start_ns = time.perf_counter_ns()
+    
+    try:
+        success, message = version_checker.update_system()
+    except Exception as e:
+        success, message = False, f"Update failed: {e}"
+    
+    duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+    if success:
+        api_logger.info("Update job {job_id} completed: {message}", job_id=job_id, message=message)
+    else:
+        api_logger.error("Update job {job_id} failed: {message}", job_id=job_id, message=message)
+        log_error(f"Update failed: {message}", context={"job_id": job_id, "duration_ms": duration})
+    
+    job.update({
+        "status": "updated" if success else "failed",
+        "message": message,
+        "finished_at": datetime.utcnow().isoformat(),
+        "duration_ms": duration
+    })
+    cache_manager.set(job_id, job, ttl=UPDATE_JOB_TTL, prefix="update")
+
+@router.post("/update", summary="Update the system", status_code=202)
+async def update_system(request: Request, background_tasks: BackgroundTasks):
     """
     Update the system to the latest version.
+    
+    The update runs in the background; poll `/update/status/{job_id}` for its outcome.
     """
     client_ip = request.client.host if request.client else None
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     
-    log_api_call("/api/v1/update", "POST", client_ip, 200)
+    log_api_call("/api/v1/update", "POST", client_ip, 202)
     
     try:
         # Check if update is available first
-        update_available, latest_version, update_msg = version_checker.is_update_available()
+        update_available, latest_version, update_msg = await asyncio.to_thread(version_checker.is_update_available)
         
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000
         if not update_available:
-            duration = (datetime.utcnow() - start_time).total_seconds() * 1000
-            logger.info(f"No update needed: {update_msg}")
-            return {
+            api_logger.info("No update needed: {message}", message=update_msg)
+            return ORJSONResponse({
                 "status": "no_update_needed",
                 "message": update_msg,
                 "latest_version": latest_version,
                 "timestamp": datetime.utcnow().isoformat(),
                 "response_time_ms": duration
-            }
+            })
         
-        # Perform update
-        success, message = version_checker.update_system()
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(cache_manager.set, job_id, {
+            "job_id": job_id,
+            "status": "queued",
+            "latest_version": latest_version,
+            "previous_version": version_checker.current_version
+        }, ttl=UPDATE_JOB_TTL, prefix="update")
+        background_tasks.add_task(_run_update_job, job_id, latest_version)
         
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000
-        if success:
-            logger.info(f"Update completed: {message}")
-            log_api_call("/api/v1/update", "POST", client_ip, 200, duration)
-            return {
-                "status": "updated",
-                "message": message,
-                "previous_version": version_checker.current_version,
-                "timestamp": datetime.utcnow().isoformat(),
-                "response_time_ms": duration
-            }
-        else:
-            logger.error(f"Update failed: {message}")
-            log_error(f"Update failed: {message}", context={"client_ip": client_ip, "duration_ms": duration})
-            return {
-                "status": "failed",
-                "message": message,
-                "timestamp": datetime.utcnow().isoformat(),
-                "response_time_ms": duration
-            }
+        api_logger.info("Update job {job_id} queued: {message}", job_id=job_id, message=update_msg)
+        return ORJSONResponse({
+            "status": "queued",
+            "job_id": job_id,
+            "message": update_msg,
+            "latest_version": latest_version,
+            "status_url": f"/api/v1/update/status/{job_id}",
+            "timestamp": datetime.utcnow().isoformat(),
+            "response_time_ms": duration
+        }, status_code=202)
     except Exception as e:
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000  # Convert to milliseconds
-        logger.error(f"Update endpoint error: {e}")
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to milliseconds
+        api_logger.error("Update endpoint error: {error}", error=e)
         log_error(f"Update endpoint error: {e}", exception=e, context={"client_ip": client_ip, "duration_ms": duration})
         raise HTTPException(status_code=500, detail="Unable to perform update")
 
+@router.get("/update/status/{job_id}", summary="Get the status of a system update")
+async def get_update_status(job_id: str):
+    """
+    Get the status of an update started via `POST /update`.
+    Status is one of `queued`, `running`, `updated` or `failed`.
+    """
+    # Polled by clients; the Redis lookup runs off the event loop
+    job = await asyncio.to_thread(cache_manager.get, job_id, prefix="update")
+    if job is None:
+        raise HTTPException(status_code=404, detail="Update job not found")
+    return ORJSONResponse(job)
+
 @router.get("/qualities", summary="Get available quality options")
 async def get_quality_options(platform: Optional[str] = None):
     """
     Get available quality options for a platform.
     If no platform is specified, returns all available options.
     """
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     
     try:
         if platform:
@@ -707,12 +777,12 @@ async def get_quality_options(platform: Optional[str] = None):
                 "timestamp": datetime.utcnow().isoformat()
             }
         
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000
         log_api_call("/api/v1/qualities", "GET", "system", 200, duration)
         return result
     except Exception as e:
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000
-        logger.error(f"Qualities endpoint error: {e}")
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+        api_logger.error("Qualities endpoint error: {error}", error=e)
         log_error(f"Qualities endpoint error: {e}", exception=e, context={"duration_ms": duration})
         raise HTTPException(status_code=500, detail="Unable to fetch quality options")
 
@@ -725,7 +795,7 @@ async def convert_media(
     Convert media file to target format.
     Input file should be a path to an existing file in the media folder.
     """
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     
     try:
         # Validate input file path to prevent directory traversal
@@ -745,7 +815,7 @@ async def convert_media(
         success = format_converter.convert_file(input_path, output_path, target_format)
         
         if success:
-            duration = (datetime.utcnow() - start_time).total_seconds() * 1000
+            duration = (time.perf_counter_ns() - start_ns) / 1_000_000
             log_api_call("/api/v1/convert", "POST", "system", 200, duration)
             return {
                 "status": "converted",
@@ -758,8 +828,8 @@ async def convert_media(
         else:
             raise HTTPException(status_code=500, detail="Conversion failed")
     except Exception as e:
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000
-        logger.error(f"Media conversion error: {e}")
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+        api_logger.error("Media conversion error: {error}", error=e)
         log_error(f"Media conversion error: {e}", exception=e, context={"duration_ms": duration})
         raise HTTPException(status_code=500, detail=f"Conversion failed: {str(e)}")
 
@@ -768,14 +838,14 @@ async def get_playlist_info(url: HttpUrl):
     """
     Get information about a playlist.
     """
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     
     try:
         url_str = str(url)
         playlist_info = playlist_handler.get_playlist_info(url_str)
         
         if playlist_info:
-            duration = (datetime.utcnow() - start_time).total_seconds() * 1000
+            duration = (time.perf_counter_ns() - start_ns) / 1_000_000
             log_api_call("/api/v1/playlist-info", "GET", "system", 200, duration)
             return {
                 "playlist": playlist_info.dict(),
@@ -785,8 +855,8 @@ async def get_playlist_info(url: HttpUrl):
         else:
             raise HTTPException(status_code=400, detail="URL is not a playlist or could not be processed")
     except Exception as e:
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000
-        logger.error(f"Playlist info error: {e}")
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+        api_logger.error("Playlist info error: {error}", error=e)
         log_error(f"Playlist info error: {e}", exception=e, context={"duration_ms": duration})
         raise HTTPException(status_code=500, detail=f"Could not get playlist info: {str(e)}")
 
@@ -795,11 +865,11 @@ async def get_user_preferences():
     """
     Get current user preferences.
     """
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     
     try:
         prefs = user_preferences.get_user_quality_options()
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000
         log_api_call("/api/v1/preferences", "GET", "system", 200, duration)
         return {
             "preferences": prefs,
@@ -807,8 +877,8 @@ async def get_user_preferences():
             "response_time_ms": duration
         }
     except Exception as e:
-        duration = (datetime.utcnow() - start_time).total_seconds() * 1000
-        logger.error(f"User preferences error: {e}")
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+        api_logger.error("User preferences error: {error}", error=e)
         log_error(f"User preferences error: {e}", exception=e, context={"duration_ms": duration})
         raise HTTPException(status_code=500, detail="Unable to fetch user preferences")
 
@@ -816,7 +886,8 @@ async def get_user_preferences():
 @limiter.limit("20/minute")
 async def get_video_formats(
     request: Request,
-    url: HttpUrl
+    refresh: bool = False,
+    validated: tuple[str, str] = Depends(validated_url)
 ):
     """
     Get all available formats/resolutions for a video without downloading.
@@ -841,56 +912,61 @@ async def get_video_formats(
     - Video title and metadata
     - List of available formats with quality, file size (MB), codecs
     - Audio-only option (YouTube only)
+    
+    Results are cached for 10 minutes per canonical URL. Pass `refresh=true`
+    to skip the cached copy and re-fetch (the fresh result is cached again).
     """
+    url_str, platform = validated
+    
     try:
-        url_str = str(url)
-        platform = detect_platform(url_str)
-        
-        if platform == "unknown":
-            raise HTTPException(
-                status_code=400,
-                detail="Unsupported platform. Supported: TikTok, YouTube, Instagram, Reddit"
-            )
+        cache_key = URLValidator.canonicalize_url(url_str)
+        if not refresh:
+            # Redis calls block; keep them off the event loop
+            cached_formats = await asyncio.to_thread(cache_manager.get, cache_key, prefix="formats")
+            if cached_formats is not None:
+                api_logger.info("[API] Serving cached formats for {platform}: {url}", platform=platform, url=url_str)
+                return PydanticResponse(FormatsResponse.model_validate(cached_formats))
         
-        logger.info(f"[API] Fetching formats for {platform}: {url_str}")
+        api_logger.info("[API] Fetching formats for {platform}: {url}", platform=platform, url=url_str)
         
         # Import platform-specific downloader
+        http_client = getattr(request.app.state, "http_client", None)
         if platform == "youtube":
             from src.engine.platforms.youtube import YouTubeDownloader
-            downloader = YouTubeDownloader()
+            downloader = YouTubeDownloader(http_client=http_client)
         elif platform == "tiktok":
             from src.engine.platforms.tiktok import TikTokDownloader
-            downloader = TikTokDownloader()
+            downloader = TikTokDownloader(http_client=http_client)
         elif platform == "instagram":
             from src.engine.platforms.instagram import InstagramDownloader
-            downloader = InstagramDownloader()
+            downloader = InstagramDownloader(http_client=http_client)
         elif platform == "soundcloud":
             from src.engine.platforms.soundcloud import SoundCloudDownloader
-            downloader = SoundCloudDownloader()
+            downloader = SoundCloudDownloader(http_client=http_client)
         elif platform == "dailymotion":
             from src.engine.platforms.dailymotion import DailymotionDownloader
-            downloader = DailymotionDownloader()
+            downloader = DailymotionDownloader(http_client=http_client)
         elif platform == "twitch":
             from src.engine.platforms.twitch import TwitchDownloader
-            downloader = TwitchDownloader()
+            downloader = TwitchDownloader(http_client=http_client)
         elif platform == "reddit":
             from src.engine.platforms.reddit import RedditDownloader
-            downloader = RedditDownloader()
+            downloader = RedditDownloader(http_client=http_client)
         elif platform == "vimeo":
             from src.engine.platforms.vimeo import VimeoDownloader
-            downloader = VimeoDownloader()
+            downloader = VimeoDownloader(http_client=http_client)
         elif platform == "facebook":
             from src.engine.platforms.facebook import FacebookDownloader
-            downloader = FacebookDownloader()
+            downloader = FacebookDownloader(http_client=http_client)
         elif platform == "bilibili":
             from src.engine.platforms.bilibili import BilibiliDownloader
-            downloader = BilibiliDownloader()
+            downloader = BilibiliDownloader(http_client=http_client)
         elif platform == "linkedin":
             from src.engine.platforms.linkedin import LinkedInDownloader
-            downloader = LinkedInDownloader()
+            downloader = LinkedInDownloader(http_client=http_client)
         elif platform == "pinterest":
             from src.engine.platforms.pinterest import PinterestDownloader
-            downloader = PinterestDownloader()
+            downloader = PinterestDownloader(http_client=http_client)
         else:
             raise HTTPException(
                 status_code=400,
@@ -899,15 +975,16 @@ async def get_video_formats(
         
         # Get formats without downloading
         formats_data = await downloader.get_formats(url_str)
+        await asyncio.to_thread(cache_manager.set, cache_key, formats_data, ttl=FORMATS_CACHE_TTL, prefix="formats")
         
-        logger.info(f"[API] Found {len(formats_data.get('formats', []))} formats")
+        api_logger.opt(lazy=True).info("[API] Found {count} formats", count=lambda: len(formats_data.get('formats', [])))
         
-        return formats_data
+        return PydanticResponse(FormatsResponse.model_validate(formats_data))
         
     except ValueError as e:
-        logger.error(f"[API] ValueError while fetching formats: {e}")
+        api_logger.error("[API] ValueError while fetching formats: {error}", error=e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"[API] Error fetching formats: {e}")
+        api_logger.error("[API] Error fetching formats: {error}", error=e)
         raise HTTPException(status_code=500, detail=f"Failed to fetch formats: {str(e)}")
 
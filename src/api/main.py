@@ -1,5 +1,6 @@
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
+from src.api.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -12,6 +13,7 @@ from src.utils.logging.monitor import monitor
 from src.config.monitoring_config import monitoring_settings
 from src.utils.version_checker import VersionChecker
 import os
+import httpx
 
 # Create media directory if it doesn't exist
 os.makedirs(settings.MEDIA_FOLDER, exist_ok=True)
@@ -28,7 +30,8 @@ app = FastAPI(
     version=settings.VERSION,
     description="Universal Social Media Downloader API - Download videos from TikTok, YouTube, Instagram, and Twitter",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse  # orjson encodes datetimes natively and much faster than stdlib json
 )
 
 # Add rate limiter to app state
@@ -61,6 +64,12 @@ async def startup_event():
     from src.utils.version_checker import VersionChecker
     version_checker = VersionChecker(current_version=settings.VERSION)
     
+    # Shared HTTP client so downloaders reuse keep-alive connections and TLS sessions
+    app.state.http_client = httpx.AsyncClient(
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+    )
+    
     # Start monitoring if enabled
     if monitoring_settings.MONITORING_ENABLED:
         monitor.start_monitoring(monitoring_settings.MONITORING_INTERVAL)
@@ -73,6 +82,11 @@ async def startup_event():
 async def shutdown_event():
     logger.info(f"{settings.APP_NAME} is shutting down...")
     
+    # Close the shared HTTP client
+    http_client = getattr(app.state, "http_client", None)
+    if http_client is not None:
+        await http_client.aclose()
+    
     # Stop monitoring if enabled
     if monitoring_settings.MONITORING_ENABLED:
         monitor.stop_monitoring()
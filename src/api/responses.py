@@ -0,0 +1,31 @@
+from typing import Any
+import orjson
+from fastapi.responses import ORJSONResponse as _FastAPIORJSONResponse
+from pydantic_core import to_json
+from starlette.responses import Response
+
+
+class ORJSONResponse(_FastAPIORJSONResponse):
+    """
+    orjson response that handlers can return directly, bypassing jsonable_encoder.
+    Values orjson can't encode natively (e.g. Decimal, Path) fall back to str().
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+class PydanticResponse(Response):
+    """
+    JSON response for Pydantic models (or lists of them) serialized by pydantic-core,
+    skipping FastAPI's jsonable_encoder round-trip. None-valued fields are kept so
+    bodies still match the declared response_model.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, ConfigDict, HttpUrl
 from typing import Any, Dict, Optional, Literal
 from datetime import datetime
 
@@ -29,8 +29,7 @@ class DownloadHistoryResponse(BaseModel):
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class VideoFormat(BaseModel):
     format_id: str
@@ -3,12 +3,15 @@ from telegram.ext import ApplicationBuilder, CommandHandler, ContextTypes, Messa
 import os
 import logging
 import asyncio
+import functools
+import hashlib
 import io
 import tempfile
 import shutil
 from pathlib import Path
 import subprocess
 import re
+from collections import Counter
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
@@ -23,30 +26,91 @@ logging.basicConfig(
 TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 WHITELISTED_USER_ID = os.getenv("TELEGRAM_USER_ID")  # Add this to restrict access
 
-def detect_platform_from_cookies(content: str) -> str:
+def whitelisted(handler):
+    """Reply with an access-denied message instead of running handler for non-whitelisted users."""
+    @functools.wraps(handler)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if WHITELISTED_USER_ID and str(update.effective_user.id) != WHITELISTED_USER_ID:
+            await update.message.reply_text("❌ Access denied. You are not authorized to use this bot.")
+            return
+        return await handler(update, context)
+    return wrapper
+
+# One MULTILINE pattern classifies every line the scan needs to see, so a single finditer()
+# walks the buffer and no line is stripped or startswith-checked in Python:
+#  - blank and comment lines match with only the `skip` group set (neither valid nor invalid)
+#  - valid Netscape cookie lines (domain, include-subdomains flag, path starting with /,
+#    secure flag, int()-parsable expiry, non-blank name and value) set the `domain` group
+#  - invalid lines don't match and are derived from the line count
+# Whitespace (including tabs and CR) around a line is ignored as line.strip() did, and
+# around the expiry as int() does. Patterns are bytes: Netscape cookie files are ASCII,
+# so uploads are never decoded.
+_HSPACE = rb' \x0b\x0c\r\x1c-\x1f'  # str.isspace() ASCII characters other than tab and newline
+COOKIE_SCAN_PATTERN = re.compile(
+    rb'^[\t' + _HSPACE + rb']*(?:(?P<skip>#|$)|(?P<domain>[^\t\n' + _HSPACE + rb'][^\t\n]*)'
+    rb'\t(?:TRUE|FALSE|0|1)\t/[^\t\n]*\t(?:TRUE|FALSE|0|1)'
+    rb'\t[' + _HSPACE + rb']*[-+]?\d+(?:_\d+)*[' + _HSPACE + rb']*'
+    rb'\t[^\t\n]*[^\t\n' + _HSPACE + rb'][^\t\n]*'
+    rb'\t[^\t\n]*[^\t\n' + _HSPACE + rb'][\t' + _HSPACE + rb']*$)',
+    re.MULTILINE
+)
+# validate_netscape_cookies(fast=True) stops after this many valid cookies once one
+# platform leads the runner-up by more than FAST_MIN_LEAD cookies
+FAST_MIN_VALID_COOKIES = 100
+FAST_MIN_LEAD = 20
+# Everything str.strip() removes from ASCII text, including the \x1c-\x1f separators
+NON_SPACE_PATTERN = re.compile(rb'[^\s\x1c-\x1f]')
+ASCII_WHITESPACE = frozenset(b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f')
+
+# Domain tokens that identify each platform's cookies
+PLATFORM_COOKIE_TOKENS = {
+    b'.youtube.com': 'youtube',
+    b'googlevideo.com': 'youtube',
+    b'.instagram.com': 'instagram',
+    b'.fbcdn.net': 'instagram',
+    b'.tiktok.com': 'tiktok',
+    b'musical.ly': 'tiktok',
+    b'.twitter.com': 'twitter',
+    b'.x.com': 'twitter',
+}
+# One alternation over every token, matched case-insensitively so the content is never lowercased
+PLATFORM_COOKIE_PATTERN = re.compile(
+    b'|'.join(re.escape(token) for token in PLATFORM_COOKIE_TOKENS),
+    re.IGNORECASE
+)
+
+def detect_platform_from_cookies(content: str | bytes) -> str:
     """
     Detect platform from cookie content by looking for domain patterns
     """
-    content_lower = content.lower()
-    
-    # Count platform-specific domains
-    youtube_count = content_lower.count('.youtube.com') + content_lower.count('googlevideo.com')
-    instagram_count = content_lower.count('.instagram.com') + content_lower.count('.fbcdn.net')
-    tiktok_count = content_lower.count('.tiktok.com') + content_lower.count('musical.ly')
-    twitter_count = content_lower.count('.twitter.com') + content_lower.count('.x.com')
+    if isinstance(content, str):
+        content = content.encode('utf-8')
     
-    # Determine platform based on highest count
-    platform_scores = {
-        'youtube': youtube_count,
-        'instagram': instagram_count,
-        'tiktok': tiktok_count,
-        'twitter': twitter_count
-    }
+    # Count platform-specific domains in a single pass over the content
+    platform_scores = {'youtube': 0, 'instagram': 0, 'tiktok': 0, 'twitter': 0}
+    for match in PLATFORM_COOKIE_PATTERN.finditer(content):
+        platform_scores[PLATFORM_COOKIE_TOKENS[match.group().lower()]] += 1
     
     # Return platform with highest score, default to 'general'
     detected_platform = max(platform_scores, key=platform_scores.get)
     return detected_platform if platform_scores[detected_platform] > 0 else 'general'
 
+# Upload commands a cookie file can be sent in reply to, and the cookie type each selects
+UPLOAD_COMMAND_PATTERN = re.compile(r'/upload_(yt|ig|tiktok|general)')
+UPLOAD_COMMAND_TYPES = {
+    'yt': 'youtube',
+    'ig': 'instagram',
+    'tiktok': 'tiktok',
+    'general': 'general',
+}
+
+# systemd is not available in Termux; it doesn't appear while the bot is running,
+# so the PATH lookup is done once instead of per upload / status check
+HAS_SYSTEMCTL = shutil.which('systemctl') is not None
+
+# Sidecar next to each deployed cookie file holding the blake2b digest of its content
+COOKIE_DIGEST_SUFFIX = '.blake2b'
+
 # Paths for different cookie files
 COOKIE_PATHS = {
     "youtube": "/opt/librarydown/cookies/youtube_cookies.txt",
@@ -55,13 +119,12 @@ COOKIE_PATHS = {
     "twitter": "/opt/librarydown/cookies/twitter_cookies.txt",
     "general": "/opt/librarydown/cookies/cookies.txt"
 }
+# Static views of COOKIE_PATHS used by /status, computed once at import
+COOKIE_PATH_ITEMS = tuple(COOKIE_PATHS.items())
+COOKIE_DIRS = frozenset(os.path.dirname(path) for path in COOKIE_PATHS.values())
 
+@whitelisted
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user_id = str(update.effective_user.id)
-    if WHITELISTED_USER_ID and user_id != WHITELISTED_USER_ID:
-        await update.message.reply_text("❌ Access denied. You are not authorized to use this bot.")
-        return
-        
     await update.message.reply_text(
         "🔐 *LibraryDown Cookie Manager*\n\n"
         "Commands:\n"
@@ -74,109 +137,129 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "🔄 *Smart Detection*: I can identify YouTube/Instagram/TikTok cookies automatically!"
     )
 
-def validate_netscape_cookies(content: str) -> tuple[bool, dict]:
+def classify_cookie_domain(domain: str) -> str | None:
+    """Return the platform a cookie domain belongs to, or None if it isn't platform-specific."""
+    if '.youtube.com' in domain or '.googlevideo.com' in domain:
+        return 'youtube'
+    elif '.instagram.com' in domain or '.fbcdn.net' in domain:
+        return 'instagram'
+    elif '.tiktok.com' in domain or '.musical.ly' in domain:
+        return 'tiktok'
+    elif '.twitter.com' in domain or '.x.com' in domain:
+        return 'twitter'
+    return None
+
+def validate_netscape_cookies(content: str | bytes | bytearray, fast: bool = False) -> tuple[bool, dict]:
     """
     Validate if content is in Netscape cookie format and return detailed info
+    With fast=True the scan stops once FAST_MIN_VALID_COOKIES valid cookies show a clear
+    platform leader; counts then cover only the scanned prefix and 'truncated' is True.
     Returns: (is_valid, {details about validation})
     """
-    lines = content.strip().split('\n')
-    valid_lines = 0
-    invalid_lines = 0
-    domains_found = set()
-    platforms_detected = set()
+    if isinstance(content, str):
+        content = content.encode('utf-8')
     
-    for line in lines:
-        line = line.strip()
-        # Skip empty lines and comments
-        if not line or line.startswith('#'):
-            continue
-            
-        # Check if it has 7 fields (tab-separated Netscape format)
-        fields = line.split('\t')
-        if len(fields) != 7:
-            invalid_lines += 1
-            continue
-            
-        # Basic validation for Netscape format
-        domain, flag, path, secure, expires, name, value = fields
-        
-        # Domain should not be empty
-        if not domain.strip():
-            invalid_lines += 1
-            continue
-            
-        # Flag should be 0 or 1
-        if flag not in ['TRUE', 'FALSE', '0', '1']:
-            invalid_lines += 1
-            continue
-            
-        # Path should start with /
-        if not path.startswith('/'):
-            invalid_lines += 1
-            continue
-            
-        # Secure should be 0 or 1
-        if secure not in ['TRUE', 'FALSE', '0', '1']:
-            invalid_lines += 1
-            continue
-            
-        # Expires should be numeric timestamp
-        try:
-            int(expires)
-        except ValueError:
-            invalid_lines += 1
-            continue
-            
-        # Name and value should not be empty
-        if not name.strip() or not value.strip():
-            invalid_lines += 1
+    # Bound the scans to the stripped region with pos/endpos instead of copying via strip()
+    first = NON_SPACE_PATTERN.search(content)
+    start = first.start() if first else len(content)
+    end = len(content)
+    while end > start and content[end - 1] in ASCII_WHITESPACE:
+        end -= 1
+    line_start = content.rfind(b'\n', 0, start) + 1
+    
+    # Tally valid cookies per domain and per platform (each distinct domain is classified
+    # once), so deploy_cookie_file can auto-detect without scanning the content again
+    domain_counts = Counter()
+    platform_counts = Counter()
+    domain_platforms = {}
+    valid_lines = 0
+    skipped_lines = 0
+    truncated = False
+    for match in COOKIE_SCAN_PATTERN.finditer(content, line_start, end):
+        if match.group('skip') is not None:
+            skipped_lines += 1
             continue
-            
-        # Valid line found
         valid_lines += 1
-        domains_found.add(domain.lower())
-        
-        # Detect platform from domain
-        if '.youtube.com' in domain or '.googlevideo.com' in domain:
-            platforms_detected.add('youtube')
-        elif '.instagram.com' in domain or '.fbcdn.net' in domain:
-            platforms_detected.add('instagram')
-        elif '.tiktok.com' in domain or '.musical.ly' in domain:
-            platforms_detected.add('tiktok')
-        elif '.twitter.com' in domain or '.x.com' in domain:
-            platforms_detected.add('twitter')
+        domain = match.group('domain').lower().decode('ascii', 'replace')
+        domain_counts[domain] += 1
+        if domain not in domain_platforms:
+            domain_platforms[domain] = classify_cookie_domain(domain)
+        platform = domain_platforms[domain]
+        if platform:
+            platform_counts[platform] += 1
+        
+        if fast and valid_lines >= FAST_MIN_VALID_COOKIES and platform_counts:
+            leaders = platform_counts.most_common(2)
+            runner_up = leaders[1][1] if len(leaders) > 1 else 0
+            if leaders[0][1] - runner_up > FAST_MIN_LEAD:
+                end = match.end()
+                truncated = True
+                break
+    
+    total_lines = content.count(b'\n', start, end) + 1
+    invalid_lines = total_lines - skipped_lines - valid_lines
     
     is_valid = valid_lines >= 1
     validation_details = {
         'is_valid': is_valid,
         'valid_cookies': valid_lines,
         'invalid_lines': invalid_lines,
-        'total_lines': len(lines),
-        'domains_found': list(domains_found),
-        'platforms_detected': list(platforms_detected),
-        'quality_score': (valid_lines / max(len(lines), 1)) * 100
+        'total_lines': total_lines,
+        'domains_found': list(domain_counts),
+        'platforms_detected': list(platform_counts),
+        'platform_counts': platform_counts,
+        'quality_score': (valid_lines / max(total_lines, 1)) * 100,
+        'truncated': truncated
     }
     
     return is_valid, validation_details
 
 
-def deploy_cookie_file(content: str, cookie_type: str = "auto", original_filename: str = "cookies.txt") -> tuple[bool, str]:
+def write_file_atomic(dest_path: str, content: bytes | bytearray):
+    """
+    Write content to a temporary file next to dest_path and os.replace it into place,
+    so readers never see a partial file and the rename stays on one filesystem.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(dest_path), prefix='.cookies.', suffix='.tmp')
+    try:
+        try:
+            # Raw os.write on the fd skips BufferedWriter's 8 KB copy loop;
+            # loop only in case the kernel accepts a short write
+            view = memoryview(content)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.chmod(temp_path, 0o644)  # Readable by all, writable by owner
+        os.replace(temp_path, dest_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+def deploy_cookie_file(content: str | bytes | bytearray, cookie_type: str = "auto", original_filename: str = "cookies.txt") -> tuple[bool, str]:
     """
     Deploy cookie file to the appropriate location and restart services
     If cookie_type is "auto", detect platform from cookie content
+    Blocking (file write, fsync, systemctl); call it via asyncio.to_thread from handlers
     """
     try:
-        # Auto-detect platform if not specified
-        if cookie_type == "auto":
-            detected_platform = detect_platform_from_cookies(content)
-            cookie_type = detected_platform
-            logging.info(f"Auto-detected platform: {detected_platform}")
+        if isinstance(content, str):
+            content = content.encode('utf-8')
         
-        # Validate cookie format with detailed info
-        is_valid, validation_details = validate_netscape_cookies(content)
+        # Validate cookie format with detailed info; auto-detection only needs a clear
+        # platform leader, so large pastes stop scanning once one emerges
+        is_valid, validation_details = validate_netscape_cookies(content, fast=cookie_type == "auto")
         if not is_valid:
             return False, f"Invalid Netscape cookie format. Details: {validation_details['valid_cookies']} valid, {validation_details['invalid_lines']} invalid out of {validation_details['total_lines']} total lines."
         
+        # Auto-detect platform from the validator's per-platform cookie counts
+        if cookie_type == "auto":
+            platform_counts = validation_details['platform_counts']
+            cookie_type = platform_counts.most_common(1)[0][0] if platform_counts else 'general'
+            logging.info(f"Auto-detected platform: {cookie_type}")
+        
         # Get destination path based on cookie type
         dest_path = COOKIE_PATHS.get(cookie_type)
         if not dest_path:
@@ -186,35 +269,38 @@ def deploy_cookie_file(content: str, cookie_type: str = "auto", original_filenam
         dest_dir = os.path.dirname(dest_path)
         os.makedirs(dest_dir, exist_ok=True)
         
-        # Create temporary file first
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, encoding='utf-8') as tmp_file:
-            tmp_file.write(content)
-            temp_path = tmp_file.name
+        # Re-uploading an identical file (e.g. when retrying) shouldn't rewrite it or restart services
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest().encode('ascii')
+        digest_path = dest_path + COOKIE_DIGEST_SUFFIX
+        if os.path.exists(dest_path):
+            try:
+                with open(digest_path, 'rb') as digest_file:
+                    if digest_file.read() == digest:
+                        return True, f"Cookies unchanged, no redeploy or restart needed.\nDeployed at: {dest_path}\nCommand Type: {cookie_type}\nOriginal File: {original_filename}"
+            except FileNotFoundError:
+                pass
         
-        # Move to destination with proper permissions
-        shutil.move(temp_path, dest_path)
-        os.chmod(dest_path, 0o644)  # Readable by all, writable by owner
+        write_file_atomic(dest_path, content)
         
         # Try to restart services (handle both systemd and Termux environments)
         restart_messages = []
         try:
-            # Check if systemd is available (not available in Termux)
-            result = subprocess.run(['which', 'systemctl'], 
-                                 capture_output=True, text=True, timeout=5)
-            has_systemctl = result.returncode == 0
-            
-            if has_systemctl:
+            if HAS_SYSTEMCTL:
                 # Systemd environment
-                subprocess.run(['sudo', 'systemctl', 'restart', 'librarydown-worker'], 
-                             check=True, capture_output=True, timeout=30)
-                subprocess.run(['sudo', 'systemctl', 'restart', 'librarydown-api'], 
-                             check=True, capture_output=True, timeout=30)
+                # One invocation restarts both units (single sudo + D-Bus round-trip)
+                # stdout is unused; stderr is kept so CalledProcessError can report it
+                subprocess.run(['sudo', 'systemctl', 'restart', 'librarydown-worker', 'librarydown-api'], 
+                             check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=30)
                 restart_messages.append("Services restarted via systemd")
+                # Only record the digest once services picked the file up, so a retry
+                # after a failed restart still restarts them
+                write_file_atomic(digest_path, digest)
             else:
                 # Termux environment - notify user to restart manually
                 restart_messages.append("Cookie file deployed successfully!")
                 restart_messages.append("Please restart librarydown services manually if needed")
                 restart_messages.append("(In Termux, you'd need to restart processes individually)")
+                write_file_atomic(digest_path, digest)
         except subprocess.CalledProcessError as e:
             restart_messages.append(f"Warning: Service restart failed: {e}")
         except Exception as e:
@@ -225,7 +311,8 @@ def deploy_cookie_file(content: str, cookie_type: str = "auto", original_filenam
             success_msg += "\n" + "\n".join(restart_messages)
         
         # Add validation details to the success message
-        success_msg += f"\n\nValidation: {validation_details['valid_cookies']} valid cookies found"
+        valid_cookies = f"{validation_details['valid_cookies']}{'+' if validation_details['truncated'] else ''}"
+        success_msg += f"\n\nValidation: {valid_cookies} valid cookies found"
         if validation_details['platforms_detected']:
             success_msg += f"\nPlatforms: {', '.join(validation_details['platforms_detected'])}"
         success_msg += f"\nDeployed to: {dest_path}\nCommand Type: {cookie_type}\nOriginal File: {original_filename}"
@@ -236,130 +323,39 @@ def deploy_cookie_file(content: str, cookie_type: str = "auto", original_filenam
         logging.error(f"Error deploying cookie file: {e}")
         return False, f"Failed to deploy cookies: {str(e)}"
 
-def deploy_cookie_file(content: str, cookie_type: str = "auto", original_filename: str = "cookies.txt") -> tuple[bool, str]:
-    """
-    Deploy cookie file to the appropriate location and restart services
-    If cookie_type is "auto", detect platform from cookie content
-    """
-    try:
-        # Auto-detect platform if not specified
-        if cookie_type == "auto":
-            detected_platform = detect_platform_from_cookies(content)
-            cookie_type = detected_platform
-            logging.info(f"Auto-detected platform: {detected_platform}")
-        
-        # Get destination path based on cookie type
-        dest_path = COOKIE_PATHS.get(cookie_type)
-        if not dest_path:
-            return False, f"Unknown cookie type: {cookie_type}"
-        
-        # Validate cookie format
-        if not validate_netscape_cookies(content):
-            return False, "Invalid Netscape cookie format. Please ensure the file contains properly formatted cookies."
-        
-        # Create directory if it doesn't exist
-        dest_dir = os.path.dirname(dest_path)
-        os.makedirs(dest_dir, exist_ok=True)
-        
-        # Create temporary file first
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, encoding='utf-8') as tmp_file:
-            tmp_file.write(content)
-            temp_path = tmp_file.name
-        
-        # Move to destination with proper permissions
-        shutil.move(temp_path, dest_path)
-        os.chmod(dest_path, 0o644)  # Readable by all, writable by owner
-        
-        # Try to restart services (handle both systemd and Termux environments)
-        restart_messages = []
-        try:
-            # Check if systemd is available (not available in Termux)
-            result = subprocess.run(['which', 'systemctl'], 
-                                 capture_output=True, text=True, timeout=5)
-            has_systemctl = result.returncode == 0
-            
-            if has_systemctl:
-                # Systemd environment
-                subprocess.run(['sudo', 'systemctl', 'restart', 'librarydown-worker'], 
-                             check=True, capture_output=True, timeout=30)
-                subprocess.run(['sudo', 'systemctl', 'restart', 'librarydown-api'], 
-                             check=True, capture_output=True, timeout=30)
-                restart_messages.append("Services restarted via systemd")
-            else:
-                # Termux environment - notify user to restart manually
-                restart_messages.append("Cookie file deployed successfully!")
-                restart_messages.append("Please restart librarydown services manually if needed")
-                restart_messages.append("(In Termux, you'd need to restart processes individually)")
-        except subprocess.CalledProcessError as e:
-            restart_messages.append(f"Warning: Service restart failed: {e}")
-        except Exception as e:
-            restart_messages.append(f"Note: Could not restart services: {e}")
-        
-        success_msg = "Cookies updated successfully!"
-        if restart_messages:
-            success_msg += "\n" + "\n".join(restart_messages)
-        
-        success_msg += f"\n\nDeployed to: {dest_path}\nCommand Type: {cookie_type}\nOriginal File: {original_filename}"
-        
-        return True, success_msg
-        
-    except Exception as e:
-        logging.error(f"Error deploying cookie file: {e}")
-        return False, f"Failed to deploy cookies: {str(e)}"
-
+@whitelisted
 async def upload_youtube(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user_id = str(update.effective_user.id)
-    if WHITELISTED_USER_ID and user_id != WHITELISTED_USER_ID:
-        await update.message.reply_text("❌ Access denied. You are not authorized to use this bot.")
-        return
-        
     await update.message.reply_text(
         "📤 Please send me the YouTube cookies file (.txt format with Netscape cookie format).\n\n"
         "You can export this from your browser's developer tools under Application/Cookies."
     )
 
+@whitelisted
 async def upload_instagram(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user_id = str(update.effective_user.id)
-    if WHITELISTED_USER_ID and user_id != WHITELISTED_USER_ID:
-        await update.message.reply_text("❌ Access denied. You are not authorized to use this bot.")
-        return
-        
     await update.message.reply_text(
         "📸 Please send me the Instagram cookies file (.txt format with Netscape cookie format).\n\n"
         "You can export this from your browser's developer tools under Application/Cookies."
     )
 
+@whitelisted
 async def upload_tiktok(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user_id = str(update.effective_user.id)
-    if WHITELISTED_USER_ID and user_id != WHITELISTED_USER_ID:
-        await update.message.reply_text("❌ Access denied. You are not authorized to use this bot.")
-        return
-        
     await update.message.reply_text(
         "🎵 Please send me the TikTok cookies file (.txt format with Netscape cookie format).\n\n"
         "You can export this from your browser's developer tools under Application/Cookies."
     )
 
+@whitelisted
 async def upload_general(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user_id = str(update.effective_user.id)
-    if WHITELISTED_USER_ID and user_id != WHITELISTED_USER_ID:
-        await update.message.reply_text("❌ Access denied. You are not authorized to use this bot.")
-        return
-        
     await update.message.reply_text(
         "📋 Please send me the general cookies file (.txt format with Netscape cookie format).\n\n"
         "This will be used as the default cookie file for the downloader."
     )
 
+@whitelisted
 async def handle_cookie_upload(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     Handle cookie file uploads based on command context or document upload
     """
-    user_id = str(update.effective_user.id)
-    if WHITELISTED_USER_ID and user_id != WHITELISTED_USER_ID:
-        await update.message.reply_text("❌ Access denied. You are not authorized to use this bot.")
-        return
-    
     # Determine cookie type from command or default to auto-detection
     cookie_type = "auto"  # Default to auto-detection
     if context.args and len(context.args) > 0:
@@ -369,14 +365,9 @@ async def handle_cookie_upload(update: Update, context: ContextTypes.DEFAULT_TYP
     elif hasattr(update.message, 'reply_to_message') and update.message.reply_to_message:
         # Check if this is a reply to a command
         replied_text = update.message.reply_to_message.text or ""
-        if '/upload_yt' in replied_text:
-            cookie_type = "youtube"
-        elif '/upload_ig' in replied_text:
-            cookie_type = "instagram"
-        elif '/upload_tiktok' in replied_text:
-            cookie_type = "tiktok"
-        elif '/upload_general' in replied_text:
-            cookie_type = "general"
+        command_match = UPLOAD_COMMAND_PATTERN.search(replied_text)
+        if command_match:
+            cookie_type = UPLOAD_COMMAND_TYPES[command_match.group(1)]
     
     # Handle document upload
     if update.message.document:
@@ -387,14 +378,12 @@ async def handle_cookie_upload(update: Update, context: ContextTypes.DEFAULT_TYP
             file = await update.message.document.get_file()
             file_name = update.message.document.file_name or "cookies.txt"
             
-            # Download file content
-            byte_array = await file.download_as_bytearray()
-            content = byte_array.decode('utf-8')
+            # Download file content; the bytearray is validated and written as-is,
+            # since cookie files are ASCII and don't need decoding or copying
+            content = await file.download_as_bytearray()
             
             # Deploy cookies with original filename
-            success, message = await asyncio.get_event_loop().run_in_executor(
-                None, deploy_cookie_file, content, cookie_type, file_name
-            )
+            success, message = await asyncio.to_thread(deploy_cookie_file, content, cookie_type, file_name)
             
             if success:
                 await update.message.reply_text(f"✅ {message}")
@@ -412,9 +401,7 @@ async def handle_cookie_upload(update: Update, context: ContextTypes.DEFAULT_TYP
             content = update.message.text
             
             # Deploy cookies with generic filename for text input
-            success, message = await asyncio.get_event_loop().run_in_executor(
-                None, deploy_cookie_file, content, cookie_type, "pasted_cookies.txt"
-            )
+            success, message = await asyncio.to_thread(deploy_cookie_file, content, cookie_type, "pasted_cookies.txt")
             
             if success:
                 await update.message.reply_text(f"✅ {message}")
@@ -424,57 +411,58 @@ async def handle_cookie_upload(update: Update, context: ContextTypes.DEFAULT_TYP
         except Exception as e:
             await update.message.reply_text(f"❌ Error processing text: {str(e)}")
 
+@whitelisted
 async def status(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user_id = str(update.effective_user.id)
-    if WHITELISTED_USER_ID and user_id != WHITELISTED_USER_ID:
-        await update.message.reply_text("❌ Access denied. You are not authorized to use this bot.")
-        return
-    
     try:
-        # Check if systemctl is available (Termux doesn't have it)
-        import shutil
-        has_systemctl = shutil.which('systemctl') is not None
-        
         api_state = "unknown"
         worker_state = "unknown"
         
-        if has_systemctl:
+        if HAS_SYSTEMCTL:
             # Systemd environment
-            api_status = subprocess.run(['sudo', 'systemctl', 'is-active', 'librarydown-api'], 
-                                      capture_output=True, text=True, timeout=10)
-            worker_status = subprocess.run(['sudo', 'systemctl', 'is-active', 'librarydown-worker'], 
-                                         capture_output=True, text=True, timeout=10)
-            
-            api_state = api_status.stdout.strip() if api_status.returncode == 0 else "unknown"
-            worker_state = worker_status.stdout.strip() if worker_status.returncode == 0 else "unknown"
+            # is-active prints one state per unit, in argument order; its exit code
+            # is non-zero if any unit is inactive, so the output is parsed directly.
+            # It's a read-only query any user may make, so it runs without sudo.
+            states = subprocess.run(['systemctl', 'is-active', 'librarydown-api', 'librarydown-worker'], 
+                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=10).stdout.split()
+            if len(states) == 2:
+                api_state, worker_state = states
         else:
             # Termux environment - check for running processes
             try:
                 # Check for API process
+                # Only the exit status matters, so output goes to /dev/null
                 api_ps = subprocess.run(['pgrep', '-f', 'uvicorn.*8001'], 
-                                      capture_output=True, text=True, timeout=5)
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
                 api_state = "running" if api_ps.returncode == 0 else "stopped"
                 
                 # Check for worker process
                 worker_ps = subprocess.run(['pgrep', '-f', 'celery.*worker'], 
-                                         capture_output=True, text=True, timeout=5)
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
                 worker_state = "running" if worker_ps.returncode == 0 else "stopped"
             except:
                 api_state = "unknown (Termux)"
                 worker_state = "unknown (Termux)"
         
-        # Check cookie files
-        cookie_status = "📋 Cookie Files:\n"
-        for name, path in COOKIE_PATHS.items():
-            exists = "✅" if os.path.exists(path) else "❌"
-            cookie_status += f"  {exists} {name}: {path}\n"
+        # Check cookie files with one directory listing per cookie dir instead of a stat per file
+        existing_files = set()
+        for cookie_dir in COOKIE_DIRS:
+            try:
+                with os.scandir(cookie_dir) as entries:
+                    existing_files.update(entry.path for entry in entries if entry.is_file())
+            except FileNotFoundError:
+                pass
+        
+        cookie_status = "📋 Cookie Files:\n" + "".join(
+            f"  {'✅' if path in existing_files else '❌'} {name}: {path}\n"
+            for name, path in COOKIE_PATH_ITEMS
+        )
         
         status_msg = (
             f"📊 *LibraryDown Service Status*\n\n"
             f"API Service: *{api_state.upper()}*\n"
             f"Worker Service: *{worker_state.upper()}*\n\n"
             f"{cookie_status}\n"
-            f"Environment: *{'Termux' if not has_systemctl else 'Systemd'}*\n"
+            f"Environment: *{'Termux' if not HAS_SYSTEMCTL else 'Systemd'}*\n"
             f"Last updated: {os.getenv('LAST_UPDATE', 'Never')}"
         )
         
@@ -488,6 +476,14 @@ def main():
         print("TELEGRAM_BOT_TOKEN not set")
         return
 
+    # uvloop's event loop has lower per-callback overhead than the stdlib one;
+    # it's optional (not available on Windows), so fall back silently
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     app = ApplicationBuilder().token(TOKEN).build()
     
     # Add handlers for cookie upload commands
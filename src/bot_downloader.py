@@ -2,10 +2,14 @@
 
 import os
 import asyncio
+import signal
 import tempfile
+from pathlib import Path
+from urllib.parse import urlparse
 from typing import Dict, Any, Optional
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
+from telegram import Update, InputFile, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
 from telegram.ext import (
+    AIORateLimiter,
     ApplicationBuilder, 
     CommandHandler, 
     MessageHandler, 
@@ -14,179 +18,83 @@ from telegram.ext import (
     CallbackQueryHandler,
     ConversationHandler
 )
+from telegram.error import RetryAfter
 from loguru import logger
-from urllib.parse import urlparse
-import aiohttp
+import re
+from functools import lru_cache
+import httpx
 import time
-import json
+import orjson
 from datetime import datetime, timedelta
+from collections import defaultdict, deque
 import glob
+import weakref
 
 # Import our utilities
-from src.utils.url_validator import URLValidator
 from src.utils.security import security_validator
-from src.engine.platforms.youtube import YouTubeDownloader
-from src.engine.platforms.tiktok import TikTokDownloader
-from src.engine.platforms.instagram import InstagramDownloader
-from src.engine.platforms.soundcloud import SoundCloudDownloader
-from src.engine.platforms.dailymotion import DailymotionDownloader
-from src.engine.platforms.twitch import TwitchDownloader
-from src.engine.platforms.reddit import RedditDownloader
-from src.engine.platforms.vimeo import VimeoDownloader
-from src.engine.platforms.facebook import FacebookDownloader
-from src.engine.platforms.bilibili import BilibiliDownloader
-from src.engine.platforms.linkedin import LinkedInDownloader
-from src.engine.platforms.pinterest import PinterestDownloader
+from src.engine.registry import detect_platform, get_downloader_class
 from src.core.config import settings
 from src.utils.user_features import user_preferences
+from src.utils.cache import cache_manager
 
+# History is kept as append-only JSONL; the file is compacted back to the
+# newest HISTORY_LIMIT entries every HISTORY_COMPACT_EVERY appends.
+HISTORY_LIMIT = 100
+HISTORY_COMPACT_EVERY = 50
+# Number of recent downloads shown per user by /history
+USER_HISTORY_SHOWN = 10
 
-class LibraryDownBot:
-    def __init__(self):
-        # Check if token is properly configured
-        self.token = os.getenv("TELEGRAM_BOT_TOKEN")
-        if not self.token or self.token == "your_bot_token_here" or len(self.token) < 10:
-            raise ValueError("TELEGRAM_BOT_TOKEN environment variable not properly set. Please configure via environment variables.")
-        
-        self.user_id = os.getenv("TELEGRAM_USER_ID")
-        self.media_folder = settings.MEDIA_FOLDER
-        self.history_file = os.path.join(self.media_folder, "bot_history.json")
-        
-        # Platform mapping
-        self.platform_mapping = {
-            'youtube': YouTubeDownloader,
-            'tiktok': TikTokDownloader,
-            'instagram': InstagramDownloader,
-            'soundcloud': SoundCloudDownloader,
-            'dailymotion': DailymotionDownloader,
-            'twitch': TwitchDownloader,
-            'reddit': RedditDownloader,
-            'vimeo': VimeoDownloader,
-            'facebook': FacebookDownloader,
-            'bilibili': BilibiliDownloader,
-            'linkedin': LinkedInDownloader,
-            'pinterest': PinterestDownloader
-        }
-        
-        # Initialize bot
-        self.application = ApplicationBuilder().token(self.token).build()
-        self.download_history = self.load_history()
-        self.setup_handlers()
-    
-    def load_history(self):
-        """Load download history from file."""
-        try:
-            if os.path.exists(self.history_file):
-                with open(self.history_file, 'r') as f:
-                    return json.load(f)
-            else:
-                return []
-        except Exception as e:
-            logger.error(f"Error loading history: {e}")
-            return []
-    
-    def save_history(self):
-        """Save download history to file."""
-        try:
-            # Keep only last 100 entries
-            self.download_history = self.download_history[-100:]
-            
-            with open(self.history_file, 'w') as f:
-                json.dump(self.download_history, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving history: {e}")
-    
-    def add_to_history(self, user_id: int, username: str, url: str, platform: str, title: str, status: str):
-        """Add download to history."""
-        history_item = {
-            "user_id": user_id,
-            "username": username,
-            "url": url,
-            "platform": platform,
-            "title": title,
-            "status": status,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.download_history.append(history_item)
-        self.save_history()
-    
-    def setup_handlers(self):
-        """Setup bot command handlers."""
-        # Command handlers
-        self.application.add_handler(CommandHandler("start", self.start))
-        self.application.add_handler(CommandHandler("help", self.help))
-        self.application.add_handler(CommandHandler("download", self.download_command))
-        self.application.add_handler(CommandHandler("status", self.status))
-        self.application.add_handler(CommandHandler("history", self.history))
-        self.application.add_handler(CommandHandler("menu", self.menu))
-        self.application.add_handler(CommandHandler("settings", self.settings))
-        
-        # Message handler for URLs
-        self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_url_message))
-        
-        # Callback query handler for inline keyboards
-        self.application.add_handler(CallbackQueryHandler(self.handle_callback_query))
-    
-    def get_main_menu_keyboard(self):
-        """Get the main menu keyboard."""
-        keyboard = [
-            [
-                KeyboardButton("📥 Download"),
-                KeyboardButton("📜 History")
-            ],
-            [
-                KeyboardButton("⚙️ Settings"),
-                KeyboardButton("ℹ️ Help")
-            ],
-            [
-                KeyboardButton("📊 Status")
-            ]
-        ]
-        return ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
-    
-    def get_quality_keyboard(self) -> InlineKeyboardMarkup:
-        """Get inline keyboard for quality selection."""
-        keyboard = [
-            [
-                InlineKeyboardButton("720p", callback_data="quality_720p"),
-                InlineKeyboardButton("480p", callback_data="quality_480p"),
-            ],
-            [
-                InlineKeyboardButton("360p", callback_data="quality_360p"),
-                InlineKeyboardButton("Audio Only", callback_data="quality_audio"),
-            ],
-            [
-                InlineKeyboardButton("1080p", callback_data="quality_1080p"),
-                InlineKeyboardButton("Auto", callback_data="quality_auto"),
-            ]
-        ]
-        return InlineKeyboardMarkup(keyboard)
-    
-    def get_settings_keyboard(self) -> InlineKeyboardMarkup:
-        """Get inline keyboard for settings."""
-        keyboard = [
-            [
-                InlineKeyboardButton("🎬 Quality: 720p", callback_data="setting_quality"),
-            ],
-            [
-                InlineKeyboardButton("💾 Format: mp4", callback_data="setting_format"),
-            ],
-            [
-                InlineKeyboardButton("🔄 Notifications: On", callback_data="setting_notifications"),
-            ],
-            [
-                InlineKeyboardButton("Back to Menu", callback_data="back_to_menu"),
-            ]
-        ]
-        return InlineKeyboardMarkup(keyboard)
+# Large videos are streamed to Telegram; allow slow uploads to finish (seconds).
+# Applied per upload call so ordinary API requests keep PTB's short defaults.
+UPLOAD_READ_TIMEOUT = 120
+UPLOAD_WRITE_TIMEOUT = 600
+UPLOAD_POOL_TIMEOUT = 30
+
+# Updates are handled concurrently so one long download doesn't hold up other chats;
+# the download cap keeps yt-dlp from exhausting sockets and file descriptors
+MAX_CONCURRENT_UPDATES = 32
+MAX_CONCURRENT_DOWNLOADS = 8
+
+# Outgoing Bot API calls are throttled to Telegram's global limit (30/s by default);
+# calls rejected with a flood wait are retried after the requested delay
+FLOOD_WAIT_RETRIES = 3
+# Uploads streamed from an open file handle; a limiter retry would re-send the handle the
+# first attempt already read, so these are retried by send_video_file with a fresh one
+STREAMED_UPLOAD_ENDPOINTS = frozenset({'sendVideo', 'sendAudio'})
+
+# Finished downloads are cached by URL for as long as the file is kept in MEDIA_FOLDER
+MEDIA_CACHE_PREFIX = "media"
+MEDIA_CACHE_TTL = settings.FILE_TTL_HOURS * 3600
+
+# Scheme, a dotted host, then an optional path/query/fragment; matched instead of
+# running urlparse on every message. URL_PREFIXES is a cheap gate so plain text
+# never reaches the regex.
+URL_PREFIXES = ('http://', 'https://')
+MAX_URL_LENGTH = 2048
+URL_PATTERN = re.compile(r'^https?://[^\s/?#]*\.[^\s/?#]+(?:[/?#]\S*)?$', re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def inspect_url(url: str) -> tuple[bool, str, str]:
+    """
+    Security-check a URL and detect its platform.
+    Both steps are pure functions of the URL, so links that are sent again are served from cache.
     
-    async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /start command."""
-        user = update.effective_user
-        welcome_text = f"""
+    Returns:
+        Tuple of (is_valid, error_message, platform)
+    """
+    is_valid, error = security_validator.validate_url(url)
+    if not is_valid:
+        return False, error, "unknown"
+    return True, "", detect_platform(url)
+
+
+# Static replies and keyboards are built once at import instead of per message.
+# Keyboard markups are immutable, so sharing one instance across chats is safe.
+WELCOME_TEMPLATE = """
 🤖 **LibraryDown Bot - Download Videos from Social Media**
 
-Welcome {user.first_name}! 
+Welcome {name}! 
 
 Send me a video URL from any supported platform:
 • YouTube, TikTok, Instagram, SoundCloud
@@ -204,11 +112,8 @@ Send me a video URL from any supported platform:
 
 Just paste a URL and I'll download it for you! 🎥
         """
-        await update.message.reply_text(welcome_text, parse_mode="Markdown", reply_markup=self.get_main_menu_keyboard())
-    
-    async def menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Show interactive menu."""
-        menu_text = """
+
+MENU_TEXT = """
 🎮 **LibraryDown Bot Menu**
 
 Choose an option:
@@ -220,11 +125,8 @@ Choose an option:
 
 Send a URL directly to start downloading!
         """
-        await update.message.reply_text(menu_text, parse_mode="Markdown", reply_markup=self.get_main_menu_keyboard())
-    
-    async def settings(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Show settings menu."""
-        settings_text = """
+
+SETTINGS_TEXT = """
 ⚙️ **LibraryDown Bot Settings**
 
 Current Settings:
@@ -234,11 +136,8 @@ Current Settings:
 
 Tap on any setting to change it:
         """
-        await update.message.reply_text(settings_text, parse_mode="Markdown", reply_markup=self.get_settings_keyboard())
-    
-    async def help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /help command."""
-        help_text = """
+
+HELP_TEXT = """
 📚 **LibraryDown Bot Help**
 
 **Supported Platforms:**
@@ -271,43 +170,290 @@ Tap on any setting to change it:
 
 Enjoy downloading! 🚀
         """
-        await update.message.reply_text(help_text, parse_mode="Markdown")
-    
-    async def status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /status command."""
-        # Get some stats
-        total_downloads = len(self.download_history)
-        recent_downloads = len([item for item in self.download_history 
-                               if datetime.fromisoformat(item['timestamp']) > datetime.now() - timedelta(days=1)])
-        
-        status_text = f"""
+
+STATUS_TEMPLATE = """
 📊 **LibraryDown Bot Status**
 
 • Bot: Active ✅
 • Supported Platforms: 12
-• Media Folder: {self.media_folder}
+• Media Folder: {media_folder}
 • Total Downloads: {total_downloads}
 • Downloads Today: {recent_downloads}
 • Version: 2.1.0
-• Uptime: {time.strftime('%Y-%m-%d %H:%M:%S')}
+• Uptime: {uptime}
         """
+
+MAIN_MENU_KEYBOARD = ReplyKeyboardMarkup([
+    [
+        KeyboardButton("📥 Download"),
+        KeyboardButton("📜 History")
+    ],
+    [
+        KeyboardButton("⚙️ Settings"),
+        KeyboardButton("ℹ️ Help")
+    ],
+    [
+        KeyboardButton("📊 Status")
+    ]
+], resize_keyboard=True)
+
+QUALITY_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("720p", callback_data="quality_720p"),
+        InlineKeyboardButton("480p", callback_data="quality_480p"),
+    ],
+    [
+        InlineKeyboardButton("360p", callback_data="quality_360p"),
+        InlineKeyboardButton("Audio Only", callback_data="quality_audio"),
+    ],
+    [
+        InlineKeyboardButton("1080p", callback_data="quality_1080p"),
+        InlineKeyboardButton("Auto", callback_data="quality_auto"),
+    ]
+])
+
+SETTINGS_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("🎬 Quality: 720p", callback_data="setting_quality"),
+    ],
+    [
+        InlineKeyboardButton("💾 Format: mp4", callback_data="setting_format"),
+    ],
+    [
+        InlineKeyboardButton("🔄 Notifications: On", callback_data="setting_notifications"),
+    ],
+    [
+        InlineKeyboardButton("Back to Menu", callback_data="back_to_menu"),
+    ]
+])
+
+
+class FloodWaitRateLimiter(AIORateLimiter):
+    """AIORateLimiter that retries flood waits for every call except streamed uploads."""
+    
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        # The limiter is built with max_retries=0, so uploads keep a single attempt
+        if rate_limit_args is None and endpoint not in STREAMED_UPLOAD_ENDPOINTS:
+            rate_limit_args = FLOOD_WAIT_RETRIES
+        return await super().process_request(callback, args, kwargs, endpoint, data, rate_limit_args)
+
+
+class LibraryDownBot:
+    # Fixed attribute set: no per-instance __dict__, and a typo'd assignment fails loudly
+    __slots__ = (
+        'token', 'user_id', 'media_folder', 'media_root', 'history_file',
+        '_appends_since_compact', 'started_at', 'application', 'download_semaphore',
+        'url_locks', 'user_locks', 'http_client', 'stop_event', 'download_history',
+        'history_by_user', 'recent_timestamps', 'menu_dispatch',
+    )
+    
+    def __init__(self):
+        # Check if token is properly configured
+        self.token = os.getenv("TELEGRAM_BOT_TOKEN")
+        if not self.token or self.token == "your_bot_token_here" or len(self.token) < 10:
+            raise ValueError("TELEGRAM_BOT_TOKEN environment variable not properly set. Please configure via environment variables.")
+        
+        self.user_id = os.getenv("TELEGRAM_USER_ID")
+        self.media_folder = settings.MEDIA_FOLDER
+        # Resolved once so per-download paths are a single join
+        self.media_root = Path(self.media_folder).resolve()
+        self.media_root.mkdir(parents=True, exist_ok=True)
+        self.history_file = os.path.join(self.media_folder, "bot_history.jsonl")
+        self._appends_since_compact = 0
+        self.started_at = time.monotonic()
+        
+        # Initialize bot
+        self.application = (
+            ApplicationBuilder()
+            .token(self.token)
+            .media_write_timeout(UPLOAD_WRITE_TIMEOUT)
+            .concurrent_updates(MAX_CONCURRENT_UPDATES)
+            .rate_limiter(FloodWaitRateLimiter())
+            .build()
+        )
+        self.download_semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+        # One lock per URL being downloaded, so identical requests wait for the first one
+        # and are then served from the media cache; unused locks are dropped automatically
+        self.url_locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        # Same idea per user: each user gets at most one download at a time
+        self.user_locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        # Shared HTTP client, opened in run() and injected into every downloader
+        self.http_client: Optional[httpx.AsyncClient] = None
+        # Set by SIGINT/SIGTERM or stop() to end run()
+        self.stop_event: Optional[asyncio.Event] = None
+        self.download_history = self.load_history()
+        
+        # Per-user index of the most recent entries so /history is a dict lookup
+        self.history_by_user = defaultdict(lambda: deque(maxlen=USER_HISTORY_SHOWN))
+        for item in self.download_history:
+            self.history_by_user[item['user_id']].append(item)
+        
+        # Timestamps of history entries from the last day, oldest first, for /status
+        self.recent_timestamps = deque(
+            (item['timestamp'] for item in self.download_history
+             if item['timestamp'] > datetime.now() - timedelta(days=1)),
+            maxlen=HISTORY_LIMIT
+        )
+        
+        self.setup_handlers()
+    
+    def load_history(self):
+        """Load download history from file."""
+        try:
+            if os.path.exists(self.history_file):
+                history = []
+                with open(self.history_file, 'rb') as f:
+                    for line in f:
+                        if line.strip():
+                            history.append(self._decode_history_item(orjson.loads(line)))
+                return history[-HISTORY_LIMIT:]
+            
+            # Pick up history written by older versions as a single JSON document
+            legacy_file = os.path.join(self.media_folder, "bot_history.json")
+            if os.path.exists(legacy_file):
+                with open(legacy_file, 'rb') as f:
+                    history = [self._decode_history_item(item) for item in orjson.loads(f.read())[-HISTORY_LIMIT:]]
+                self.download_history = history
+                self.save_history()
+                return history
+            
+            return []
+        except Exception as e:
+            logger.error(f"Error loading history: {e}")
+            return []
+    
+    @staticmethod
+    def _decode_history_item(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse the stored ISO timestamp once so handlers work with datetime objects."""
+        item['timestamp'] = datetime.fromisoformat(item['timestamp'])
+        return item
+    
+    def save_history(self):
+        """Rewrite the history file with the newest entries (compaction)."""
+        try:
+            # Keep only last 100 entries
+            self.download_history = self.download_history[-HISTORY_LIMIT:]
+            
+            tmp_path = self.history_file + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(b"".join(orjson.dumps(item) + b"\n" for item in self.download_history))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.history_file)
+            self._appends_since_compact = 0
+        except Exception as e:
+            logger.error(f"Error saving history: {e}")
+    
+    def append_history(self, history_item: Dict[str, Any]):
+        """Append a single entry to the history file, compacting periodically."""
+        try:
+            with open(self.history_file, 'ab') as f:
+                f.write(orjson.dumps(history_item) + b"\n")
+        except Exception as e:
+            logger.error(f"Error saving history: {e}")
+            return
+        
+        self._appends_since_compact += 1
+        if self._appends_since_compact >= HISTORY_COMPACT_EVERY:
+            self.save_history()
+    
+    def add_to_history(self, user_id: int, username: str, url: str, platform: str, title: str, status: str):
+        """Add download to history."""
+        history_item = {
+            "user_id": user_id,
+            "username": username,
+            "url": url,
+            "platform": platform,
+            "title": title,
+            "status": status,
+            "timestamp": datetime.now()  # orjson serializes datetime natively
+        }
+        self.download_history.append(history_item)
+        self.history_by_user[user_id].append(history_item)
+        self.recent_timestamps.append(history_item['timestamp'])
+        self.prune_recent_timestamps()
+        if len(self.download_history) > HISTORY_LIMIT:
+            del self.download_history[:-HISTORY_LIMIT]
+        self.append_history(history_item)
+    
+    def prune_recent_timestamps(self):
+        """Drop timestamps older than a day from the front of recent_timestamps."""
+        cutoff = datetime.now() - timedelta(days=1)
+        while self.recent_timestamps and self.recent_timestamps[0] <= cutoff:
+            self.recent_timestamps.popleft()
+    
+    def setup_handlers(self):
+        """Setup bot command handlers."""
+        # Command handlers
+        self.application.add_handler(CommandHandler("start", self.start))
+        self.application.add_handler(CommandHandler("help", self.help))
+        self.application.add_handler(CommandHandler("download", self.download_command))
+        self.application.add_handler(CommandHandler("status", self.status))
+        self.application.add_handler(CommandHandler("history", self.history))
+        self.application.add_handler(CommandHandler("menu", self.menu))
+        self.application.add_handler(CommandHandler("settings", self.settings))
+        
+        # Message handler for URLs
+        self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_url_message))
+        
+        # Callback query handler for inline keyboards
+        self.application.add_handler(CallbackQueryHandler(self.handle_callback_query))
+        
+        # Main menu keyboard labels mapped to their handlers
+        self.menu_dispatch = {
+            "📥 Download": self.download_prompt,
+            "📜 History": self.history,
+            "⚙️ Settings": self.settings,
+            "ℹ️ Help": self.help,
+            "📊 Status": self.status,
+        }
+    
+    async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /start command."""
+        user = update.effective_user
+        await update.message.reply_text(WELCOME_TEMPLATE.format(name=user.first_name), parse_mode="Markdown", reply_markup=MAIN_MENU_KEYBOARD)
+    
+    async def menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Show interactive menu."""
+        await update.message.reply_text(MENU_TEXT, parse_mode="Markdown", reply_markup=MAIN_MENU_KEYBOARD)
+    
+    async def settings(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Show settings menu."""
+        await update.message.reply_text(SETTINGS_TEXT, parse_mode="Markdown", reply_markup=SETTINGS_KEYBOARD)
+    
+    async def help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /help command."""
+        await update.message.reply_text(HELP_TEXT, parse_mode="Markdown")
+    
+    async def status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /status command."""
+        # Get some stats
+        self.prune_recent_timestamps()
+        total_downloads = len(self.download_history)
+        recent_downloads = len(self.recent_timestamps)
+        
+        status_text = STATUS_TEMPLATE.format(
+            media_folder=self.media_folder,
+            total_downloads=total_downloads,
+            recent_downloads=recent_downloads,
+            uptime=timedelta(seconds=int(time.monotonic() - self.started_at))
+        )
         await update.message.reply_text(status_text, parse_mode="Markdown")
     
     async def history(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /history command."""
         user_id = update.effective_user.id
-        user_history = [item for item in self.download_history if item['user_id'] == user_id]
+        history_items = self.history_by_user.get(user_id)
         
-        if not user_history:
+        if not history_items:
             await update.message.reply_text("📜 Your download history is empty.")
             return
         
         # Show last 10 downloads
-        history_items = user_history[-10:]
         history_text = "📜 *Your Recent Downloads:*\n\n"
         
         for item in reversed(history_items):
-            timestamp = datetime.fromisoformat(item['timestamp']).strftime('%m/%d %H:%M')
+            timestamp = item['timestamp'].strftime('%m/%d %H:%M')
             history_text += f"• [{item['platform'].title()}]({item['url']}) - `{item['title'][:30]}...` ({item['status']}) - {timestamp}\n"
         
         await update.message.reply_text(history_text, parse_mode="Markdown")
@@ -323,39 +469,103 @@ Enjoy downloading! 🚀
         if len(context.args) > 1:
             quality = context.args[1]
         
-        await self.process_download(update, url, quality)
+        # Run in the background so the handler returns while the download is in flight;
+        # Application.create_task tracks the task and awaits it on shutdown
+        context.application.create_task(self.process_download(update, url, quality), update=update)
     
     async def handle_url_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle URL messages directly."""
         message_text = update.message.text.strip()
         
         # Check if message is a command from our keyboard
-        if message_text in ["📥 Download", "📜 History", "⚙️ Settings", "ℹ️ Help", "📊 Status"]:
-            if message_text == "📥 Download":
-                await update.message.reply_text("🔗 Please send a video URL to download.")
-            elif message_text == "📜 History":
-                await self.history(update, context)
-            elif message_text == "⚙️ Settings":
-                await self.settings(update, context)
-            elif message_text == "ℹ️ Help":
-                await self.help(update, context)
-            elif message_text == "📊 Status":
-                await self.status(update, context)
-            return
+        handler = self.menu_dispatch.get(message_text)
+        if handler:
+            return await handler(update, context)
         
         # Check if message contains a URL
         if self.is_valid_url(message_text):
-            await self.process_download(update, message_text, "720p")
+            context.application.create_task(self.process_download(update, message_text, "720p"), update=update)
         else:
             await update.message.reply_text("🔗 Please send a valid video URL to download or use the menu buttons.")
     
+    async def download_prompt(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle the Download menu button."""
+        await update.message.reply_text("🔗 Please send a video URL to download.")
+    
     def is_valid_url(self, text: str) -> bool:
         """Check if text contains a valid URL."""
+        # Cheapest checks first: oversized pastes and dot-less chatter never reach the regex.
+        # Slice before lowercasing so clients that capitalize "Https://" still match.
+        return (
+            len(text) <= MAX_URL_LENGTH
+            and '.' in text
+            and text[:8].lower().startswith(URL_PREFIXES)
+            and URL_PATTERN.match(text) is not None
+        )
+    
+    @staticmethod
+    async def send_video_file(update: Update, path: Path, caption: str):
+        """Reply with a video from disk, streaming it from a file handle.
+        
+        Each attempt opens its own handle, so a flood-wait retry uploads the whole file
+        again. FileNotFoundError is raised if the file is missing.
+        """
+        for attempt in range(FLOOD_WAIT_RETRIES + 1):
+            # Open off the event loop (a cold disk can stall open() for a while)
+            video_file = await asyncio.to_thread(open, path, 'rb')
+            try:
+                with video_file:
+                    # The handle is passed to the HTTP backend, which streams it in
+                    # chunks instead of reading the whole video into memory
+                    return await update.message.reply_video(
+                        video=InputFile(video_file, filename=path.name, read_file_handle=False),
+                        caption=caption,
+                        read_timeout=UPLOAD_READ_TIMEOUT,
+                        write_timeout=UPLOAD_WRITE_TIMEOUT,
+                        pool_timeout=UPLOAD_POOL_TIMEOUT
+                    )
+            except RetryAfter as e:
+                if attempt == FLOOD_WAIT_RETRIES:
+                    raise
+                delay = e.retry_after
+                if isinstance(delay, timedelta):
+                    delay = delay.total_seconds()
+                logger.info(f"[BOT] Flood wait on upload, retrying in {delay}s")
+                await asyncio.sleep(delay + 0.1)
+    
+    @staticmethod
+    def get_lock(locks: weakref.WeakValueDictionary, key: Any) -> asyncio.Lock:
+        """Return the lock for a key (a URL or a user id), creating it on first use."""
+        lock = locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            locks[key] = lock
+        return lock
+    
+    async def send_cached_media(self, update: Update, url: str, quality: str) -> bool:
+        """Send a previously downloaded file for this URL and quality, if it is still on disk.
+        
+        Returns:
+            True if the file was sent, False on a cache miss
+        """
+        cached = await asyncio.to_thread(cache_manager.get, f"{quality}:{url}", MEDIA_CACHE_PREFIX)
+        if not cached:
+            return False
+        
         try:
-            parsed = urlparse(text)
-            return bool(parsed.netloc and parsed.scheme in ['http', 'https'])
-        except Exception:
+            await self.send_video_file(
+                update, Path(cached['path']),
+                f"✅ Download completed!\nPlatform: {cached['platform'].title()}\nTitle: {cached['title'][:50]}..."
+            )
+        except FileNotFoundError:
+            # The file was swept from MEDIA_FOLDER before the cache entry expired
             return False
+        
+        user = update.effective_user
+        logger.info(f"[BOT] Cached download sent to {user.username}: {cached['path']}")
+        self.add_to_history(user.id, user.username or str(user.id), url, cached['platform'],
+                          cached['title'], 'SUCCESS')
+        return True
     
     async def process_download(self, update: Update, url: str, quality: str = "720p"):
         """Process download request."""
@@ -364,14 +574,12 @@ Enjoy downloading! 🚀
         
         logger.info(f"[BOT] Download request from {user.username} (ID: {user.id}): {url}")
         
-        # Validate URL security
-        is_valid, error = security_validator.validate_url(url)
+        # Validate URL security and detect platform
+        is_valid, error, platform = inspect_url(url)
         if not is_valid:
             await update.message.reply_text(f"❌ Security validation failed: {error}")
             return
         
-        # Detect platform
-        platform = URLValidator.detect_platform(url)
         if platform == "unknown":
             await update.message.reply_text("❌ Unsupported platform. Supported platforms:\nYouTube, TikTok, Instagram, SoundCloud, Dailymotion, Twitch, Reddit, Vimeo, Facebook, Bilibili, LinkedIn, Pinterest")
             return
@@ -380,69 +588,97 @@ Enjoy downloading! 🚀
         await update.message.reply_text(f"🔄 Starting download from {platform.title()}...\nURL: {url}")
         
         try:
+            if await self.send_cached_media(update, url, quality):
+                return
+            
             # Get appropriate downloader
-            downloader_class = self.platform_mapping.get(platform)
+            downloader_class = get_downloader_class(platform)
             if not downloader_class:
                 await update.message.reply_text(f"❌ Download not implemented for {platform}")
                 return
             
-            downloader = downloader_class()
+            user_lock = self.get_lock(self.user_locks, user.id)
+            if user_lock.locked():
+                await update.message.reply_text("⏳ Your previous download is still running; this one will start when it finishes.")
             
-            # Notify download in progress
-            await update.message.reply_text("⏳ Downloading... This may take a moment.")
-            
-            # Perform download
-            result = await downloader.download(url, quality=quality)
-            
-            # Extract file information
-            video_files = result.get('media', {}).get('video', [])
-            
-            if video_files:
-                # Send the first available file
-                first_file = video_files[0]
-                file_url = first_file.get('url', '')
+            # Wait for a free download slot; the starting message above is already sent.
+            # A request for a URL that is already downloading waits for that download
+            # and is then answered from the cache instead of fetching it again.
+            # Locks are always taken user -> URL -> slot so waiters can't deadlock.
+            async with user_lock, self.get_lock(self.url_locks, url), self.download_semaphore:
+                if await self.send_cached_media(update, url, quality):
+                    return
                 
-                # Extract filename from URL
-                filename = file_url.split('/')[-1] if file_url else f"download_{platform}.mp4"
+                downloader = downloader_class(http_client=self.http_client)
                 
-                # Construct local file path
-                local_file_path = os.path.join(self.media_folder, filename)
+                # Notify download in progress
+                await update.message.reply_text("⏳ Downloading... This may take a moment.")
                 
-                # Check if file exists locally
-                if os.path.exists(local_file_path):
-                    # Send file to user
-                    with open(local_file_path, 'rb') as video_file:
-                        await update.message.reply_video(
-                            video=video_file,
-                            caption=f"✅ Download completed!\nPlatform: {platform.title()}\nTitle: {result.get('title', 'Video')[:50]}..."
-                        )
+                # Perform download
+                result = await downloader.download(url, quality=quality)
+                
+                # Read the result dict once; downloaders may omit or null any of these
+                title = result.get('title') or 'Video'
+                history_title = result.get('title') or 'Unknown'
+                duration = result.get('duration')
+                video_files = (result.get('media') or {}).get('video') or []
+                
+                if video_files:
+                    # Send the first available file
+                    first_file = video_files[0]
+                    file_url = first_file.get('url', '')
                     
-                    logger.info(f"[BOT] Download sent to {user.username}: {local_file_path}")
+                    # Extract filename from the URL path, ignoring any query string
+                    filename = Path(urlparse(file_url).path).name or f"download_{platform}.mp4"
                     
-                    # Add to history
-                    self.add_to_history(user.id, user.username or str(user.id), url, platform, 
-                                      result.get('title', 'Unknown'), 'SUCCESS')
+                    # Construct local file path
+                    local_file_path = self.media_root / filename
+                    
+                    # Send file to user; a missing file means the download didn't land
+                    # in the media folder
+                    try:
+                        await self.send_video_file(
+                            update, local_file_path,
+                            f"✅ Download completed!\nPlatform: {platform.title()}\nTitle: {title[:50]}..."
+                        )
+                        sent = True
+                    except FileNotFoundError:
+                        sent = False
                     
-                    # Send notification
-                    await update.message.reply_text("🎉 Your download is complete! Enjoy your video.")
+                    if sent:
+                        logger.info(f"[BOT] Download sent to {user.username}: {local_file_path}")
+                        
+                        await asyncio.to_thread(cache_manager.set, f"{quality}:{url}", {
+                            'path': str(local_file_path),
+                            'title': title,
+                            'duration': duration,
+                            'platform': platform
+                        }, MEDIA_CACHE_TTL, MEDIA_CACHE_PREFIX)
+                        
+                        # Add to history
+                        self.add_to_history(user.id, user.username or str(user.id), url, platform, 
+                                          history_title, 'SUCCESS')
+                        
+                        # Send notification
+                        await update.message.reply_text("🎉 Your download is complete! Enjoy your video.")
+                    else:
+                        # If file doesn't exist locally, provide alternative
+                        await update.message.reply_text(
+                            f"✅ Download completed but file not available for direct sending.\n\nTitle: {title}\nPlatform: {platform.title()}\nDuration: {duration or 'Unknown'}"
+                        )
+                        
+                        # Add to history
+                        self.add_to_history(user.id, user.username or str(user.id), url, platform, 
+                                          history_title, 'PARTIAL')
                 else:
-                    # If file doesn't exist locally, provide alternative
+                    # If no video files, send metadata
                     await update.message.reply_text(
-                        f"✅ Download completed but file not available for direct sending.\n\nTitle: {result.get('title', 'Video')}\nPlatform: {platform.title()}\nDuration: {result.get('duration', 'Unknown')}"
+                        f"✅ Download completed but no video file available.\n\nTitle: {title}\nPlatform: {platform.title()}\nDuration: {duration or 'Unknown'}"
                     )
                     
                     # Add to history
                     self.add_to_history(user.id, user.username or str(user.id), url, platform, 
-                                      result.get('title', 'Unknown'), 'PARTIAL')
-            else:
-                # If no video files, send metadata
-                await update.message.reply_text(
-                    f"✅ Download completed but no video file available.\n\nTitle: {result.get('title', 'Video')}\nPlatform: {platform.title()}\nDuration: {result.get('duration', 'Unknown')}"
-                )
-                
-                # Add to history
-                self.add_to_history(user.id, user.username or str(user.id), url, platform, 
-                                  result.get('title', 'Unknown'), 'METADATA_ONLY')
+                                      history_title, 'METADATA_ONLY')
         
         except Exception as e:
             logger.error(f"[BOT] Download failed for {url}: {e}")
@@ -464,31 +700,48 @@ Enjoy downloading! 🚀
         elif query.data.startswith("setting_"):
             setting = query.data.replace("setting_", "")
             if setting == "quality":
-                await query.edit_message_text("Select download quality:", reply_markup=self.get_quality_keyboard())
+                await query.edit_message_text("Select download quality:", reply_markup=QUALITY_KEYBOARD)
             elif setting == "notifications":
                 await query.edit_message_text("Notifications setting toggled.")
             elif setting == "format":
                 await query.edit_message_text("Select output format: MP4, MP3, etc.")
         elif query.data == "back_to_menu":
-            await query.edit_message_text("Choose an option:", reply_markup=self.get_main_menu_keyboard())
+            await query.edit_message_text("Choose an option:", reply_markup=MAIN_MENU_KEYBOARD)
+    
+    def stop(self):
+        """Ask a running bot to shut down."""
+        if self.stop_event is not None:
+            self.stop_event.set()
     
     async def run(self):
         """Start the bot."""
         logger.info("🚀 Starting LibraryDown Telegram Bot...")
+        self.http_client = httpx.AsyncClient(
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+        )
         await self.application.initialize()
         await self.application.start()
         await self.application.updater.start_polling()
         
         logger.info("Telegram Bot is running! Press Ctrl+C to stop.")
         
-        # Keep the bot running
+        # Block until SIGINT/SIGTERM (or stop()) instead of waking the loop every second
+        self.stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop_event.set)
+        
         try:
-            while True:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
+            await self.stop_event.wait()
+        finally:
             logger.info("🛑 Stopping LibraryDown Telegram Bot...")
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(sig)
+            await self.application.updater.stop()
             await self.application.stop()
             await self.application.shutdown()
+            await self.http_client.aclose()
 
 
 def main():
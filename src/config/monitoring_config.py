@@ -1,29 +1,9 @@
-from pydantic_settings import BaseSettings
-from typing import Optional
+from src.core.config import Settings, settings
 
 
-class MonitoringSettings(BaseSettings):
-    """Configuration for monitoring system"""
-    
-    # Monitoring settings
-    MONITORING_ENABLED: bool = True
-    MONITORING_INTERVAL: int = 60  # seconds
-    LOG_LEVEL: str = "INFO"
-    LOG_RETENTION_DAYS: int = 30
-    
-    # Health check settings
-    HEALTH_CHECK_TIMEOUT: int = 30
-    METRICS_ENABLED: bool = True
-    
-    # Performance thresholds
-    CPU_THRESHOLD: float = 80.0  # percentage
-    MEMORY_THRESHOLD: float = 80.0  # percentage
-    DISK_THRESHOLD: float = 90.0  # percentage
-    
-    class Config:
-        env_file = ".env"
-        extra = "ignore"  # Ignore extra fields from .env
-
+# Monitoring options live on the main Settings model so .env is parsed once per
+# process; this alias keeps existing imports working.
+MonitoringSettings = Settings
 
 # Global monitoring settings instance
-monitoring_settings = MonitoringSettings()
\ No newline at end of file
+monitoring_settings = settings
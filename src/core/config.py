@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -26,6 +27,7 @@ class Settings(BaseSettings):
 
     # Database Settings
     DATABASE_NAME: str = "librarydown.db"
+    SQL_ECHO: bool = False  # Log every SQL statement (independent of DEBUG)
 
     # File Management
     MEDIA_FOLDER: str = "media"
@@ -36,10 +38,30 @@ class Settings(BaseSettings):
     MAX_RETRIES: int = 3
     RETRY_BACKOFF: int = 5  # Base seconds for exponential backoff
 
+    # Cookies
+    YTDLP_COOKIES_FROM_BROWSER: str = ""  # e.g. "firefox" or "firefox:/path/to/profile"; replaces Instagram cookie files
+
+    # Monitoring Settings (also exposed as src.config.monitoring_config.monitoring_settings)
+    MONITORING_ENABLED: bool = True
+    MONITORING_INTERVAL: int = 60  # seconds
+    LOG_LEVEL: str = "INFO"
+    LOG_RETENTION_DAYS: int = 30
+    HEALTH_CHECK_TIMEOUT: int = 30
+    METRICS_ENABLED: bool = True
+    CPU_THRESHOLD: float = 80.0  # percentage
+    MEMORY_THRESHOLD: float = 80.0  # percentage
+    DISK_THRESHOLD: float = 90.0  # percentage
+
+    # Variable names match case-insensitively, as the separate monitoring settings always did
     model_config = SettingsConfigDict(
         env_file=".env",
-        case_sensitive=True,
+        env_file_encoding="utf-8",
         extra='ignore'
     )
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, reading the environment and .env only once."""
+    return Settings()
+
+settings = get_settings()
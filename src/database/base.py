@@ -1,12 +1,7 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from src.core.config import settings
-import logging
-
-# Configure logging
-logging.basicConfig()
-logging.getLogger('sqlalchemy.engine').setLevel(logging.INFO)
 
 SQLALCHEMY_DATABASE_URL = f"sqlite:///./{settings.DATABASE_NAME}"
 
@@ -18,10 +13,28 @@ engine = create_engine(
     pool_recycle=3600,       # Recycle connections after 1 hour
     pool_size=10,            # Number of connections to maintain
     max_overflow=20,         # Additional connections beyond pool_size
-    echo=settings.DEBUG      # Log SQL statements in debug mode
+    echo=settings.SQL_ECHO   # Log SQL statements only when explicitly requested
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every new SQLite connection.
+    
+    WAL lets readers proceed while a write is in progress, NORMAL sync is safe
+    under WAL, and the larger page cache and mmap window cut read syscalls.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA cache_size=-64000")    # ~64 MB
+    cursor.close()
+
+
+# Committed objects stay loaded, so reading them after commit doesn't re-query each row
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
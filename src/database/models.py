@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Enum
-from datetime import datetime
+from sqlalchemy import CheckConstraint, Column, Integer, String, DateTime, Float, Text, Index, func, text
 from src.database.base import Base
 import enum
+import sys
 
 class TaskStatus(str, enum.Enum):
     PENDING = "PENDING"
@@ -25,18 +25,42 @@ class PlatformType(str, enum.Enum):
     LINKEDIN = "LINKEDIN"
     PINTEREST = "PINTEREST"
 
+# Interned lookup tables built once at import: lowercase platform name <-> stored
+# column value and Celery state string -> stored status, so request paths avoid
+# .upper() and enum resolution and write the same string objects every time.
+PLATFORM_TYPES = {name.lower(): sys.intern(member.value) for name, member in PlatformType.__members__.items()}
+PLATFORM_NAMES = {value: name for name, value in PLATFORM_TYPES.items()}
+TASK_STATUSES = {name: sys.intern(member.value) for name, member in TaskStatus.__members__.items()}
+
+
+def _in_values(column: str, enum_cls: type) -> str:
+    """SQL CHECK expression limiting a column to an enum's values."""
+    return f"{column} IN ({', '.join(repr(member.value) for member in enum_cls)})"
+
+# Current UTC time computed by SQLite, in the same "YYYY-MM-DD HH:MM:SS.ffffff" form
+# SQLAlchemy writes for Python datetimes, so keyset comparisons on mixed rows stay exact.
+# SQLite's %f gives milliseconds; the trailing "000" pads it to microseconds.
+SQL_UTC_NOW_FORMAT = "%Y-%m-%d %H:%M:%f000"
+sql_utc_now = func.strftime(SQL_UTC_NOW_FORMAT, "now")
+
 class DownloadHistory(Base):
     __tablename__ = "download_history"
 
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(String, unique=True, index=True, nullable=False)
     url = Column(Text, nullable=False)
-    platform = Column(Enum(PlatformType), nullable=False)
-    status = Column(Enum(TaskStatus), nullable=False, default=TaskStatus.PENDING)
+    # Plain strings holding PlatformType/TaskStatus values; the CHECK constraints below
+    # keep them valid without SQLAlchemy's per-row Enum conversion. The stored values
+    # are the same as with the previous Enum columns, so existing databases still read.
+    platform = Column(String(16), nullable=False)
+    status = Column(String(16), nullable=False, default=TaskStatus.PENDING.value)
     
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Timestamps are stamped by the database inside the INSERT/UPDATE statement;
+    # server_default also covers rows written outside the ORM on freshly created tables
+    created_at = Column(DateTime, default=sql_utc_now,
+                        server_default=text(f"(strftime('{SQL_UTC_NOW_FORMAT}', 'now'))"))
+    updated_at = Column(DateTime, default=sql_utc_now, onupdate=sql_utc_now,
+                        server_default=text(f"(strftime('{SQL_UTC_NOW_FORMAT}', 'now'))"))
     completed_at = Column(DateTime, nullable=True)
     
     # Download metadata
@@ -55,5 +79,14 @@ class DownloadHistory(Base):
     ip_address = Column(String, nullable=True)
     user_agent = Column(Text, nullable=True)
 
+    __table_args__ = (
+        # Covers /history: optional platform filter + newest-first (created_at, id) keyset pagination
+        Index("ix_dh_platform_created", "platform", created_at.desc(), id.desc()),
+        # Covers the /metrics success and last-24h counters
+        Index("ix_dh_status_created", "status", "created_at", "id"),
+        CheckConstraint(_in_values("platform", PlatformType), name="ck_dh_platform"),
+        CheckConstraint(_in_values("status", TaskStatus), name="ck_dh_status"),
+    )
+
     def __repr__(self):
         return f"<DownloadHistory(task_id={self.task_id}, platform={self.platform}, status={self.status})>"
@@ -1,15 +1,74 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+import httpx
+from src.core.config import settings
+
+# yt-dlp options merged under every platform's download-step options. HLS/DASH
+# formats arrive as many fragments; fetching several at once keeps the link busy
+# instead of paying one round trip per fragment.
+YTDLP_DOWNLOAD_OPTIONS = {
+    'concurrent_fragment_downloads': 8,
+    'fragment_retries': settings.MAX_RETRIES,
+}
+
+class _SharedPoolTransport(httpx.AsyncBaseTransport):
+    """Send requests over another client's connection pool, one hop at a time.
+    
+    The client using this transport keeps its own cookie jar and follows redirects
+    itself; closing it leaves the shared client open.
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self._client = client
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._client.send(request, stream=True, follow_redirects=False)
+
 
 class BaseDownloader(ABC):
     """
     Abstract base class for a platform-specific downloader.
     It can be initialized with a session_manager for browser-based tasks,
     or without one for direct API calls.
+    An optional shared http_client lets callers reuse pooled keep-alive
+    connections instead of opening a new client per download.
     """
 
-    def __init__(self, session_manager: Any = None):
+    def __init__(self, session_manager: Any = None, http_client: Optional[httpx.AsyncClient] = None):
         self.session_manager = session_manager
+        self.http_client = http_client
+
+    @asynccontextmanager
+    async def _client(self, **client_kwargs: Any) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Yield the shared HTTP client if one was injected, otherwise a short-lived one.
+        
+        Args:
+            client_kwargs: httpx.AsyncClient options for the short-lived client only;
+                per-request settings such as headers should be passed on each request
+        """
+        if self.http_client is not None:
+            yield self.http_client
+        else:
+            async with httpx.AsyncClient(**client_kwargs) as client:
+                yield client
+
+    @asynccontextmanager
+    async def _isolated_client(self, **client_kwargs: Any) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Yield a short-lived client with its own cookie jar.
+        
+        For requests whose cookies must not mix with concurrent downloads. With a
+        shared client injected, its connection pool is reused.
+        
+        Args:
+            client_kwargs: httpx.AsyncClient options for the short-lived client
+        """
+        if self.http_client is not None:
+            client_kwargs['transport'] = _SharedPoolTransport(self.http_client)
+        async with httpx.AsyncClient(**client_kwargs) as client:
+            yield client
 
     @abstractmethod
     async def download(self, url: str, quality: str = "720p") -> Dict[str, Any]:
@@ -1,7 +1,24 @@
 from typing import Any, Dict, Optional
 from src.engine.base_downloader import BaseDownloader
+from src.utils.exceptions import PlatformUnavailableError
 from loguru import logger
 
+UNAVAILABLE_MESSAGE = (
+    "Facebook downloader is currently not available in this environment due to SSL/TLS certificate restrictions. "
+    "\n\nAlternative solutions:"
+    "\n1. Use third-party services:"
+    "\n   - FBDown.net: https://www.fbdown.net/"
+    "\n   - GetFBStuff: https://getfbstuff.com/"
+    "\n   - SnapSave: https://snapsave.app/facebook-video-downloader"
+    "\n\n2. Browser extensions:"
+    "\n   - Video Downloader for Facebook"
+    "\n   - FBDown Video Downloader"
+    "\n\n3. Mobile apps:"
+    "\n   - Friendly for Facebook (includes downloader)"
+    "\n   - Video Downloader for Facebook"
+    "\n\nNote: Facebook will be supported in future versions when deployed in a standard environment."
+)
+
 
 class FacebookDownloader(BaseDownloader):
     @property
@@ -15,23 +32,9 @@ class FacebookDownloader(BaseDownloader):
             url: Facebook video URL
             
         Raises:
-            NotImplementedError: Facebook support is blocked by environment SSL issues
+            PlatformUnavailableError: Facebook support is blocked by environment SSL issues
         """
-        raise NotImplementedError(
-            "Facebook downloader is currently not available in this environment due to SSL/TLS certificate restrictions. "
-            "\n\nAlternative solutions:"
-            "\n1. Use third-party services:"
-            "\n   - FBDown.net: https://www.fbdown.net/"
-            "\n   - GetFBStuff: https://getfbstuff.com/"
-            "\n   - SnapSave: https://snapsave.app/facebook-video-downloader"
-            "\n\n2. Browser extensions:"
-            "\n   - Video Downloader for Facebook"
-            "\n   - FBDown Video Downloader"
-            "\n\n3. Mobile apps:"
-            "\n   - Friendly for Facebook (includes downloader)"
-            "\n   - Video Downloader for Facebook"
-            "\n\nNote: Facebook will be supported in future versions when deployed in a standard environment."
-        )
+        raise PlatformUnavailableError(self.platform, UNAVAILABLE_MESSAGE)
     
     async def download(self, url: str, quality: str = "720p") -> Dict[str, Any]:
         """Facebook downloader is currently not available due to SSL/TLS restrictions in this environment
@@ -41,20 +44,6 @@ class FacebookDownloader(BaseDownloader):
             quality: Desired video quality
             
         Raises:
-            NotImplementedError: Facebook support is blocked by environment SSL issues
+            PlatformUnavailableError: Facebook support is blocked by environment SSL issues
         """
-        raise NotImplementedError(
-            "Facebook downloader is currently not available in this environment due to SSL/TLS certificate restrictions. "
-            "\n\nAlternative solutions:"
-            "\n1. Use third-party services:"
-            "\n   - FBDown.net: https://www.fbdown.net/"
-            "\n   - GetFBStuff: https://getfbstuff.com/"
-            "\n   - SnapSave: https://snapsave.app/facebook-video-downloader"
-            "\n\n2. Browser extensions:"
-            "\n   - Video Downloader for Facebook"
-            "\n   - FBDown Video Downloader"
-            "\n\n3. Mobile apps:"
-            "\n   - Friendly for Facebook (includes downloader)"
-            "\n   - Video Downloader for Facebook"
-            "\n\nNote: Facebook will be supported in future versions when deployed in a standard environment."
-        )
+        raise PlatformUnavailableError(self.platform, UNAVAILABLE_MESSAGE)
@@ -1,17 +1,208 @@
-from typing import Any, Dict, Optional, List
-import json
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import copy
 import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
 import yt_dlp
-from src.engine.base_downloader import BaseDownloader
+from src.engine.base_downloader import BaseDownloader, YTDLP_DOWNLOAD_OPTIONS
 from src.core.config import settings
+from src.utils.url_validator import URLValidator
 from loguru import logger
 
+# Format entries reported by get_formats. Only the video entry's dimensions and fps
+# come from the post; everything else is fixed.
+VIDEO_FORMAT_TEMPLATE = MappingProxyType({
+    'format_id': 'default',
+    'quality': 'highest',
+    'ext': 'mp4',
+    'filesize_mb': None,
+    'height': None,
+    'width': None,
+    'fps': None,
+    'vcodec': 'h264',
+    'acodec': 'aac',
+    'format_note': 'video + audio'
+})
+AUDIO_FORMAT = MappingProxyType({
+    'format_id': 'audio',
+    'quality': 'audio',
+    'ext': 'm4a',
+    'filesize_mb': None,
+    'height': None,
+    'width': None,
+    'fps': None,
+    'vcodec': 'none',
+    'acodec': 'aac',
+    'format_note': 'audio only'
+})
+
+# get_formats results by canonical URL: (monotonic time stored, result), oldest first.
+# Listing formats and then downloading, or retrying, re-requests the same post within
+# minutes; the format list holds no signed CDN URLs, so it can be served from memory.
+# download() always extracts fresh because its media URLs expire quickly.
+FORMATS_CACHE_TTL = 600  # seconds
+FORMATS_CACHE_SIZE = 256
+_formats_cache: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+# Format fetches currently running, by canonical URL. Concurrent get_formats calls for
+# the same post await the one running fetch instead of each starting an extraction.
+_formats_inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+
+def _get_cached_formats(key: str) -> Optional[Dict[str, Any]]:
+    """Return a fresh cached get_formats result, or None."""
+    entry = _formats_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, result = entry
+    if time.monotonic() - stored_at >= FORMATS_CACHE_TTL:
+        del _formats_cache[key]
+        return None
+    _formats_cache.move_to_end(key)
+    return result
+
+
+# Cookie file locations in priority order: the deployed path written by the cookie
+# manager bot, then the repo's own cookies directory
+COOKIE_SOURCE_PATHS = (
+    '/opt/librarydown/cookies/instagram_cookies.txt',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'cookies', 'instagram_cookies.txt'),
+)
+_cookie_source: Optional[str] = None
+
+
+def _resolve_cookie_source() -> Optional[str]:
+    """Return the first existing cookie file, probing again only until one is found."""
+    global _cookie_source
+    if _cookie_source is None:
+        _cookie_source = next((path for path in COOKIE_SOURCE_PATHS if os.path.exists(path)), None)
+    return _cookie_source
+
+
+# yt-dlp reads (and on exit rewrites) a temp copy of the cookie file to avoid permission
+# issues with the original. The copy is only refreshed when the source is newer or the
+# sizes differ, so unchanged cookies cost two stat() calls instead of a full copy.
+COOKIE_TEMP_PATH = os.path.join(tempfile.gettempdir(), 'ig_cookies_librarydown.txt')
+_cookie_copy_lock = threading.Lock()
+
+
+def _ensure_temp_cookies(source: str) -> str:
+    """Return the temp cookie path, copying the source file only if the copy is stale."""
+    with _cookie_copy_lock:
+        source_stat = os.stat(source)
+        try:
+            copy_stat = os.stat(COOKIE_TEMP_PATH)
+            if copy_stat.st_mtime >= source_stat.st_mtime and copy_stat.st_size == source_stat.st_size:
+                return COOKIE_TEMP_PATH
+        except FileNotFoundError:
+            pass
+        shutil.copy2(source, COOKIE_TEMP_PATH)
+        os.chmod(COOKIE_TEMP_PATH, 0o644)
+        return COOKIE_TEMP_PATH
+
+
+def _prepare_cookie_file() -> Optional[Tuple[str, str]]:
+    """Return (source, temp copy) for the current cookie file, or None if there is none."""
+    global _cookie_source
+    for _ in range(2):
+        source = _resolve_cookie_source()
+        if source is None:
+            return None
+        try:
+            return source, _ensure_temp_cookies(source)
+        except FileNotFoundError:
+            # Removed or rotated since it was found; forget it and probe the locations again
+            _cookie_source = None
+    return None
+
+
+def _set_cached_formats(key: str, result: Dict[str, Any]) -> None:
+    """Store a get_formats result, evicting the least recently used entry when full."""
+    _formats_cache[key] = (time.monotonic(), result)
+    _formats_cache.move_to_end(key)
+    if len(_formats_cache) > FORMATS_CACHE_SIZE:
+        _formats_cache.popitem(last=False)
+
+
+# Download attempts per request. A failed download is retried from the metadata that
+# was already extracted instead of asking Instagram for it again.
+DOWNLOAD_ATTEMPTS = 3
+
+
+# yt-dlp is fully blocking, so these run in worker threads via asyncio.to_thread
+def _sync_extract(url: str, opts: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Extract metadata without downloading and return it sanitized, or None."""
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+        return ydl.sanitize_info(info) if info else None
+
+
+def _sync_download(url: str, opts: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Dict[str, int]]:
+    """Extract metadata once, then download from it, retrying only the download.
+
+    Returns:
+        The sanitized metadata (or None) and the byte count of each file yt-dlp
+        finished downloading, by path, as reported by its progress hook
+    """
+    downloaded_bytes: Dict[str, int] = {}
+    
+    def record_finished(progress: Dict[str, Any]) -> None:
+        if progress['status'] == 'finished':
+            downloaded_bytes[progress['filename']] = progress.get('downloaded_bytes') or progress.get('total_bytes') or 0
+    
+    with yt_dlp.YoutubeDL({**opts, 'progress_hooks': [record_finished]}) as ydl:
+        info = ydl.extract_info(url, download=False)
+        if not info:
+            return None, downloaded_bytes
+        info = ydl.sanitize_info(info)
+        
+        for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+            try:
+                # yt-dlp mutates the info dict while downloading, so each attempt gets its own copy
+                ydl.process_ie_result(copy.deepcopy(info), download=True)
+                break
+            except yt_dlp.utils.DownloadError as e:
+                if attempt == DOWNLOAD_ATTEMPTS:
+                    raise
+                logger.warning(f"[instagram] Download attempt {attempt} failed, retrying: {e}")
+                if 'HTTP Error 403' in str(e):
+                    # The signed media URLs have expired, so they have to be extracted again
+                    info = ydl.sanitize_info(ydl.extract_info(url, download=False))
+        return info, downloaded_bytes
+
+
+def _file_size_mb(path: str) -> Optional[float]:
+    """Return a file's size in MB, or None if it doesn't exist."""
+    try:
+        return os.path.getsize(path) / (1024 * 1024)
+    except FileNotFoundError:
+        return None
+
 
 class InstagramDownloader(BaseDownloader):
     @property
     def platform(self) -> str:
         return "instagram"
     
+    async def _add_cookie_options(self, ydl_opts: Dict[str, Any]) -> None:
+        """Point yt-dlp at the configured browser profile, or else at the cookie file if one exists"""
+        if settings.YTDLP_COOKIES_FROM_BROWSER:
+            # yt-dlp reads the browser's cookie store itself, so no file is copied
+            browser, _, profile = settings.YTDLP_COOKIES_FROM_BROWSER.partition(':')
+            ydl_opts['cookiesfrombrowser'] = (browser, profile or None)
+            logger.info(f"[{self.platform}] Using cookies from browser: {browser}")
+            return
+        
+        # Copy the cookie file to temp to avoid permission issues
+        cookie_file = await asyncio.to_thread(_prepare_cookie_file)
+        if cookie_file:
+            cookies_path, ydl_opts['cookiefile'] = cookie_file
+            logger.info(f"[{self.platform}] Using cookies from: {cookies_path}")
+    
     async def get_formats(self, url: str) -> Dict[str, Any]:
         """Get available formats for Instagram content without downloading
         
@@ -21,6 +212,24 @@ class InstagramDownloader(BaseDownloader):
         Returns:
             Dict containing video metadata and available formats
         """
+        cache_key = URLValidator.canonicalize_url(url)
+        cached = _get_cached_formats(cache_key)
+        if cached is not None:
+            logger.info(f"[{self.platform}] Formats served from cache for: {url}")
+            return copy.deepcopy(cached)
+        
+        pending = _formats_inflight.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_formats(url, cache_key))
+            _formats_inflight[cache_key] = pending
+            pending.add_done_callback(lambda _: _formats_inflight.pop(cache_key, None))
+        else:
+            logger.info(f"[{self.platform}] Joining in-flight format fetch for: {url}")
+        # Shielded so one caller giving up doesn't cancel the fetch for the others
+        return copy.deepcopy(await asyncio.shield(pending))
+    
+    async def _fetch_formats(self, url: str, cache_key: str) -> Dict[str, Any]:
+        """Extract formats with yt-dlp and store the result in the formats cache"""
         try:
             logger.info(f"[{self.platform}] Fetching formats for: {url}")
             
@@ -30,73 +239,37 @@ class InstagramDownloader(BaseDownloader):
                 'skip_download': True,
             }
             
-            # Add cookies file if exists (copy to temp to avoid permission issues)
-            # Try both possible cookie locations
-            cookies_path = '/opt/librarydown/cookies/instagram_cookies.txt'
-            if not os.path.exists(cookies_path):
-                cookies_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'cookies', 'instagram_cookies.txt')
+            await self._add_cookie_options(ydl_opts)
             
-            if os.path.exists(cookies_path):
-                import shutil
-                import tempfile
-                temp_cookies = os.path.join(tempfile.gettempdir(), 'ig_cookies_librarydown.txt')
-                shutil.copy2(cookies_path, temp_cookies)
-                os.chmod(temp_cookies, 0o644)
-                ydl_opts['cookiefile'] = temp_cookies
-                logger.info(f"[{self.platform}] Using cookies from: {cookies_path}")
+            info = await asyncio.to_thread(_sync_extract, url, ydl_opts)
+            
+            if not info:
+                raise ValueError("Failed to extract Instagram data")
+            
+            # Extract metadata
+            title = info.get('title')
+            thumbnail = info.get('thumbnail')
+            duration = info.get('duration', 0)
+            
+            # Instagram usually provides single quality, plus the audio-only option
+            formats = [
+                {**VIDEO_FORMAT_TEMPLATE, 'height': info.get('height'), 'width': info.get('width'), 'fps': info.get('fps')},
+                dict(AUDIO_FORMAT),
+            ]
+            
+            logger.info(f"[{self.platform}] Found {len(formats)} formats")
+            
+            result = {
+                'platform': 'instagram',
+                'url': url,
+                'title': title,
+                'thumbnail': thumbnail,
+                'duration': duration,
+                'formats': formats
+            }
+            _set_cached_formats(cache_key, result)
+            return result
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                
-                if not info:
-                    raise ValueError("Failed to extract Instagram data")
-                
-                # Extract metadata
-                title = info.get('title')
-                thumbnail = info.get('thumbnail')
-                duration = info.get('duration', 0)
-                
-                formats = []
-                
-                # Instagram usually provides single quality
-                formats.append({
-                    'format_id': 'default',
-                    'quality': 'highest',
-                    'ext': 'mp4',
-                    'filesize_mb': None,
-                    'height': info.get('height'),
-                    'width': info.get('width'),
-                    'fps': info.get('fps'),
-                    'vcodec': 'h264',
-                    'acodec': 'aac',
-                    'format_note': 'video + audio'
-                })
-                
-                # Audio-only option
-                formats.append({
-                    'format_id': 'audio',
-                    'quality': 'audio',
-                    'ext': 'm4a',
-                    'filesize_mb': None,
-                    'height': None,
-                    'width': None,
-                    'fps': None,
-                    'vcodec': 'none',
-                    'acodec': 'aac',
-                    'format_note': 'audio only'
-                })
-                
-                logger.info(f"[{self.platform}] Found {len(formats)} formats")
-                
-                return {
-                    'platform': 'instagram',
-                    'url': url,
-                    'title': title,
-                    'thumbnail': thumbnail,
-                    'duration': duration,
-                    'formats': formats
-                }
-                
         except Exception as e:
             logger.error(f"[{self.platform}] Error fetching formats: {e}")
             raise
@@ -116,117 +289,88 @@ class InstagramDownloader(BaseDownloader):
             logger.info(f"[{self.platform}] Processing URL: {url} (quality: {quality})")
             
             is_audio_only = quality.lower() == 'audio'
+            # Read once per request rather than at import so a changed MEDIA_FOLDER is honoured
+            media_folder = settings.MEDIA_FOLDER
+            media_url_prefix = f"{settings.API_BASE_URL}/{media_folder}"
             
-            # Get metadata first
-            ydl_opts_info = {
+            # Extract and download with a single yt-dlp instance; the output template
+            # takes the post id from the extraction
+            ydl_opts = {
+                **YTDLP_DOWNLOAD_OPTIONS,
                 'quiet': True,
                 'no_warnings': True,
-                'skip_download': True,
             }
-            
-            # Add cookies file if exists (copy to temp to avoid permission issues)
-            # Try both possible cookie locations
-            cookies_path = '/opt/librarydown/cookies/instagram_cookies.txt'
-            if not os.path.exists(cookies_path):
-                cookies_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'cookies', 'instagram_cookies.txt')
-            
-            if os.path.exists(cookies_path):
-                import shutil
-                import tempfile
-                temp_cookies = os.path.join(tempfile.gettempdir(), 'ig_cookies_librarydown.txt')
-                shutil.copy2(cookies_path, temp_cookies)
-                os.chmod(temp_cookies, 0o644)
-                ydl_opts_info['cookiefile'] = temp_cookies
-                logger.info(f"[{self.platform}] Using cookies for download from: {cookies_path}")
-            
-            with yt_dlp.YoutubeDL(ydl_opts_info) as ydl:
-                logger.info(f"[{self.platform}] Extracting metadata...")
-                info = ydl.extract_info(url, download=False)
-                
-                if not info:
-                    raise ValueError("Failed to extract Instagram data")
-                
-                # Get metadata
-                video_id = info.get('id')
-                title = info.get('title')
-                uploader = info.get('uploader')
-                uploader_id = info.get('uploader_id')
-                description = info.get('description', '')
-                thumbnail = info.get('thumbnail')
-                view_count = info.get('view_count', 0)
-                like_count = info.get('like_count', 0)
-                comment_count = info.get('comment_count', 0)
-                duration = info.get('duration', 0)
-                timestamp = info.get('timestamp')
-            
-            # Prepare downloads
-            downloads = []
-            downloaded_media = []
-            
-            # Prepare cookies path for download opts
-            temp_cookies = os.path.join(tempfile.gettempdir(), 'ig_cookies_librarydown.txt')
-            
             if is_audio_only:
                 # Only download audio
-                download_opts = {
+                ydl_opts.update({
                     'format': 'bestaudio/best',
-                    'quiet': True,
-                    'no_warnings': True,
-                    'outtmpl': os.path.join(settings.MEDIA_FOLDER, f'{video_id}_audio.%(ext)s'),
+                    'outtmpl': os.path.join(media_folder, '%(id)s_audio.%(ext)s'),
                     'postprocessors': [{
                         'key': 'FFmpegExtractAudio',
                         'preferredcodec': 'm4a',
                     }],
-                }
-                if os.path.exists(temp_cookies):
-                    download_opts['cookiefile'] = temp_cookies
-                downloads.append({'type': 'audio', 'opts': download_opts})
+                })
             else:
-                # Download video
-                video_opts = {
+                # Download the video once and take the audio track from the local file;
+                # 'best' already carries AAC audio, so ffmpeg copies it without re-encoding
+                ydl_opts.update({
                     'format': 'best',
-                    'quiet': True,
-                    'no_warnings': True,
-                    'outtmpl': os.path.join(settings.MEDIA_FOLDER, f'{video_id}.%(ext)s'),
-                }
-                if os.path.exists(temp_cookies):
-                    video_opts['cookiefile'] = temp_cookies
-                downloads.append({'type': 'video', 'opts': video_opts})
-                
-                # Also download audio
-                audio_opts = {
-                    'format': 'bestaudio/best',
-                    'quiet': True,
-                    'no_warnings': True,
-                    'outtmpl': os.path.join(settings.MEDIA_FOLDER, f'{video_id}_audio.%(ext)s'),
+                    'outtmpl': os.path.join(media_folder, '%(id)s.%(ext)s'),
+                    'keepvideo': True,
                     'postprocessors': [{
                         'key': 'FFmpegExtractAudio',
                         'preferredcodec': 'm4a',
                     }],
-                }
-                if os.path.exists(temp_cookies):
-                    audio_opts['cookiefile'] = temp_cookies
-                downloads.append({'type': 'audio', 'opts': audio_opts})
+                })
+            
+            await self._add_cookie_options(ydl_opts)
             
-            # Download all formats
-            for download_info in downloads:
-                logger.info(f"[{self.platform}] Downloading {download_info['type']}...")
-                with yt_dlp.YoutubeDL(download_info['opts']) as ydl:
-                    ydl.download([url])
+            logger.info(f"[{self.platform}] Downloading {'audio' if is_audio_only else 'video'}...")
+            info, downloaded_bytes = await asyncio.to_thread(_sync_download, url, ydl_opts)
+            
+            if not info:
+                raise ValueError("Failed to extract Instagram data")
+            
+            # Get metadata
+            video_id = info.get('id')
+            title = info.get('title')
+            uploader = info.get('uploader')
+            uploader_id = info.get('uploader_id')
+            description = info.get('description', '')
+            thumbnail = info.get('thumbnail')
+            view_count = info.get('view_count', 0)
+            like_count = info.get('like_count', 0)
+            comment_count = info.get('comment_count', 0)
+            duration = info.get('duration', 0)
+            timestamp = info.get('timestamp')
+            
+            downloaded_media = []
             
             # Check downloaded files
             if not is_audio_only:
+                # The extracted track is written next to the video as {id}.m4a
+                extracted_audio = os.path.join(media_folder, f"{video_id}.m4a")
+                try:
+                    await asyncio.to_thread(os.replace, extracted_audio, os.path.join(media_folder, f"{video_id}_audio.m4a"))
+                except FileNotFoundError:
+                    pass
+                
                 # Video file
                 video_filename = f"{video_id}.mp4"
-                video_filepath = os.path.join(settings.MEDIA_FOLDER, video_filename)
-                if os.path.exists(video_filepath):
-                    file_size_mb = os.path.getsize(video_filepath) / (1024 * 1024)
+                video_filepath = os.path.join(media_folder, video_filename)
+                # The download hook already knows the video's size; only the audio track,
+                # which ffmpeg writes, needs a stat
+                if video_filepath in downloaded_bytes:
+                    file_size_mb = downloaded_bytes[video_filepath] / (1024 * 1024)
+                else:
+                    file_size_mb = await asyncio.to_thread(_file_size_mb, video_filepath)
+                if file_size_mb is not None:
                     logger.info(f"[{self.platform}] Video download complete: {file_size_mb:.2f} MB")
                     downloaded_media.append({
                         'quality': 'highest',
                         'format_id': 'video',
                         'ext': 'mp4',
-                        'url': f"{settings.API_BASE_URL}/{settings.MEDIA_FOLDER}/{video_filename}",
+                        'url': f"{media_url_prefix}/{video_filename}",
                         'downloaded': True,
                         'height': info.get('height'),
                         'width': info.get('width'),
@@ -236,15 +380,15 @@ class InstagramDownloader(BaseDownloader):
             
             # Audio file
             audio_filename = f"{video_id}_audio.m4a"
-            audio_filepath = os.path.join(settings.MEDIA_FOLDER, audio_filename)
-            if os.path.exists(audio_filepath):
-                file_size_mb = os.path.getsize(audio_filepath) / (1024 * 1024)
+            audio_filepath = os.path.join(media_folder, audio_filename)
+            file_size_mb = await asyncio.to_thread(_file_size_mb, audio_filepath)
+            if file_size_mb is not None:
                 logger.info(f"[{self.platform}] Audio download complete: {file_size_mb:.2f} MB")
                 downloaded_media.append({
                     'quality': 'audio',
                     'format_id': 'audio',
                     'ext': 'm4a',
-                    'url': f"{settings.API_BASE_URL}/{settings.MEDIA_FOLDER}/{audio_filename}",
+                    'url': f"{media_url_prefix}/{audio_filename}",
                     'downloaded': True,
                     'height': None,
                     'width': None,
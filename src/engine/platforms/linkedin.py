@@ -1,7 +1,27 @@
 from typing import Any, Dict, Optional
 from src.engine.base_downloader import BaseDownloader
+from src.utils.exceptions import PlatformUnavailableError
 from loguru import logger
 
+UNAVAILABLE_MESSAGE = (
+    "LinkedIn video downloader is not currently supported. "
+    "\n\nAlternative solutions:"
+    "\n1. Browser extensions:"
+    "\n   - LinkedIn Video Downloader Extension"
+    "\n   - Video Downloader Professional"
+    "\n\n2. Web services:"
+    "\n   - LinkedIn Video Downloader: https://linkedin-video-downloader.com/"
+    "\n   - Save LinkedIn Videos: https://savelinkedinvideos.com/"
+    "\n\n3. Manual download method:"
+    "\n   - Open browser DevTools (F12)"
+    "\n   - Go to Network tab"
+    "\n   - Play the video"
+    "\n   - Filter by 'media' or 'mp4'"
+    "\n   - Find and download the video file"
+    "\n\nNote: LinkedIn has strict anti-scraping measures. "
+    "Professional API access or browser automation required for reliable downloads."
+)
+
 
 class LinkedInDownloader(BaseDownloader):
     @property
@@ -15,26 +35,9 @@ class LinkedInDownloader(BaseDownloader):
             url: LinkedIn post URL
             
         Raises:
-            NotImplementedError: LinkedIn is not supported by yt-dlp library
+            PlatformUnavailableError: LinkedIn is not supported by yt-dlp library
         """
-        raise NotImplementedError(
-            "LinkedIn video downloader is not currently supported. "
-            "\n\nAlternative solutions:"
-            "\n1. Browser extensions:"
-            "\n   - LinkedIn Video Downloader Extension"
-            "\n   - Video Downloader Professional"
-            "\n\n2. Web services:"
-            "\n   - LinkedIn Video Downloader: https://linkedin-video-downloader.com/"
-            "\n   - Save LinkedIn Videos: https://savelinkedinvideos.com/"
-            "\n\n3. Manual download method:"
-            "\n   - Open browser DevTools (F12)"
-            "\n   - Go to Network tab"
-            "\n   - Play the video"
-            "\n   - Filter by 'media' or 'mp4'"
-            "\n   - Find and download the video file"
-            "\n\nNote: LinkedIn has strict anti-scraping measures. "
-            "Professional API access or browser automation required for reliable downloads."
-        )
+        raise PlatformUnavailableError(self.platform, UNAVAILABLE_MESSAGE)
     
     async def download(self, url: str, quality: str = "720p") -> Dict[str, Any]:
         """LinkedIn downloader is not supported by yt-dlp
@@ -44,23 +47,6 @@ class LinkedInDownloader(BaseDownloader):
             quality: Desired video quality
             
         Raises:
-            NotImplementedError: LinkedIn is not supported by yt-dlp library
+            PlatformUnavailableError: LinkedIn is not supported by yt-dlp library
         """
-        raise NotImplementedError(
-            "LinkedIn video downloader is not currently supported. "
-            "\n\nAlternative solutions:"
-            "\n1. Browser extensions:"
-            "\n   - LinkedIn Video Downloader Extension"
-            "\n   - Video Downloader Professional"
-            "\n\n2. Web services:"
-            "\n   - LinkedIn Video Downloader: https://linkedin-video-downloader.com/"
-            "\n   - Save LinkedIn Videos: https://savelinkedinvideos.com/"
-            "\n\n3. Manual download method:"
-            "\n   - Open browser DevTools (F12)"
-            "\n   - Go to Network tab"
-            "\n   - Play the video"
-            "\n   - Filter by 'media' or 'mp4'"
-            "\n   - Find and download the video file"
-            "\n\nNote: LinkedIn has strict anti-scraping measures. "
-            "Professional API access or browser automation required for reliable downloads."
-        )
+        raise PlatformUnavailableError(self.platform, UNAVAILABLE_MESSAGE)
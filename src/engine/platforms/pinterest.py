@@ -1,7 +1,29 @@
 from typing import Any, Dict, Optional
 from src.engine.base_downloader import BaseDownloader
+from src.utils.exceptions import PlatformUnavailableError
 from loguru import logger
 
+UNAVAILABLE_MESSAGE = (
+    "Pinterest video/image downloader is not currently supported. "
+    "\n\nAlternative solutions:"
+    "\n1. Use third-party services:"
+    "\n   - Pinterest Video Downloader: https://pinterestvideodownloader.com/"
+    "\n   - Pin4Ever: https://www.pin4ever.com/"
+    "\n   - SavePin: https://www.savepin.cc/"
+    "\n\n2. Browser extensions:"
+    "\n   - Pinterest Save Button (official)"
+    "\n   - Image Downloader"
+    "\n   - Video Downloader Professional"
+    "\n\n3. For images - right-click method:"
+    "\n   - Right-click on image"
+    "\n   - Select 'Save image as...'"
+    "\n   - Or 'Open image in new tab' then save"
+    "\n\n4. Command-line tools:"
+    "\n   - gallery-dl: gallery-dl <pinterest_url>"
+    "\n\nNote: Pinterest may require login for full access. "
+    "Support may be added in future versions with proper API integration."
+)
+
 
 class PinterestDownloader(BaseDownloader):
     @property
@@ -15,28 +37,9 @@ class PinterestDownloader(BaseDownloader):
             url: Pinterest pin URL
             
         Raises:
-            NotImplementedError: Pinterest is not supported by yt-dlp library
+            PlatformUnavailableError: Pinterest is not supported by yt-dlp library
         """
-        raise NotImplementedError(
-            "Pinterest video/image downloader is not currently supported. "
-            "\n\nAlternative solutions:"
-            "\n1. Use third-party services:"
-            "\n   - Pinterest Video Downloader: https://pinterestvideodownloader.com/"
-            "\n   - Pin4Ever: https://www.pin4ever.com/"
-            "\n   - SavePin: https://www.savepin.cc/"
-            "\n\n2. Browser extensions:"
-            "\n   - Pinterest Save Button (official)"
-            "\n   - Image Downloader"
-            "\n   - Video Downloader Professional"
-            "\n\n3. For images - right-click method:"
-            "\n   - Right-click on image"
-            "\n   - Select 'Save image as...'"
-            "\n   - Or 'Open image in new tab' then save"
-            "\n\n4. Command-line tools:"
-            "\n   - gallery-dl: gallery-dl <pinterest_url>"
-            "\n\nNote: Pinterest may require login for full access. "
-            "Support may be added in future versions with proper API integration."
-        )
+        raise PlatformUnavailableError(self.platform, UNAVAILABLE_MESSAGE)
     
     async def download(self, url: str, quality: str = "720p") -> Dict[str, Any]:
         """Pinterest downloader is not supported by yt-dlp
@@ -46,25 +49,6 @@ class PinterestDownloader(BaseDownloader):
             quality: Desired quality
             
         Raises:
-            NotImplementedError: Pinterest is not supported by yt-dlp library
+            PlatformUnavailableError: Pinterest is not supported by yt-dlp library
         """
-        raise NotImplementedError(
-            "Pinterest video/image downloader is not currently supported. "
-            "\n\nAlternative solutions:"
-            "\n1. Use third-party services:"
-            "\n   - Pinterest Video Downloader: https://pinterestvideodownloader.com/"
-            "\n   - Pin4Ever: https://www.pin4ever.com/"
-            "\n   - SavePin: https://www.savepin.cc/"
-            "\n\n2. Browser extensions:"
-            "\n   - Pinterest Save Button (official)"
-            "\n   - Image Downloader"
-            "\n   - Video Downloader Professional"
-            "\n\n3. For images - right-click method:"
-            "\n   - Right-click on image"
-            "\n   - Select 'Save image as...'"
-            "\n   - Or 'Open image in new tab' then save"
-            "\n\n4. Command-line tools:"
-            "\n   - gallery-dl: gallery-dl <pinterest_url>"
-            "\n\nNote: Pinterest may require login for full access. "
-            "Support may be added in future versions with proper API integration."
-        )
+        raise PlatformUnavailableError(self.platform, UNAVAILABLE_MESSAGE)
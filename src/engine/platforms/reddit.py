@@ -2,9 +2,26 @@ from typing import Any, Dict, Optional
 import json
 import os
 from src.engine.base_downloader import BaseDownloader
+from src.utils.exceptions import PlatformUnavailableError
 from src.core.config import settings
 from loguru import logger
 
+UNAVAILABLE_MESSAGE = (
+    "Reddit downloader is currently not available in this environment due to SSL/TLS certificate restrictions. "
+    "\n\nAlternative solutions:"
+    "\n1. Use third-party services:"
+    "\n   - RedditSave: https://redditsave.com/"
+    "\n   - RedVid: https://redv.co/"
+    "\n   - SaveMP4: https://savemp4.red/"
+    "\n\n2. Browser extensions:"
+    "\n   - Reddit Video Downloader (Chrome/Firefox)"
+    "\n   - Video Downloader professional"
+    "\n\n3. Command-line tools:"
+    "\n   - gallery-dl: https://github.com/mikf/gallery-dl"
+    "\n   - yt-dlp (direct): yt-dlp <reddit_url>"
+    "\n\nNote: Reddit will be supported in future versions when deployed in a standard environment."
+)
+
 
 class RedditDownloader(BaseDownloader):
     @property
@@ -18,23 +35,9 @@ class RedditDownloader(BaseDownloader):
             url: Reddit post URL
             
         Raises:
-            NotImplementedError: Reddit support is blocked by environment SSL issues
+            PlatformUnavailableError: Reddit support is blocked by environment SSL issues
         """
-        raise NotImplementedError(
-            "Reddit downloader is currently not available in this environment due to SSL/TLS certificate restrictions. "
-            "\n\nAlternative solutions:"
-            "\n1. Use third-party services:"
-            "\n   - RedditSave: https://redditsave.com/"
-            "\n   - RedVid: https://redv.co/"
-            "\n   - SaveMP4: https://savemp4.red/"
-            "\n\n2. Browser extensions:"
-            "\n   - Reddit Video Downloader (Chrome/Firefox)"
-            "\n   - Video Downloader professional"
-            "\n\n3. Command-line tools:"
-            "\n   - gallery-dl: https://github.com/mikf/gallery-dl"
-            "\n   - yt-dlp (direct): yt-dlp <reddit_url>"
-            "\n\nNote: Reddit will be supported in future versions when deployed in a standard environment."
-        )
+        raise PlatformUnavailableError(self.platform, UNAVAILABLE_MESSAGE)
     
     async def download(self, url: str, quality: str = "720p") -> Dict[str, Any]:
         """Reddit downloader is currently not available due to SSL/TLS restrictions in this environment
@@ -44,20 +47,6 @@ class RedditDownloader(BaseDownloader):
             quality: Desired video quality
             
         Raises:
-            NotImplementedError: Reddit support is blocked by environment SSL issues
+            PlatformUnavailableError: Reddit support is blocked by environment SSL issues
         """
-        raise NotImplementedError(
-            "Reddit downloader is currently not available in this environment due to SSL/TLS certificate restrictions. "
-            "\n\nAlternative solutions:"
-            "\n1. Use third-party services:"
-            "\n   - RedditSave: https://redditsave.com/"
-            "\n   - RedVid: https://redv.co/"
-            "\n   - SaveMP4: https://savemp4.red/"
-            "\n\n2. Browser extensions:"
-            "\n   - Reddit Video Downloader (Chrome/Firefox)"
-            "\n   - Video Downloader professional"
-            "\n\n3. Command-line tools:"
-            "\n   - gallery-dl: https://github.com/mikf/gallery-dl"
-            "\n   - yt-dlp (direct): yt-dlp <reddit_url>"
-            "\n\nNote: Reddit will be supported in future versions when deployed in a standard environment."
-        )
+        raise PlatformUnavailableError(self.platform, UNAVAILABLE_MESSAGE)
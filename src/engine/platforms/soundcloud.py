@@ -1,7 +1,27 @@
 from typing import Any, Dict, Optional
 from src.engine.base_downloader import BaseDownloader
+from src.utils.exceptions import PlatformUnavailableError
 from loguru import logger
 
+UNAVAILABLE_MESSAGE = (
+    "SoundCloud downloader is currently not available in this environment due to network/API restrictions (HTTP 404). "
+    "\n\nAlternative solutions:"
+    "\n1. Use third-party services:"
+    "\n   - SoundCloud Downloader: https://sclouddownloader.net/"
+    "\n   - SCDL: https://soundcloudmp3.org/"
+    "\n   - KlickAud: https://www.klickaud.co/"
+    "\n\n2. Browser extensions:"
+    "\n   - SoundCloud Downloader (Chrome/Firefox)"
+    "\n   - Sound Downloader"
+    "\n\n3. Command-line tools:"
+    "\n   - scdl: pip install scdl && scdl -l <track_url>"
+    "\n   - yt-dlp (direct): yt-dlp <soundcloud_url>"
+    "\n\n4. Desktop applications:"
+    "\n   - 4K Video Downloader"
+    "\n   - JDownloader"
+    "\n\nNote: SoundCloud will be supported in future versions when deployed in a standard environment."
+)
+
 
 class SoundCloudDownloader(BaseDownloader):
     @property
@@ -15,26 +35,9 @@ class SoundCloudDownloader(BaseDownloader):
             url: SoundCloud track URL
             
         Raises:
-            NotImplementedError: SoundCloud support is blocked by environment network issues
+            PlatformUnavailableError: SoundCloud support is blocked by environment network issues
         """
-        raise NotImplementedError(
-            "SoundCloud downloader is currently not available in this environment due to network/API restrictions (HTTP 404). "
-            "\n\nAlternative solutions:"
-            "\n1. Use third-party services:"
-            "\n   - SoundCloud Downloader: https://sclouddownloader.net/"
-            "\n   - SCDL: https://soundcloudmp3.org/"
-            "\n   - KlickAud: https://www.klickaud.co/"
-            "\n\n2. Browser extensions:"
-            "\n   - SoundCloud Downloader (Chrome/Firefox)"
-            "\n   - Sound Downloader"
-            "\n\n3. Command-line tools:"
-            "\n   - scdl: pip install scdl && scdl -l <track_url>"
-            "\n   - yt-dlp (direct): yt-dlp <soundcloud_url>"
-            "\n\n4. Desktop applications:"
-            "\n   - 4K Video Downloader"
-            "\n   - JDownloader"
-            "\n\nNote: SoundCloud will be supported in future versions when deployed in a standard environment."
-        )
+        raise PlatformUnavailableError(self.platform, UNAVAILABLE_MESSAGE)
     
     async def download(self, url: str, quality: str = "audio") -> Dict[str, Any]:
         """SoundCloud downloader is currently not available due to network restrictions
@@ -44,23 +47,6 @@ class SoundCloudDownloader(BaseDownloader):
             quality: Desired audio quality
             
         Raises:
-            NotImplementedError: SoundCloud support is blocked by environment network issues
+            PlatformUnavailableError: SoundCloud support is blocked by environment network issues
         """
-        raise NotImplementedError(
-            "SoundCloud downloader is currently not available in this environment due to network/API restrictions (HTTP 404). "
-            "\n\nAlternative solutions:"
-            "\n1. Use third-party services:"
-            "\n   - SoundCloud Downloader: https://sclouddownloader.net/"
-            "\n   - SCDL: https://soundcloudmp3.org/"
-            "\n   - KlickAud: https://www.klickaud.co/"
-            "\n\n2. Browser extensions:"
-            "\n   - SoundCloud Downloader (Chrome/Firefox)"
-            "\n   - Sound Downloader"
-            "\n\n3. Command-line tools:"
-            "\n   - scdl: pip install scdl && scdl -l <track_url>"
-            "\n   - yt-dlp (direct): yt-dlp <soundcloud_url>"
-            "\n\n4. Desktop applications:"
-            "\n   - 4K Video Downloader"
-            "\n   - JDownloader"
-            "\n\nNote: SoundCloud will be supported in future versions when deployed in a standard environment."
-        )
+        raise PlatformUnavailableError(self.platform, UNAVAILABLE_MESSAGE)
@@ -1,32 +1,95 @@
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 import json
 import httpx
+import orjson
 import re
 import os
 import asyncio
+import time
+from collections import OrderedDict
+import aiofiles
 from src.engine.base_downloader import BaseDownloader
 from src.engine.extractor import BaseExtractor
 from src.core.config import settings
+from src.utils.url_validator import URLValidator
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
     'Referer': 'https://www.tiktok.com/'
 }
 
-def find_item_struct_recursive(data: Any) -> Optional[Dict[str, Any]]:
-    """Recursively searches for a key named 'itemStruct'."""
-    if isinstance(data, dict):
-        if 'itemStruct' in data and isinstance(data['itemStruct'], dict):
-            return data['itemStruct']
-        for value in data.values():
-            found = find_item_struct_recursive(value)
-            if found: return found
-    elif isinstance(data, list):
-        for item in data:
-            found = find_item_struct_recursive(item)
-            if found: return found
+# Assets are streamed to disk in chunks this large; aiofiles does the writes in a
+# thread so they don't block the event loop
+ASSET_CHUNK_SIZE = 1024 * 1024
+# Most assets of one post downloaded at once; below the shared clients' 20 keep-alive connections
+MAX_CONCURRENT_ASSETS = 8
+
+# The page's JSON state lives in this script tag. str.find jumps to the tag first, so
+# the compiled pattern only scans from there rather than from the top of the document.
+DATA_SCRIPT_MARKER = '<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__"'
+DATA_SCRIPT_PATTERN = re.compile(r'<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">(.*?)</script>')
+
+def find_data_script(html: str) -> Optional[re.Match]:
+    """Return the match whose first group is the page's JSON state, or None."""
+    start = html.find(DATA_SCRIPT_MARKER)
+    return DATA_SCRIPT_PATTERN.search(html, start) if start >= 0 else None
+
+def load_page_data(raw: str) -> Dict[str, Any]:
+    """Decode the page's JSON state with orjson, falling back to json for input only it accepts."""
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # e.g. NaN/Infinity literals or lone surrogates
+        return json.loads(raw)
+
+def find_item_struct(data: Any) -> Optional[Dict[str, Any]]:
+    """Searches depth-first, in document order, for a non-empty dict under a key named 'itemStruct'."""
+    # An explicit stack instead of recursion: the page data is deeply nested and a
+    # Python call per node costs more than the search itself. Children are pushed in
+    # reverse so they're popped in their original order.
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            item_struct = node.get('itemStruct')
+            if isinstance(item_struct, dict) and item_struct:
+                return item_struct
+            stack.extend(reversed(node.values()))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
     return None
 
+# itemStruct by canonical URL: (monotonic time stored, item), oldest first. Only
+# get_formats reads it (download() stores but never reuses items, since their signed
+# URLs are tied to the cookies of the fetch that produced them).
+# Items are only read after extraction (TikTokExtractor builds new dicts), so cached
+# ones are shared rather than copied.
+ITEM_CACHE_TTL = 300  # seconds
+ITEM_CACHE_SIZE = 256
+_item_cache: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+# Page fetches currently running, by canonical URL, so concurrent requests for the
+# same post share one fetch
+_item_fetches: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+def _get_cached_item(key: str) -> Optional[Dict[str, Any]]:
+    """Return a fresh cached itemStruct, or None."""
+    entry = _item_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, item_struct = entry
+    if time.monotonic() - stored_at >= ITEM_CACHE_TTL:
+        del _item_cache[key]
+        return None
+    _item_cache.move_to_end(key)
+    return item_struct
+
+def _set_cached_item(key: str, item_struct: Dict[str, Any]) -> None:
+    """Store an itemStruct, evicting the least recently used entry when full."""
+    _item_cache[key] = (time.monotonic(), item_struct)
+    _item_cache.move_to_end(key)
+    if len(_item_cache) > ITEM_CACHE_SIZE:
+        _item_cache.popitem(last=False)
+
 class TikTokExtractor(BaseExtractor):
     def __init__(self, json_data: Dict[str, Any]):
         self.json_data = json_data
@@ -118,6 +181,69 @@ class TikTokDownloader(BaseDownloader):
     @property
     def platform(self) -> str: return "tiktok"
 
+    async def _load_item_struct(self, client: httpx.AsyncClient, url: str) -> Dict[str, Any]:
+        """Fetch the page and return its itemStruct, raising ValueError if there is none"""
+        response = await client.get(url, headers=HEADERS, timeout=30.0)
+        response.raise_for_status()
+        match = find_data_script(response.text)
+        if not match:
+            raise ValueError("Could not find data script in HTML response.")
+        
+        json_data = load_page_data(match.group(1))
+        scope = json_data.get('__DEFAULT_SCOPE__', {})
+        
+        print(f"[{self.platform}] Searching for item data in JSON response...")
+        item_struct = find_item_struct(scope)
+        
+        if not item_struct:
+            if scope.get('webapp.error-page'):
+                raise ValueError("Content not available. The page is an error page.")
+            raise ValueError("Could not find any 'itemStruct' in the page data.")
+        return item_struct
+
+    async def _fetch_item_struct(self, client: httpx.AsyncClient, url: str, use_cache: bool) -> Dict[str, Any]:
+        """Return the post's itemStruct, reusing a cached result or a fetch already running when allowed
+        
+        Args:
+            client: HTTP client for the page request
+            url: TikTok post URL
+            use_cache: Whether a cached or in-flight result may be used; a fresh fetch
+                is always stored in the cache either way
+        """
+        cache_key = URLValidator.canonicalize_url(url)
+        if not use_cache:
+            item_struct = await self._load_item_struct(client, url)
+            _set_cached_item(cache_key, item_struct)
+            return item_struct
+        
+        cached = _get_cached_item(cache_key)
+        if cached is not None:
+            return cached
+        
+        if self.http_client is None:
+            # A short-lived client closes with its caller, so its fetch can't be shared
+            item_struct = await self._load_item_struct(client, url)
+        else:
+            pending = _item_fetches.get(cache_key)
+            if pending is None:
+                pending = asyncio.ensure_future(self._load_item_struct(client, url))
+                _item_fetches[cache_key] = pending
+                pending.add_done_callback(lambda _: _item_fetches.pop(cache_key, None))
+            # Shielded so one caller giving up doesn't cancel the fetch for the others
+            item_struct = await asyncio.shield(pending)
+        _set_cached_item(cache_key, item_struct)
+        return item_struct
+
+    async def _fetch_and_extract(self, client: httpx.AsyncClient, url: str, use_cache: bool) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Shared first step of get_formats and download
+        
+        Returns:
+            The raw itemStruct and the normalized data TikTokExtractor builds from it
+        """
+        item_struct = await self._fetch_item_struct(client, url, use_cache=use_cache)
+        print(f"[{self.platform}] Found item data successfully.")
+        return item_struct, TikTokExtractor(item_struct).extract_all_data()
+
     async def get_formats(self, url: str) -> Dict[str, Any]:
         """Get available formats for a TikTok video without downloading
         
@@ -129,28 +255,10 @@ class TikTokDownloader(BaseDownloader):
             
         Note: TikTok provides fixed quality formats, not multiple resolutions like YouTube
         """
-        async with httpx.AsyncClient(headers=HEADERS, follow_redirects=True) as client:
+        async with self._client(headers=HEADERS, follow_redirects=True) as client:
             try:
-                # Get page content
-                response = await client.get(url, timeout=30.0)
-                response.raise_for_status()
-                match = re.search(r'<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">(.*?)</script>', response.text)
-                if not match:
-                    raise ValueError("Could not find data script in HTML response.")
-                
-                json_data = json.loads(match.group(1))
-                scope = json_data.get('__DEFAULT_SCOPE__', {})
-                
-                # Find item data
-                item_struct = find_item_struct_recursive(scope)
-                
-                if not item_struct:
-                    if scope.get('webapp.error-page'):
-                        raise ValueError("Content not available. The page is an error page.")
-                    raise ValueError("Could not find any 'itemStruct' in the page data.")
-
-                extractor = TikTokExtractor(item_struct)
-                data = extractor.extract_all_data()
+                # Get item data from the page (or the recent-items cache)
+                item_struct, data = await self._fetch_and_extract(client, url, use_cache=True)
                 
                 # Extract format info
                 formats = []
@@ -207,9 +315,9 @@ class TikTokDownloader(BaseDownloader):
             async with client.stream('GET', asset_url, headers=HEADERS, timeout=60.0) as response:
                 if response.status_code >= 400:
                     return None
-                with open(local_filepath, 'wb') as f:
-                    async for chunk in response.aiter_bytes():
-                        f.write(chunk)
+                async with aiofiles.open(local_filepath, 'wb') as f:
+                    async for chunk in response.aiter_bytes(chunk_size=ASSET_CHUNK_SIZE):
+                        await f.write(chunk)
             return f"{settings.API_BASE_URL}/{settings.MEDIA_FOLDER}/{local_filename}"
         except httpx.RequestError:
             return None
@@ -226,28 +334,13 @@ class TikTokDownloader(BaseDownloader):
         The quality parameter is accepted but may not affect the actual download
         as TikTok serves specific formats.
         """
-        async with httpx.AsyncClient(headers=HEADERS, follow_redirects=True) as client:
+        # Own cookie jar per call: the signed video URL only works with the cookies set by
+        # its own page fetch, and a shared client's jar is overwritten by concurrent fetches
+        async with self._isolated_client(headers=HEADERS, follow_redirects=True) as client:
             try:
-                # 1. Get page content
-                response = await client.get(url, timeout=30.0); response.raise_for_status()
-                match = re.search(r'<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">(.*?)</script>', response.text)
-                if not match: raise ValueError("Could not find data script in HTML response.")
-                
-                json_data = json.loads(match.group(1))
-                scope = json_data.get('__DEFAULT_SCOPE__', {})
-                
-                # 2. Use the recursive search to find the item data
-                print(f"[{self.platform}] Searching for item data in JSON response...")
-                item_struct = find_item_struct_recursive(scope)
-                
-                if not item_struct:
-                    if scope.get('webapp.error-page'):
-                        raise ValueError("Content not available. The page is an error page.")
-                    raise ValueError("Could not find any 'itemStruct' in the page data.")
-
-                print(f"[{self.platform}] Found item data successfully.")
-                extractor = TikTokExtractor(item_struct)
-                data = extractor.extract_all_data()
+                # 1-2. Get the page and extract the item data. Always fetched fresh, for the
+                # same reason.
+                _, data = await self._fetch_and_extract(client, url, use_cache=False)
                 
                 # 3. Download assets
                 content_id = data.get('id'); author_id = data.get('author', {}).get('username')
@@ -261,7 +354,12 @@ class TikTokDownloader(BaseDownloader):
                     for i, img in enumerate(data.get('media', {}).get('images', [])):
                         common_tasks[f'image_{i}'] = self._download_asset(client, img.get('url'), f"{content_id}_image_{i+1}.jpeg", f"image {i+1}")
                 
-                results = await asyncio.gather(*common_tasks.values())
+                # Large carousels would otherwise open a connection per image at once
+                semaphore = asyncio.Semaphore(MAX_CONCURRENT_ASSETS)
+                async def bounded(task):
+                    async with semaphore:
+                        return await task
+                results = await asyncio.gather(*(bounded(task) for task in common_tasks.values()))
                 result_map = dict(zip(common_tasks.keys(), results))
 
                 if result_map.get('thumbnail'): data['media']['thumbnail'] = result_map['thumbnail']
@@ -1,5 +1,9 @@
 from typing import Any, Dict, Optional
-from src.engine.base_downloader import BaseDownloader
+import asyncio
+import os
+import yt_dlp
+from src.engine.base_downloader import BaseDownloader, YTDLP_DOWNLOAD_OPTIONS
+from src.core.config import settings
 from loguru import logger
 
 
@@ -255,13 +259,14 @@ class TwitchDownloader(BaseDownloader):
                     }
                 })
             
-            # Download all formats
-            downloaded_files = []
-            for download_info in downloads:
+            # Download all formats concurrently; each writes to its own output file
+            def run_download(download_info: Dict[str, Any]) -> None:
                 logger.info(f"[{self.platform}] Downloading {download_info['type']}...")
-                with yt_dlp.YoutubeDL(download_info['opts']) as ydl:
+                with yt_dlp.YoutubeDL({**YTDLP_DOWNLOAD_OPTIONS, **download_info['opts']}) as ydl:
                     ydl.download([url])
-                downloaded_files.append(download_info['type'])
+            
+            await asyncio.gather(*(asyncio.to_thread(run_download, download_info) for download_info in downloads))
+            downloaded_files = [download_info['type'] for download_info in downloads]
             
             # Build response with all downloaded files
             media_data = []
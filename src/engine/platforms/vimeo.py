@@ -1,7 +1,24 @@
 from typing import Any, Dict, Optional
 from src.engine.base_downloader import BaseDownloader
+from src.utils.exceptions import PlatformUnavailableError
 from loguru import logger
 
+UNAVAILABLE_MESSAGE = (
+    "Vimeo downloader is currently not available in this environment due to SSL/TLS certificate restrictions. "
+    "\n\nAlternative solutions:"
+    "\n1. Use third-party services:"
+    "\n   - SaveFrom.net: https://en.savefrom.net/"
+    "\n   - Vimeo Downloader Online: https://vimeodownloader.com/"
+    "\n   - 9xBuddy: https://9xbuddy.org/"
+    "\n\n2. Browser extensions:"
+    "\n   - Video DownloadHelper (Chrome/Firefox)"
+    "\n   - Flash Video Downloader"
+    "\n\n3. Command-line tools:"
+    "\n   - yt-dlp (direct): yt-dlp <vimeo_url>"
+    "\n   - gallery-dl: https://github.com/mikf/gallery-dl"
+    "\n\nNote: Vimeo will be supported in future versions when deployed in a standard environment."
+)
+
 
 class VimeoDownloader(BaseDownloader):
     @property
@@ -15,23 +32,9 @@ class VimeoDownloader(BaseDownloader):
             url: Vimeo video URL
             
         Raises:
-            NotImplementedError: Vimeo support is blocked by environment SSL issues
+            PlatformUnavailableError: Vimeo support is blocked by environment SSL issues
         """
-        raise NotImplementedError(
-            "Vimeo downloader is currently not available in this environment due to SSL/TLS certificate restrictions. "
-            "\n\nAlternative solutions:"
-            "\n1. Use third-party services:"
-            "\n   - SaveFrom.net: https://en.savefrom.net/"
-            "\n   - Vimeo Downloader Online: https://vimeodownloader.com/"
-            "\n   - 9xBuddy: https://9xbuddy.org/"
-            "\n\n2. Browser extensions:"
-            "\n   - Video DownloadHelper (Chrome/Firefox)"
-            "\n   - Flash Video Downloader"
-            "\n\n3. Command-line tools:"
-            "\n   - yt-dlp (direct): yt-dlp <vimeo_url>"
-            "\n   - gallery-dl: https://github.com/mikf/gallery-dl"
-            "\n\nNote: Vimeo will be supported in future versions when deployed in a standard environment."
-        )
+        raise PlatformUnavailableError(self.platform, UNAVAILABLE_MESSAGE)
     
     async def download(self, url: str, quality: str = "720p") -> Dict[str, Any]:
         """Vimeo downloader is currently not available due to SSL/TLS restrictions in this environment
@@ -41,20 +44,6 @@ class VimeoDownloader(BaseDownloader):
             quality: Desired video quality
             
         Raises:
-            NotImplementedError: Vimeo support is blocked by environment SSL issues
+            PlatformUnavailableError: Vimeo support is blocked by environment SSL issues
         """
-        raise NotImplementedError(
-            "Vimeo downloader is currently not available in this environment due to SSL/TLS certificate restrictions. "
-            "\n\nAlternative solutions:"
-            "\n1. Use third-party services:"
-            "\n   - SaveFrom.net: https://en.savefrom.net/"
-            "\n   - Vimeo Downloader Online: https://vimeodownloader.com/"
-            "\n   - 9xBuddy: https://9xbuddy.org/"
-            "\n\n2. Browser extensions:"
-            "\n   - Video DownloadHelper (Chrome/Firefox)"
-            "\n   - Flash Video Downloader"
-            "\n\n3. Command-line tools:"
-            "\n   - yt-dlp (direct): yt-dlp <vimeo_url>"
-            "\n   - gallery-dl: https://github.com/mikf/gallery-dl"
-            "\n\nNote: Vimeo will be supported in future versions when deployed in a standard environment."
-        )
+        raise PlatformUnavailableError(self.platform, UNAVAILABLE_MESSAGE)
@@ -4,7 +4,7 @@ import os
 import time
 import random
 import yt_dlp
-from src.engine.base_downloader import BaseDownloader
+from src.engine.base_downloader import BaseDownloader, YTDLP_DOWNLOAD_OPTIONS
 from src.core.config import settings
 from src.utils.cookie_manager import cookie_manager
 from src.utils.exceptions import handle_platform_exception
@@ -506,7 +506,7 @@ class YouTubeDownloader(BaseDownloader):
                 
                 for attempt in range(max_retries):
                     try:
-                        with yt_dlp.YoutubeDL(download_info['opts']) as ydl:
+                        with yt_dlp.YoutubeDL({**YTDLP_DOWNLOAD_OPTIONS, **download_info['opts']}) as ydl:
                             ydl.download([url])
                         break  # Success, exit retry loop
                         
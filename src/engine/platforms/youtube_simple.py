@@ -7,7 +7,7 @@ from typing import Any, Dict, Optional
 import json
 import os
 import yt_dlp
-from src.engine.base_downloader import BaseDownloader
+from src.engine.base_downloader import BaseDownloader, YTDLP_DOWNLOAD_OPTIONS
 from src.core.config import settings
 from src.utils.cookie_manager import cookie_manager
 from src.utils.exceptions import handle_platform_exception
@@ -379,7 +379,7 @@ class YouTubeDownloader(BaseDownloader):
                 else:
                     logger.debug(f"[{self.platform}] Proxy config file not found")
                 
-                with yt_dlp.YoutubeDL(download_info['opts']) as ydl:
+                with yt_dlp.YoutubeDL({**YTDLP_DOWNLOAD_OPTIONS, **download_info['opts']}) as ydl:
                     ydl.download([url])
                 downloaded_files.append(download_info['type'])
             
@@ -0,0 +1,88 @@
+"""Platform detection and lazy lookup of platform downloader classes."""
+
+import importlib
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Type
+
+from src.engine.base_downloader import BaseDownloader
+
+
+# Domain token -> platform. Every token is matched in one pass by PLATFORM_URL_PATTERN;
+# the leftmost token in the URL wins, and a token must start at a host label boundary
+# so e.g. "reddit.com" isn't mistaken for "t.co".
+PLATFORM_URL_TOKENS = {
+    "tiktok.com": "tiktok",
+    "vt.tiktok.com": "tiktok",
+    "youtube.com": "youtube",
+    "youtu.be": "youtube",
+    "instagram.com": "instagram",
+    "twitter.com": "twitter",
+    "x.com": "twitter",
+    "t.co": "twitter",
+    "reddit.com": "reddit",
+    "redd.it": "reddit",
+    "soundcloud.com": "soundcloud",
+    "dailymotion.com": "dailymotion",
+    "dai.ly": "dailymotion",
+    "twitch.tv": "twitch",
+    "vimeo.com": "vimeo",
+    "facebook.com": "facebook",
+    "fb.watch": "facebook",
+    "bilibili.com": "bilibili",
+    "b23.tv": "bilibili",
+    "linkedin.com": "linkedin",
+    "pinterest.com": "pinterest",
+    "pin.it": "pinterest",
+}
+# Longest tokens first so "vt.tiktok.com" wins over "tiktok.com" at the same position
+PLATFORM_URL_PATTERN = re.compile(
+    r"(?<![a-z0-9-])(" + "|".join(
+        re.escape(token) for token in sorted(PLATFORM_URL_TOKENS, key=len, reverse=True)
+    ) + r")(?![a-z0-9-])",
+    re.IGNORECASE
+)
+
+
+def detect_platform(url: str) -> str:
+    """Detect platform from URL with a single regex search"""
+    match = PLATFORM_URL_PATTERN.search(url)
+    return PLATFORM_URL_TOKENS[match.group(1).lower()] if match else "unknown"
+
+
+# Platform name -> (module, class). Modules are imported on first use only, so a
+# process that never sees a platform never pays for importing its downloader.
+# Read-only, since get_downloader_class caches what it resolves from it.
+DOWNLOADER_CLASSES = MappingProxyType({
+    "tiktok": ("src.engine.platforms.tiktok", "TikTokDownloader"),
+    "youtube": ("src.engine.platforms.youtube", "YouTubeDownloader"),
+    "instagram": ("src.engine.platforms.instagram", "InstagramDownloader"),
+    "twitter": ("src.engine.platforms.twitter", "TwitterDownloader"),
+    "reddit": ("src.engine.platforms.reddit", "RedditDownloader"),
+    "soundcloud": ("src.engine.platforms.soundcloud", "SoundCloudDownloader"),
+    "dailymotion": ("src.engine.platforms.dailymotion", "DailymotionDownloader"),
+    "twitch": ("src.engine.platforms.twitch", "TwitchDownloader"),
+    "vimeo": ("src.engine.platforms.vimeo", "VimeoDownloader"),
+    "facebook": ("src.engine.platforms.facebook", "FacebookDownloader"),
+    "bilibili": ("src.engine.platforms.bilibili", "BilibiliDownloader"),
+    "linkedin": ("src.engine.platforms.linkedin", "LinkedInDownloader"),
+    "pinterest": ("src.engine.platforms.pinterest", "PinterestDownloader"),
+})
+
+
+@lru_cache(maxsize=None)
+def get_downloader_class(platform: str) -> Optional[Type[BaseDownloader]]:
+    """Import and return the downloader class for a platform, or None if unsupported.
+
+    Args:
+        platform: Platform name as returned by detect_platform (e.g. "youtube")
+
+    Returns:
+        Downloader class, imported at most once per process
+    """
+    target = DOWNLOADER_CLASSES.get(platform)
+    if target is None:
+        return None
+    module_name, class_name = target
+    return getattr(importlib.import_module(module_name), class_name)
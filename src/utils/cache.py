@@ -1,10 +1,15 @@
 """Caching utilities for performance optimization."""
 
-import json
+import asyncio
+import base64
 import hashlib
+import functools
+import time
 from typing import Optional, Any, Dict, Union
+import orjson
 import redis
 from loguru import logger
+from starlette.responses import Response
 from src.core.config import settings
 
 
@@ -33,9 +38,13 @@ class CacheManager:
             self._memory_cache = {}
     
     def _generate_key(self, prefix: str, identifier: str) -> str:
-        """Generate cache key with prefix and hashed identifier."""
-        hash_object = hashlib.md5(identifier.encode())
-        return f"{prefix}:{hash_object.hexdigest()}"
+        """Generate cache key with prefix and hashed identifier.
+        
+        The digest is base64url-encoded (22 chars) rather than hex (32 chars) to keep
+        keys short in Redis. Keys stay text because the client uses decode_responses.
+        """
+        digest = hashlib.md5(identifier.encode()).digest()
+        return f"{prefix}:{base64.urlsafe_b64encode(digest).rstrip(b'=').decode()}"
     
     def get(self, key: str, prefix: str = "cache") -> Optional[Any]:
         """Get value from cache.
@@ -55,14 +64,20 @@ class CacheManager:
                 cached_value = self.redis_client.get(cache_key)
                 if cached_value:
                     try:
-                        return json.loads(cached_value)
-                    except json.JSONDecodeError:
+                        return orjson.loads(cached_value)
+                    except orjson.JSONDecodeError:
                         # Invalid JSON, remove corrupted entry
                         self.redis_client.delete(cache_key)
                         return None
             else:
                 # Try memory cache
-                return self._memory_cache.get(cache_key)
+                entry = self._memory_cache.get(cache_key)
+                if entry is None:
+                    return None
+                if entry['expires'] < self._get_current_time():
+                    del self._memory_cache[cache_key]
+                    return None
+                return entry['value']
                 
         except Exception as e:
             logger.error(f"Cache get error for key {cache_key}: {e}")
@@ -83,7 +98,8 @@ class CacheManager:
         cache_key = self._generate_key(prefix, key)
         
         try:
-            serialized_value = json.dumps(value, default=str)
+            # Compact JSON (no separator whitespace); non-JSON types fall back to str()
+            serialized_value = orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
             
             if self.enabled and self.redis_client:
                 # Use Redis cache
@@ -244,4 +260,47 @@ class CacheDecorator:
                     raise
                     
             return wrapper
-        return decorator
\ No newline at end of file
+        return decorator
+    @staticmethod
+    def cached_endpoint(ttl: int = 10, stale_ttl: int = 300, key_prefix: str = "endpoint"):
+        """Decorator to cache the JSON body of an async FastAPI endpoint.
+        
+        A cached body is served for `ttl` seconds. After that the handler runs
+        again; if it raises, the last body is served as long as it is younger
+        than `stale_ttl` seconds.
+        
+        Args:
+            ttl: Freshness lifetime in seconds
+            stale_ttl: How long a body may be served as a fallback on errors
+            key_prefix: Cache key prefix
+        """
+        def decorator(func):
+            func_name = f"{func.__module__}.{func.__name__}"
+            
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                # Redis calls block; keep them off the event loop
+                cached = await asyncio.to_thread(cache_manager.get, func_name, prefix=key_prefix)
+                if cached is not None and time.time() - cached['generated_at'] < ttl:
+                    logger.debug(f"Cache hit for {func_name}")
+                    return Response(content=cached['body'], media_type="application/json",
+                                    headers={"X-Cache": "HIT"})
+                
+                try:
+                    response = await func(*args, **kwargs)
+                except Exception as e:
+                    if cached is not None:
+                        logger.warning(f"{func_name} failed, serving stale cached response: {e}")
+                        return Response(content=cached['body'], media_type="application/json",
+                                        headers={"X-Cache": "STALE"})
+                    raise
+                
+                if isinstance(response, Response) and response.status_code == 200:
+                    await asyncio.to_thread(cache_manager.set, func_name, {
+                        'body': response.body.decode(),
+                        'generated_at': time.time()
+                    }, ttl=stale_ttl, prefix=key_prefix)
+                return response
+                    
+            return wrapper
+        return decorator
@@ -22,6 +22,19 @@ class PlatformNotSupportedError(LibraryDownError):
         super().__init__(message, "PLATFORM_NOT_SUPPORTED")
 
 
+class PlatformUnavailableError(LibraryDownError, NotImplementedError):
+    """Raised by downloaders for platforms that are disabled in this environment."""
+    
+    def __init__(self, platform: str, message: str):
+        self.platform = platform
+        super().__init__(message, "PLATFORM_UNAVAILABLE")
+        # Keep the constructor arguments so Celery can rebuild it with cls(*args)
+        self.args = (platform, message)
+    
+    def __str__(self):
+        return self.message
+
+
 class ContentNotFoundError(LibraryDownError):
     """Raised when content is not found or unavailable."""
     
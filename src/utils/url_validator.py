@@ -1,9 +1,9 @@
 """URL validation and parsing utilities."""
 
-import re
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
 from typing import Optional, Tuple
 from .exceptions import ValidationError
+from src.engine import registry
 
 
 class URLValidator:
@@ -108,14 +108,8 @@ class URLValidator:
         """
         try:
             cls.validate_url(url)
-            url_lower = url.lower()
-            
-            for platform, patterns in cls.SUPPORTED_PLATFORMS.items():
-                for pattern in patterns:
-                    if re.search(pattern, url_lower):
-                        return platform
-                        
-            return "unknown"
+            # Same detector as the API, bot and workers, so every caller agrees on the platform
+            return registry.detect_platform(url)
             
         except ValidationError:
             return "unknown"
@@ -150,6 +144,20 @@ class URLValidator:
             
         return url
     
+    @classmethod
+    def canonicalize_url(cls, url: str) -> str:
+        """Canonicalize URL so equivalent links share one cache key.
+        
+        Args:
+            url: URL to canonicalize
+            
+        Returns:
+            URL with lowercased scheme/host, sorted query parameters and no fragment
+        """
+        parts = urlsplit(url.strip())
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+    
     @classmethod
     def get_domain(cls, url: str) -> str:
         """Extract domain from URL.
@@ -180,4 +188,5 @@ class URLValidator:
         domain = cls.get_domain(url)
         is_supported = platform != "unknown"
         
-        return platform, domain, is_supported
\ No newline at end of file
+        return platform, domain, is_supported
+
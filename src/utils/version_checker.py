@@ -2,13 +2,18 @@ import requests
 import subprocess
 import os
 import sys
-from typing import Dict, Optional, Tuple
+import time
+from typing import Any, Dict, Optional, Tuple
 from packaging import version
 from loguru import logger
 import tempfile
 import shutil
 
 
+# Version info changes rarely; GitHub lookups and git/psutil probes are reused for this long (seconds)
+VERSION_CACHE_TTL = 600
+
+
 class VersionChecker:
     """Version checking and auto-update system for LibraryDown"""
     
@@ -17,9 +22,29 @@ class VersionChecker:
         self.repo_owner = repo_owner
         self.repo_name = repo_name
         self.github_api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}"
+        # name -> (monotonic time cached, value)
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+    
+    def _get_cached(self, name: str) -> Optional[Any]:
+        """Return a cached value if it is younger than VERSION_CACHE_TTL."""
+        entry = self._cache.get(name)
+        if entry is not None and time.monotonic() - entry[0] < VERSION_CACHE_TTL:
+            return entry[1]
+        return None
+    
+    def _set_cached(self, name: str, value: Any):
+        self._cache[name] = (time.monotonic(), value)
+    
+    def clear_cache(self):
+        """Drop cached version and system info, e.g. after an update."""
+        self._cache.clear()
     
     def get_latest_version(self) -> Optional[str]:
-        """Get the latest version from GitHub releases"""
+        """Get the latest version from GitHub releases (cached for VERSION_CACHE_TTL)"""
+        cached = self._get_cached("latest_version")
+        if cached is not None:
+            return cached
+        
         try:
             response = requests.get(f"{self.github_api_url}/releases/latest", timeout=10)
             response.raise_for_status()
@@ -30,6 +55,7 @@ class VersionChecker:
             if tag_name.startswith("v"):
                 tag_name = tag_name[1:]
             
+            self._set_cached("latest_version", tag_name)
             return tag_name
         except Exception as e:
             logger.error(f"Failed to fetch latest version: {e}")
@@ -90,13 +116,18 @@ class VersionChecker:
             if result.returncode != 0:
                 logger.warning(f"Dependency upgrade failed: {result.stderr}")
             
+            self.clear_cache()
             return True, "Update completed successfully"
         except Exception as e:
             logger.error(f"Update failed: {e}")
             return False, f"Update failed: {e}"
     
     def get_system_info(self) -> Dict:
-        """Get comprehensive system information"""
+        """Get comprehensive system information (cached for VERSION_CACHE_TTL)"""
+        cached = self._get_cached("system_info")
+        if cached is not None:
+            return cached
+        
         try:
             # Get current version
             current_version = self.current_version
@@ -141,6 +172,9 @@ class VersionChecker:
                 "uptime_seconds": int(psutil.boot_time())
             }
             
+            # Don't pin a failed GitHub lookup for the whole TTL
+            if latest_version is not None:
+                self._set_cached("system_info", system_info)
             return system_info
         except Exception as e:
             logger.error(f"Failed to get system info: {e}")
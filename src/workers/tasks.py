@@ -1,87 +1,71 @@
+from typing import Optional
+from celery.signals import worker_process_shutdown
 from src.workers.celery_app import celery_app
-from src.engine.platforms.tiktok import TikTokDownloader
-from src.engine.platforms.youtube import YouTubeDownloader
-from src.engine.platforms.instagram import InstagramDownloader
-from src.engine.platforms.twitter import TwitterDownloader
-from src.engine.platforms.reddit import RedditDownloader
-from src.engine.platforms.soundcloud import SoundCloudDownloader
-from src.engine.platforms.dailymotion import DailymotionDownloader
-from src.engine.platforms.twitch import TwitchDownloader
-from src.engine.platforms.vimeo import VimeoDownloader
-from src.engine.platforms.facebook import FacebookDownloader
-from src.engine.platforms.bilibili import BilibiliDownloader
-from src.engine.platforms.linkedin import LinkedInDownloader
-from src.engine.platforms.pinterest import PinterestDownloader
+from src.engine.registry import detect_platform, get_downloader_class
 from src.core.config import settings
 from loguru import logger
 import asyncio
+import httpx
 from httpx import RequestError
 
-def get_downloader(url: str):
-    """Return appropriate downloader based on URL"""
-    url_lower = url.lower()
-    
-    if "tiktok.com" in url_lower or "vt.tiktok.com" in url_lower:
-        return TikTokDownloader()
-    elif "youtube.com" in url_lower or "youtu.be" in url_lower:
-        return YouTubeDownloader()
-    elif "instagram.com" in url_lower:
-        return InstagramDownloader()
-    elif "twitter.com" in url_lower or "x.com" in url_lower or "t.co" in url_lower:
-        return TwitterDownloader()
-    elif "reddit.com" in url_lower or "redd.it" in url_lower:
-        return RedditDownloader()
-    elif "soundcloud.com" in url_lower:
-        return SoundCloudDownloader()
-    elif "dailymotion.com" in url_lower or "dai.ly" in url_lower:
-        return DailymotionDownloader()
-    elif "twitch.tv" in url_lower:
-        return TwitchDownloader()
-    elif "vimeo.com" in url_lower:
-        return VimeoDownloader()
-    elif "facebook.com" in url_lower or "fb.watch" in url_lower:
-        return FacebookDownloader()
-    elif "bilibili.com" in url_lower or "b23.tv" in url_lower:
-        return BilibiliDownloader()
-    elif "linkedin.com" in url_lower:
-        return LinkedInDownloader()
-    elif "pinterest.com" in url_lower or "pin.it" in url_lower:
-        return PinterestDownloader()
-    else:
-        raise ValueError(f"No downloader found for URL: {url}. Supported platforms: TikTok, YouTube, Instagram, Twitter/X, Reddit, SoundCloud, Dailymotion, Twitch, Vimeo, Facebook, Bilibili, LinkedIn, Pinterest")
+# Each worker process runs its tasks on one long-lived event loop, so a single pooled
+# HTTP client can keep connections and TLS sessions alive across downloads (a client
+# can't outlive the loop it was used on, which asyncio.run per task would force).
+# Both are created lazily so every prefork child builds its own after the fork.
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_http_client: Optional[httpx.AsyncClient] = None
 
-def detect_platform(url: str) -> str:
-    """Detect platform from URL"""
-    url_lower = url.lower()
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Return this process's event loop, creating it and its HTTP client on first use"""
+    global _worker_loop, _worker_http_client
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        _worker_http_client = httpx.AsyncClient(
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+        )
+    return _worker_loop
+
+
+def run_in_worker_loop(coro):
+    """Run a coroutine to completion on the worker loop, then cancel whatever it left behind
     
-    if "tiktok.com" in url_lower or "vt.tiktok.com" in url_lower:
-        return "tiktok"
-    elif "youtube.com" in url_lower or "youtu.be" in url_lower:
-        return "youtube"
-    elif "instagram.com" in url_lower:
-        return "instagram"
-    elif "twitter.com" in url_lower or "x.com" in url_lower:
-        return "twitter"
-    elif "reddit.com" in url_lower or "redd.it" in url_lower:
-        return "reddit"
-    elif "soundcloud.com" in url_lower:
-        return "soundcloud"
-    elif "dailymotion.com" in url_lower or "dai.ly" in url_lower:
-        return "dailymotion"
-    elif "twitch.tv" in url_lower:
-        return "twitch"
-    elif "vimeo.com" in url_lower:
-        return "vimeo"
-    elif "facebook.com" in url_lower or "fb.watch" in url_lower:
-        return "facebook"
-    elif "bilibili.com" in url_lower or "b23.tv" in url_lower:
-        return "bilibili"
-    elif "linkedin.com" in url_lower:
-        return "linkedin"
-    elif "pinterest.com" in url_lower or "pin.it" in url_lower:
-        return "pinterest"
-    else:
-        return "unknown"
+    asyncio.run would cancel leftover tasks (gather children, in-flight fetches) when a
+    job fails or times out; on a long-lived loop they would otherwise keep running
+    inside the next job.
+    """
+    loop = get_worker_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        leftover = asyncio.all_tasks(loop)
+        for task in leftover:
+            task.cancel()
+        if leftover:
+            loop.run_until_complete(asyncio.gather(*leftover, return_exceptions=True))
+
+
+@worker_process_shutdown.connect
+def close_worker_loop(**kwargs):
+    """Close the shared HTTP client and event loop when the worker process exits"""
+    global _worker_loop, _worker_http_client
+    if _worker_loop is None or _worker_loop.is_closed():
+        return
+    if _worker_http_client is not None:
+        _worker_loop.run_until_complete(_worker_http_client.aclose())
+        _worker_http_client = None
+    _worker_loop.run_until_complete(_worker_loop.shutdown_default_executor())
+    _worker_loop.close()
+    _worker_loop = None
+
+
+def get_downloader(url: str, platform: str, http_client: Optional[httpx.AsyncClient] = None):
+    """Return appropriate downloader for a URL whose platform is already detected"""
+    downloader_class = get_downloader_class(platform)
+    if downloader_class is None:
+        raise ValueError(f"No downloader found for URL: {url}. Supported platforms: TikTok, YouTube, Instagram, Twitter/X, Reddit, SoundCloud, Dailymotion, Twitch, Vimeo, Facebook, Bilibili, LinkedIn, Pinterest")
+    return downloader_class(http_client=http_client)
 
 @celery_app.task(
     bind=True,
@@ -136,7 +120,8 @@ def download_media_task(self, url: str, quality: str = "720p"):
             }
         )
         
-        downloader = get_downloader(url)
+        get_worker_loop()
+        downloader = get_downloader(url, platform, http_client=_worker_http_client)
         
         # Download media with quality parameter
         self.update_state(
@@ -150,7 +135,7 @@ def download_media_task(self, url: str, quality: str = "720p"):
         )
         
         # Pass quality to downloader
-        data = asyncio.run(downloader.download(url, quality=quality))
+        data = run_in_worker_loop(downloader.download(url, quality=quality))
         
         # Success
         self.update_state(
@@ -0,0 +1,90 @@
+"""Unit tests for the Telegram bot's JSONL download history."""
+
+import os
+import pytest
+import orjson
+from collections import defaultdict, deque
+from datetime import datetime
+
+import src.bot_downloader as bot_downloader
+from src.bot_downloader import LibraryDownBot
+
+
+@pytest.fixture
+def bot(tmp_path, monkeypatch):
+    """Bot with only its history state set up, writing to a temporary folder."""
+    monkeypatch.setattr(bot_downloader, "HISTORY_LIMIT", 5)
+    monkeypatch.setattr(bot_downloader, "HISTORY_COMPACT_EVERY", 3)
+
+    # Skip __init__: it needs a bot token and builds the Telegram application
+    instance = LibraryDownBot.__new__(LibraryDownBot)
+    instance.media_folder = str(tmp_path)
+    instance.history_file = os.path.join(str(tmp_path), "bot_history.jsonl")
+    instance._appends_since_compact = 0
+    instance.download_history = []
+    instance.history_by_user = defaultdict(lambda: deque(maxlen=bot_downloader.USER_HISTORY_SHOWN))
+    instance.recent_timestamps = deque(maxlen=bot_downloader.HISTORY_LIMIT)
+    return instance
+
+
+def read_lines(path):
+    with open(path, 'rb') as f:
+        return [orjson.loads(line) for line in f if line.strip()]
+
+
+def add_entries(bot, count, start=0):
+    for i in range(start, start + count):
+        bot.add_to_history(1, "user", f"https://x.com/u/status/{i}", "twitter", f"Post {i}", "SUCCESS")
+
+
+class TestBotHistory:
+
+    def test_each_entry_appends_one_line(self, bot):
+        """Test entries are appended without rewriting the file."""
+        add_entries(bot, 2)
+
+        lines = read_lines(bot.history_file)
+        assert [line["title"] for line in lines] == ["Post 0", "Post 1"]
+        assert bot._appends_since_compact == 2
+
+    def test_compaction_keeps_newest_entries(self, bot):
+        """Test the file is rewritten to HISTORY_LIMIT entries every HISTORY_COMPACT_EVERY appends."""
+        add_entries(bot, 6)
+        # Compacted after the 3rd and 6th appends
+        assert bot._appends_since_compact == 0
+        assert [line["title"] for line in read_lines(bot.history_file)] == \
+            [f"Post {i}" for i in range(1, 6)]
+
+        add_entries(bot, 2, start=6)
+        # Appends between compactions let the file grow past the limit for a while
+        assert len(read_lines(bot.history_file)) == 7
+        assert len(bot.download_history) == 5
+        assert not os.path.exists(bot.history_file + ".tmp")
+
+    def test_load_returns_newest_entries_with_datetimes(self, bot):
+        """Test loading trims to HISTORY_LIMIT and parses timestamps."""
+        add_entries(bot, 8)
+
+        history = bot.load_history()
+
+        assert [item["title"] for item in history] == [f"Post {i}" for i in range(3, 8)]
+        assert all(isinstance(item["timestamp"], datetime) for item in history)
+
+    def test_legacy_json_file_is_migrated(self, bot):
+        """Test history from the old single-document format is converted to JSONL."""
+        legacy = [
+            {"user_id": 1, "username": "user", "url": f"https://x.com/u/status/{i}", "platform": "twitter",
+             "title": f"Old {i}", "status": "SUCCESS", "timestamp": datetime(2024, 1, 1, 0, i).isoformat()}
+            for i in range(7)
+        ]
+        with open(os.path.join(bot.media_folder, "bot_history.json"), 'wb') as f:
+            f.write(orjson.dumps(legacy))
+
+        history = bot.load_history()
+
+        assert [item["title"] for item in history] == [f"Old {i}" for i in range(2, 7)]
+        assert [line["title"] for line in read_lines(bot.history_file)] == [f"Old {i}" for i in range(2, 7)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
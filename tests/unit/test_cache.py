@@ -66,6 +66,40 @@ class TestCacheManager:
         # Should be expired
         assert cache_manager.get(key) is None
     
+    def test_memory_entry_expires_after_ttl(self, cache_manager):
+        """Test a memory cache entry is served until its TTL passes and then dropped."""
+        cache_manager.enabled = False
+        cache_manager.redis_client = None
+        cache_manager._memory_cache = {}
+
+        with patch.object(cache_manager, "_get_current_time", return_value=1000):
+            cache_manager.set("expiring_key", {"value": 1}, ttl=10)
+
+        # Still valid on the expiry second itself
+        with patch.object(cache_manager, "_get_current_time", return_value=1010):
+            assert cache_manager.get("expiring_key") == {"value": 1}
+
+        # Expired: the lookup misses and removes the entry
+        with patch.object(cache_manager, "_get_current_time", return_value=1011):
+            assert cache_manager.get("expiring_key") is None
+        assert cache_manager._memory_cache == {}
+
+    def test_cleanup_drops_only_expired_memory_entries(self, cache_manager):
+        """Test the memory cache sweep keeps entries whose TTL hasn't passed."""
+        cache_manager.enabled = False
+        cache_manager.redis_client = None
+        cache_manager._memory_cache = {}
+
+        with patch.object(cache_manager, "_get_current_time", return_value=1000):
+            cache_manager.set("short", "a", ttl=5)
+            cache_manager.set("long", "b", ttl=60)
+
+        with patch.object(cache_manager, "_get_current_time", return_value=1030):
+            cache_manager._cleanup_expired_memory_entries()
+            assert len(cache_manager._memory_cache) == 1
+            assert cache_manager.get("long") == "b"
+            assert cache_manager.get("short") is None
+
     def test_clear_pattern(self, cache_manager):
         """Test clearing cache by pattern."""
         # Set multiple keys with same prefix
@@ -122,6 +156,31 @@ class TestCacheDecorator:
         result3 = expensive_function(10, 20)
         assert result3 == 30
         assert call_count == 2  # Function called again
+    
+    def test_cached_endpoint_serves_stale_on_error(self):
+        """Test endpoint cache returns the last body when the handler fails."""
+        import asyncio
+        from starlette.responses import JSONResponse
+        
+        calls = {"count": 0, "fail": False}
+        
+        @CacheDecorator.cached_endpoint(ttl=0, stale_ttl=60, key_prefix="test_endpoint")
+        async def endpoint():
+            calls["count"] += 1
+            if calls["fail"]:
+                raise RuntimeError("database unavailable")
+            return JSONResponse({"value": calls["count"]})
+        
+        # First call populates the cache
+        response = asyncio.run(endpoint())
+        assert response.body == b'{"value":1}'
+        
+        # Handler fails - stale body is served instead of raising
+        calls["fail"] = True
+        response = asyncio.run(endpoint())
+        assert response.body == b'{"value":1}'
+        assert response.headers["X-Cache"] == "STALE"
+        assert calls["count"] == 2
 
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+"""Unit tests for Netscape cookie validation in the cookie manager bot."""
+
+import random
+
+import pytest
+from src.bot_cookie_manager import validate_netscape_cookies
+
+
+def reference_counts(content: str):
+    """The original line-by-line validator, reduced to the counts it reported."""
+    lines = content.strip().split('\n')
+    valid_lines = 0
+    invalid_lines = 0
+    domains_found = set()
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        fields = line.split('\t')
+        if len(fields) != 7:
+            invalid_lines += 1
+            continue
+        domain, flag, path, secure, expires, name, value = fields
+        if not domain.strip() or flag not in ['TRUE', 'FALSE', '0', '1'] or not path.startswith('/') \
+                or secure not in ['TRUE', 'FALSE', '0', '1']:
+            invalid_lines += 1
+            continue
+        try:
+            int(expires)
+        except ValueError:
+            invalid_lines += 1
+            continue
+        if not name.strip() or not value.strip():
+            invalid_lines += 1
+            continue
+        valid_lines += 1
+        domains_found.add(domain.lower())
+    return valid_lines, invalid_lines, len(lines), sorted(domains_found)
+
+
+def scan_counts(content: str):
+    _, details = validate_netscape_cookies(content)
+    return (details['valid_cookies'], details['invalid_lines'], details['total_lines'],
+            sorted(details['domains_found']))
+
+
+SAMPLE_FILES = [
+    "# Netscape HTTP Cookie File\n"
+    ".youtube.com\tTRUE\t/\tFALSE\t2147483647\tSID\tabc123\n"
+    ".google.com\tTRUE\t/\tTRUE\t2147483647\tGAPS\txyz789\n",
+    # CRLF line endings
+    "# Netscape HTTP Cookie File\r\n.instagram.com\tTRUE\t/\tTRUE\t1700000000\tsessionid\tabc\r\n",
+    # Trailing tabs and spaces after the value, indented lines
+    ".tiktok.com\tTRUE\t/\tFALSE\t0\tttwid\tvalue\t \n  .x.com\tTRUE\t/\tTRUE\t1\tauth\tv  \n",
+    # Empty value after the last tab (invalid), with and without CRLF
+    ".youtube.com\tTRUE\t/\tFALSE\t0\tSID\t\n.youtube.com\tTRUE\t/\tFALSE\t0\tSID\t\r\n",
+    # Expiry forms int() accepts or rejects
+    ".a.com\tTRUE\t/\tFALSE\t+5\tn\tv\n.a.com\tTRUE\t/\tFALSE\t 7 \tn\tv\n.a.com\tTRUE\t/\tFALSE\t1_000\tn\tv\n"
+    ".a.com\tTRUE\t/\tFALSE\t1__0\tn\tv\n.a.com\tTRUE\t/\tFALSE\tsoon\tn\tv\n",
+    # Bad flags, paths and field counts
+    ".a.com\ttrue\t/\tFALSE\t0\tn\tv\n.a.com\tTRUE\tpath\tFALSE\t0\tn\tv\n.a.com\tTRUE\t/\tFALSE\t0\tn\n"
+    ".a.com\tTRUE\t/\tFALSE\t0\tn\tv\textra\n",
+    "",
+    "\n\n   \n",
+    "not a cookie file\n# comment only\n",
+]
+
+
+@pytest.mark.parametrize("content", SAMPLE_FILES)
+def test_matches_reference_validator_on_samples(content):
+    """The single-regex scan reports the same counts as the original validator."""
+    assert scan_counts(content) == reference_counts(content)
+
+
+def test_matches_reference_validator_on_random_lines():
+    """Randomized lines mixing whitespace, CR, bad fields and odd expiries agree too."""
+    rng = random.Random(7)
+    spaces = ['', ' ', '\t', '\r', '\x0b', '\x0c', '\x1c']
+    choices = [
+        ['.youtube.com', 'x.com', '#c', '', ' .tiktok.com', 'a b'],
+        ['TRUE', 'FALSE', '0', '1', 'true', 'TRUE '],
+        ['/', '/a', 'a', ''],
+        ['TRUE', 'FALSE', '0', '1', '2'],
+        ['0', '123', '-5', '+5', ' 7 ', '1_000', '1__0', 'x', ''],
+        ['n', '', ' ', '\r', 'a b'],
+        ['v', '', ' ', 'v ', '\x1c', 'a\rb'],
+    ]
+    for _ in range(2000):
+        lines = []
+        for _ in range(rng.randint(0, 6)):
+            fields = [rng.choice(options) for options in choices]
+            if rng.random() < 0.1:
+                fields = fields[:rng.randint(1, 7)]
+            lines.append(rng.choice(spaces) + '\t'.join(fields) + rng.choice(spaces) + rng.choice(spaces))
+        content = '\n'.join(lines)
+        if rng.random() < 0.2:
+            content = content.replace('\n', '\r\n')
+        assert scan_counts(content) == reference_counts(content), repr(content)
@@ -0,0 +1,133 @@
+"""Unit tests for keyset pagination of the /history endpoint."""
+
+import itertools
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.main import app
+from src.core.config import settings
+from src.database.base import Base, get_db
+from src.database.models import DownloadHistory, PlatformType, TaskStatus
+
+
+HISTORY_URL = f"{settings.API_V1_STR}/history"
+BASE_TIME = datetime(2024, 1, 1, 12, 0, 0)
+task_numbers = itertools.count()
+
+
+@pytest.fixture
+def db_session():
+    """Fresh in-memory database shared by the test and the app."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def client(db_session):
+    """Test client whose requests use the in-memory database."""
+    app.dependency_overrides[get_db] = lambda: db_session
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+
+def add_rows(session, created_offsets, platform=PlatformType.TIKTOK):
+    """Insert one history row per offset (in seconds from BASE_TIME)."""
+    for offset in created_offsets:
+        session.add(DownloadHistory(
+            task_id=f"task-{next(task_numbers)}",
+            url="https://www.tiktok.com/@user/video/1",
+            platform=platform.value,
+            status=TaskStatus.SUCCESS.value,
+            created_at=BASE_TIME + timedelta(seconds=offset)
+        ))
+    session.commit()
+
+
+def newest_first_ids(session):
+    """All row ids in the order /history returns them."""
+    rows = session.query(DownloadHistory).order_by(
+        DownloadHistory.created_at.desc(), DownloadHistory.id.desc()
+    ).all()
+    return [row.id for row in rows]
+
+
+def fetch_all_pages(client, limit, **params):
+    """Follow X-Next-Cursor until it is absent; return the pages and the cursors seen."""
+    pages = []
+    cursors = []
+    response = client.get(HISTORY_URL, params={"limit": limit, **params})
+    while True:
+        assert response.status_code == 200
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages, cursors
+        cursors.append(cursor)
+        response = client.get(HISTORY_URL, params={"limit": limit, "cursor": cursor, **params})
+
+
+class TestHistoryCursorPaging:
+
+    def test_pages_cover_every_row_once(self, client, db_session):
+        """Test rows sharing a timestamp are neither skipped nor repeated."""
+        add_rows(db_session, [0, 10, 10, 10, 20, 30, 30])
+
+        pages, cursors = fetch_all_pages(client, limit=3)
+
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert len(cursors) == 2
+        assert [row_id for page in pages for row_id in page] == newest_first_ids(db_session)
+
+    def test_no_cursor_on_short_page(self, client, db_session):
+        """Test the header is only sent when a full page came back."""
+        add_rows(db_session, [0, 1])
+
+        response = client.get(HISTORY_URL, params={"limit": 5})
+
+        assert len(response.json()) == 2
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_full_last_page_is_followed_by_empty_page(self, client, db_session):
+        """Test a row count that is a multiple of the limit ends with an empty page."""
+        add_rows(db_session, [0, 1, 2, 3])
+
+        pages, _ = fetch_all_pages(client, limit=2)
+
+        assert [len(page) for page in pages] == [2, 2, 0]
+
+    def test_cursor_combines_with_platform_filter(self, client, db_session):
+        """Test paging a single platform only returns that platform's rows."""
+        add_rows(db_session, [0, 5, 10, 15], platform=PlatformType.TIKTOK)
+        add_rows(db_session, [1, 6, 11], platform=PlatformType.YOUTUBE)
+
+        pages, _ = fetch_all_pages(client, limit=2, platform="youtube")
+
+        returned = [row_id for page in pages for row_id in page]
+        youtube_ids = [
+            row.id for row in db_session.query(DownloadHistory)
+            .filter(DownloadHistory.platform == PlatformType.YOUTUBE.value)
+            .order_by(DownloadHistory.created_at.desc(), DownloadHistory.id.desc())
+        ]
+        assert returned == youtube_ids
+
+    @pytest.mark.parametrize("cursor", ["garbage", "2024-01-01T12:00:00", "2024-01-01T12:00:00,abc", ",5"])
+    def test_malformed_cursor_is_rejected(self, client, cursor):
+        """Test a cursor that doesn't decode returns 400."""
+        response = client.get(HISTORY_URL, params={"cursor": cursor})
+        assert response.status_code == 400
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
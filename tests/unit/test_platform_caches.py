@@ -0,0 +1,224 @@
+"""Unit tests for the TikTok item cache and the Instagram formats cache."""
+
+import asyncio
+import pytest
+
+from src.engine.platforms import instagram, tiktok
+from src.engine.platforms.instagram import InstagramDownloader
+from src.engine.platforms.tiktok import TikTokDownloader
+from src.utils.url_validator import URLValidator
+
+
+TIKTOK_URL = "https://www.tiktok.com/@user/video/123?lang=en&is_from_webapp=1"
+# Same post: query order and fragment don't change the cache key
+TIKTOK_URL_VARIANT = "https://www.tiktok.com/@user/video/123?is_from_webapp=1&lang=en#comments"
+INSTAGRAM_URL = "https://www.instagram.com/reel/AbC123/"
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start and end every test with empty module-level caches."""
+    stores = (tiktok._item_cache, tiktok._item_fetches,
+              instagram._formats_cache, instagram._formats_inflight)
+    for store in stores:
+        store.clear()
+    yield
+    for store in stores:
+        store.clear()
+
+
+def age_entry(cache, key, seconds):
+    """Make a cache entry look `seconds` older than it is."""
+    stored_at, value = cache[key]
+    cache[key] = (stored_at - seconds, value)
+
+
+class TestTikTokItemCache:
+
+    @pytest.fixture
+    def page_loads(self, monkeypatch):
+        """Replace the page request with a counter; returns the list of loaded URLs."""
+        calls = []
+
+        async def load_item_struct(self, client, url):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return {"id": "123", "load": len(calls)}
+
+        monkeypatch.setattr(TikTokDownloader, "_load_item_struct", load_item_struct)
+        return calls
+
+    def test_concurrent_requests_share_one_fetch(self, page_loads):
+        """Test concurrent lookups for one post coalesce onto a single page request."""
+        client = object()
+        downloader = TikTokDownloader(http_client=client)
+
+        async def run():
+            return await asyncio.gather(
+                downloader._fetch_item_struct(client, TIKTOK_URL, use_cache=True),
+                downloader._fetch_item_struct(client, TIKTOK_URL_VARIANT, use_cache=True),
+                downloader._fetch_item_struct(client, TIKTOK_URL, use_cache=True),
+            )
+
+        results = asyncio.run(run())
+
+        assert len(page_loads) == 1
+        assert all(result is results[0] for result in results)
+        assert tiktok._item_fetches == {}
+
+    def test_short_lived_clients_do_not_coalesce(self, page_loads):
+        """Test requests without a shared client each fetch the page."""
+        downloader = TikTokDownloader()
+
+        async def run():
+            await asyncio.gather(
+                downloader._fetch_item_struct(object(), TIKTOK_URL, use_cache=True),
+                downloader._fetch_item_struct(object(), TIKTOK_URL, use_cache=True),
+            )
+
+        asyncio.run(run())
+
+        assert len(page_loads) == 2
+
+    def test_cached_item_expires_after_ttl(self, page_loads):
+        """Test a cached item is reused until ITEM_CACHE_TTL has passed."""
+        client = object()
+        downloader = TikTokDownloader(http_client=client)
+        key = URLValidator.canonicalize_url(TIKTOK_URL)
+
+        first = asyncio.run(downloader._fetch_item_struct(client, TIKTOK_URL, use_cache=True))
+        assert asyncio.run(downloader._fetch_item_struct(client, TIKTOK_URL_VARIANT, use_cache=True)) is first
+        assert len(page_loads) == 1
+
+        age_entry(tiktok._item_cache, key, tiktok.ITEM_CACHE_TTL)
+        refreshed = asyncio.run(downloader._fetch_item_struct(client, TIKTOK_URL, use_cache=True))
+
+        assert len(page_loads) == 2
+        assert refreshed["load"] == 2
+
+    def test_uncached_fetch_always_requests_and_refreshes_cache(self, page_loads):
+        """Test use_cache=False (download) fetches fresh data and stores it for get_formats."""
+        client = object()
+        downloader = TikTokDownloader(http_client=client)
+
+        asyncio.run(downloader._fetch_item_struct(client, TIKTOK_URL, use_cache=True))
+        fresh = asyncio.run(downloader._fetch_item_struct(client, TIKTOK_URL, use_cache=False))
+        cached = asyncio.run(downloader._fetch_item_struct(client, TIKTOK_URL, use_cache=True))
+
+        assert len(page_loads) == 2
+        assert fresh["load"] == 2
+        assert cached is fresh
+
+    def test_failed_fetch_is_not_cached(self, monkeypatch):
+        """Test every waiter sees the error and nothing is cached."""
+        calls = []
+
+        async def load_item_struct(self, client, url):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            raise ValueError("Could not find data script in HTML response.")
+
+        monkeypatch.setattr(TikTokDownloader, "_load_item_struct", load_item_struct)
+        client = object()
+        downloader = TikTokDownloader(http_client=client)
+
+        async def run():
+            return await asyncio.gather(
+                downloader._fetch_item_struct(client, TIKTOK_URL, use_cache=True),
+                downloader._fetch_item_struct(client, TIKTOK_URL, use_cache=True),
+                return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(isinstance(result, ValueError) for result in results)
+        assert tiktok._item_cache == {} and tiktok._item_fetches == {}
+
+    def test_least_recently_used_item_is_evicted(self, monkeypatch):
+        """Test the cache drops the entry that was read least recently once full."""
+        monkeypatch.setattr(tiktok, "ITEM_CACHE_SIZE", 2)
+
+        tiktok._set_cached_item("a", {"id": "a"})
+        tiktok._set_cached_item("b", {"id": "b"})
+        assert tiktok._get_cached_item("a") == {"id": "a"}
+        tiktok._set_cached_item("c", {"id": "c"})
+
+        assert list(tiktok._item_cache) == ["a", "c"]
+
+
+class TestInstagramFormatsCache:
+
+    @pytest.fixture
+    def extractions(self, monkeypatch):
+        """Replace yt-dlp extraction with a counter; returns the list of extracted URLs."""
+        calls = []
+
+        def sync_extract(url, opts):
+            calls.append(url)
+            return {"title": "Reel", "thumbnail": None, "duration": 12, "height": 1920, "width": 1080, "fps": 30}
+
+        async def no_cookies(self, ydl_opts):
+            return None
+
+        monkeypatch.setattr(instagram, "_sync_extract", sync_extract)
+        monkeypatch.setattr(InstagramDownloader, "_add_cookie_options", no_cookies)
+        return calls
+
+    def test_concurrent_requests_share_one_extraction(self, extractions):
+        """Test concurrent get_formats calls for one post run yt-dlp once."""
+        downloader = InstagramDownloader()
+
+        async def run():
+            return await asyncio.gather(*(downloader.get_formats(INSTAGRAM_URL) for _ in range(3)))
+
+        results = asyncio.run(run())
+
+        assert len(extractions) == 1
+        assert results[0] == results[1] == results[2]
+        assert instagram._formats_inflight == {}
+
+    def test_results_are_copies(self, extractions):
+        """Test a caller mutating its result doesn't change what the cache serves."""
+        downloader = InstagramDownloader()
+
+        first = asyncio.run(downloader.get_formats(INSTAGRAM_URL))
+        first["formats"].clear()
+        second = asyncio.run(downloader.get_formats(INSTAGRAM_URL + "#comments"))
+
+        assert len(extractions) == 1
+        assert len(second["formats"]) == 2
+
+    def test_cached_formats_expire_after_ttl(self, extractions):
+        """Test formats are served from memory until FORMATS_CACHE_TTL has passed."""
+        downloader = InstagramDownloader()
+        key = URLValidator.canonicalize_url(INSTAGRAM_URL)
+
+        asyncio.run(downloader.get_formats(INSTAGRAM_URL))
+        asyncio.run(downloader.get_formats(INSTAGRAM_URL))
+        assert len(extractions) == 1
+
+        age_entry(instagram._formats_cache, key, instagram.FORMATS_CACHE_TTL)
+        asyncio.run(downloader.get_formats(INSTAGRAM_URL))
+
+        assert len(extractions) == 2
+
+    def test_failed_extraction_is_not_cached(self, monkeypatch, extractions):
+        """Test an extraction error reaches the caller and isn't remembered."""
+        def failing_extract(url, opts):
+            extractions.append(url)
+            return None
+
+        monkeypatch.setattr(instagram, "_sync_extract", failing_extract)
+        downloader = InstagramDownloader()
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                asyncio.run(downloader.get_formats(INSTAGRAM_URL))
+
+        assert len(extractions) == 2
+        assert instagram._formats_cache == {} and instagram._formats_inflight == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,79 @@
+"""Unit tests for URL cache keys and platform detection."""
+
+import pytest
+from src.utils.url_validator import URLValidator
+from src.engine.registry import detect_platform
+
+
+class TestCanonicalizeUrl:
+
+    def test_scheme_and_host_are_lowercased(self):
+        """Test scheme and host case don't change the key but path case does."""
+        assert URLValidator.canonicalize_url("HTTPS://WWW.YouTube.com/watch?v=abc") == \
+            "https://www.youtube.com/watch?v=abc"
+        assert URLValidator.canonicalize_url("https://www.instagram.com/p/AbC/") != \
+            URLValidator.canonicalize_url("https://www.instagram.com/p/abc/")
+
+    def test_query_order_and_fragment_ignored(self):
+        """Test equivalent links share one key."""
+        variants = [
+            "https://www.youtube.com/watch?v=abc&t=10",
+            "https://www.youtube.com/watch?t=10&v=abc",
+            "https://www.youtube.com/watch?v=abc&t=10#comments",
+            "  https://www.youtube.com/watch?t=10&v=abc  ",
+        ]
+        keys = {URLValidator.canonicalize_url(url) for url in variants}
+        assert keys == {"https://www.youtube.com/watch?t=10&v=abc"}
+
+    def test_blank_and_repeated_parameters_kept(self):
+        """Test blank values and repeated keys stay part of the key."""
+        assert URLValidator.canonicalize_url("https://a.com/p?b=2&a=1&a=0&c=") == \
+            "https://a.com/p?a=0&a=1&b=2&c="
+
+    def test_different_posts_get_different_keys(self):
+        """Test the key still distinguishes posts."""
+        assert URLValidator.canonicalize_url("https://www.tiktok.com/@a/video/1") != \
+            URLValidator.canonicalize_url("https://www.tiktok.com/@a/video/2")
+
+
+class TestDetectPlatform:
+
+    @pytest.mark.parametrize("url, platform", [
+        ("https://t.co/abc", "twitter"),
+        ("https://www.reddit.com/r/videos", "reddit"),
+        ("https://redd.it/abc", "reddit"),
+        ("https://x.com/user/status/1", "twitter"),
+        ("https://mobile.x.com/user/status/1", "twitter"),
+        ("https://vt.tiktok.com/ZS593uwQc/", "tiktok"),
+        ("https://youtu.be/dQw4w9WgXcQ", "youtube"),
+        ("HTTPS://WWW.YOUTUBE.COM/watch?v=dQw4w9WgXcQ", "youtube"),
+    ])
+    def test_supported_hosts(self, url, platform):
+        """Test each token is recognised, including as a subdomain."""
+        assert detect_platform(url) == platform
+
+    @pytest.mark.parametrize("url", [
+        "https://www.netflix.com/title/1",
+        "https://www.dropbox.com/s/1",
+        "https://t.com/abc",
+        "https://notyoutube.com/watch",
+        "https://my-youtube.com/watch",
+    ])
+    def test_token_inside_another_host_is_not_matched(self, url):
+        """Test a token must start and end at a host label boundary."""
+        assert detect_platform(url) == "unknown"
+
+    @pytest.mark.parametrize("url, platform", [
+        ("https://www.netflix.com/title/1", "unknown"),
+        ("https://www.dropbox.com/s/1", "unknown"),
+        ("https://x.com/user/status/1", "twitter"),
+        ("https://www.reddit.com/r/videos", "reddit"),
+        ("not a url", "unknown"),
+    ])
+    def test_url_validator_uses_the_same_detector(self, url, platform):
+        """Test URLValidator agrees with the registry's detect_platform."""
+        assert URLValidator.detect_platform(url) == platform
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])